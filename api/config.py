@@ -4,10 +4,39 @@ from slowapi.util import get_remote_address
 
 MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE_MB", "20")) * 1024 * 1024
 MAX_FILES_PER_SCAN = int(os.getenv("MAX_FILES_PER_SCAN", "20"))
+# POST /scan/archive: one ZIP upload, unpacked entry by entry (each entry is
+# still held to MAX_UPLOAD_SIZE and the PDF magic-byte check).
+MAX_ARCHIVE_SIZE = int(os.getenv("MAX_ARCHIVE_SIZE_MB", "200")) * 1024 * 1024
+MAX_ARCHIVE_FILES = int(os.getenv("MAX_ARCHIVE_FILES", "500"))
 MAX_JOB_DESCRIPTION_CHARS = int(os.getenv("MAX_JOB_DESCRIPTION_CHARS", "10000"))
 MAX_JD_FILE_SIZE = int(os.getenv("MAX_JD_FILE_SIZE_KB", "256")) * 1024
 FREE_SCAN_LIMIT = int(os.getenv("FREE_SCAN_LIMIT", "5"))
 
+# PDF text extraction runs in a dedicated process pool (see api.resume_parser).
+# 0 workers falls back to in-thread extraction without a hard deadline.
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(os.cpu_count() or 1, 4))))
+PDF_EXTRACT_TIMEOUT_SECONDS = float(os.getenv("PDF_EXTRACT_TIMEOUT_SECONDS", "20"))
+# In-process LRU entries for extracted resume text (the DB layer is unbounded).
+RESUME_TEXT_CACHE_ENTRIES = int(os.getenv("RESUME_TEXT_CACHE_ENTRIES", "256"))
+# spaCy NER over resumes: texts per nlp.pipe batch, and worker processes
+# (1 = in the feature thread; more only pays off for big archives on multi-core hosts).
+NER_BATCH_SIZE = int(os.getenv("NER_BATCH_SIZE", "32"))
+NER_N_PROCESS = int(os.getenv("NER_N_PROCESS", "1"))
+# Corpus TF-IDF model written by scripts/fit_tfidf.py and loaded at startup.
+# Without the file, relevance falls back to fitting TF-IDF per scan.
+TFIDF_MODEL_PATH = os.getenv("TFIDF_MODEL_PATH", "models/tfidf.joblib")
+# Relevance vectorizer: "tfidf" (corpus model or per-scan fit) or "hashing"
+# (stateless, fixed memory, resume vectors built during feature extraction).
+RELEVANCE_BACKEND = os.getenv("RELEVANCE_BACKEND", "tfidf").strip().lower()
+# POST /pool/match: users whose skill index is kept in memory (LRU), and how
+# many pooled resumes the index shortlists for full scoring by default.
+TALENT_POOL_CACHE_USERS = int(os.getenv("TALENT_POOL_CACHE_USERS", "32"))
+POOL_SHORTLIST_SIZE = int(os.getenv("POOL_SHORTLIST_SIZE", "200"))
+# asyncio workers that run mode=async scans inside the app process.
+SCAN_JOB_WORKERS = int(os.getenv("SCAN_JOB_WORKERS", "2"))
+# Uploads are spooled here while streaming; blank uses the system temp dir.
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+
 ENABLE_GROQ_JD_PARSING = os.getenv("ENABLE_GROQ_JD_PARSING", "true").lower() in {
     "1",
     "true",
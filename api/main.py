@@ -12,12 +12,15 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
-from api.config import limiter
+from api.config import RELEVANCE_BACKEND, TFIDF_MODEL_PATH, limiter
+from api.resume_parser import shutdown_pdf_extractor
 from api.routes import router
+from api.scan_jobs import fail_interrupted_scans, shutdown_scan_jobs
 from api.admin_routes import router as admin_router
 from api.session_routes import router as session_router
 from db.models import User
 from db.session import init_db, AsyncSessionLocal
+from ml.relevance import load_tfidf_model, set_relevance_backend
 
 # Supabase is optional at import time. Production config enables it; tests can
 # run without Supabase env vars because auth is covered through mocked tokens.
@@ -57,11 +60,16 @@ logger = structlog.get_logger()
 # NOTE: ML models load lazily on first request (not at startup) to stay within
 # small production memory budgets. spaCy en_core_web_sm (~50 MB) loads on first scan.
 # TF-IDF (sklearn) is used for semantic similarity; no torch/transformers needed.
+# The corpus TF-IDF model (a few MB) is the exception: it loads at startup.
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await fail_interrupted_scans()
+    set_relevance_backend(RELEVANCE_BACKEND)
+    if RELEVANCE_BACKEND == "tfidf":
+        load_tfidf_model(TFIDF_MODEL_PATH)
     if os.getenv("DEV_MODE", "false").lower() == "true":
         async with AsyncSessionLocal() as session:
             from sqlalchemy import select
@@ -77,6 +85,8 @@ async def lifespan(app: FastAPI):
                 logger.info("startup: dev-user created")
     logger.info("startup: DB initialised")
     yield
+    await shutdown_scan_jobs()
+    shutdown_pdf_extractor()
     logger.info("shutdown: complete")
 
 
@@ -0,0 +1,142 @@
+"""
+Content-addressed cache of extracted resume text.
+
+Recruiters upload the same PDFs to many scans, so extracted text is keyed by
+the SHA-256 of the PDF bytes and stored together with the extractor that
+produced it. Two layers:
+
+  - an in-process LRU (hot re-runs skip the database entirely)
+  - the ``resume_texts`` table, zlib-compressed, shared across restarts
+
+Both layers are best-effort: a cache failure never fails a scan, it only
+costs a re-extraction. A text is kept as long as some stored candidate was
+read from that PDF: deleting the last such scan purges it from both layers. Lookups and writes use their own short sessions so a
+concurrent insert of the same PDF cannot roll back the caller's scan.
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from api import config
+from db.models import ResumeText
+from db.session import AsyncSessionLocal
+
+log = structlog.get_logger()
+
+CachedText = tuple[str, str]   # (text, extractor)
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decompress_text(blob: bytes) -> str:
+    return zlib.decompress(blob).decode("utf-8")
+
+
+class ResumeTextCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, CachedText] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ── In-process LRU ──────────────────────────────────────────────────────
+
+    def get_local(self, digest: str) -> CachedText | None:
+        with self._lock:
+            hit = self._entries.get(digest)
+            if hit is not None:
+                self._entries.move_to_end(digest)
+            return hit
+
+    def put_local(self, digest: str, text: str, extractor: str) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[digest] = (text, extractor)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def forget_local(self, digests) -> None:
+        with self._lock:
+            for digest in digests:
+                self._entries.pop(digest, None)
+
+    # ── Two-layer API ───────────────────────────────────────────────────────
+
+    async def lookup_many(self, digests) -> dict[str, CachedText]:
+        """Return digest -> (text, extractor) for every digest found in either layer."""
+        found: dict[str, CachedText] = {}
+        missing = []
+        for digest in set(digests):
+            hit = self.get_local(digest)
+            if hit is not None:
+                found[digest] = hit
+            else:
+                missing.append(digest)
+        if not missing:
+            return found
+
+        try:
+            async with AsyncSessionLocal() as session:
+                rows = await session.execute(
+                    select(ResumeText).where(ResumeText.content_hash.in_(missing))
+                )
+                for row in rows.scalars().all():
+                    text = decompress_text(row.text_zlib)
+                    found[row.content_hash] = (text, row.extractor)
+                    self.put_local(row.content_hash, text, row.extractor)
+        except (SQLAlchemyError, zlib.error, UnicodeDecodeError) as exc:
+            log.warning("resume_text_cache_lookup_failed", error=str(exc)[:200])
+        return found
+
+    async def store_many(self, entries: dict[str, CachedText]) -> None:
+        """Persist freshly extracted texts; existing digests are left untouched."""
+        entries = {d: v for d, v in entries.items() if v[0].strip() and v[1]}
+        if not entries:
+            return
+        for digest, (text, extractor) in entries.items():
+            self.put_local(digest, text, extractor)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                existing = await session.execute(
+                    select(ResumeText.content_hash).where(ResumeText.content_hash.in_(list(entries)))
+                )
+                known = set(existing.scalars().all())
+                for digest, (text, extractor) in entries.items():
+                    if digest in known:
+                        continue
+                    session.add(ResumeText(
+                        content_hash=digest,
+                        extractor=extractor,
+                        text_zlib=compress_text(text),
+                        text_chars=len(text),
+                    ))
+                await session.commit()
+        except SQLAlchemyError as exc:
+            # Most likely a concurrent scan stored the same PDF first.
+            log.warning("resume_text_cache_store_failed", error=str(exc)[:200])
+
+
+_cache: ResumeTextCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_resume_text_cache() -> ResumeTextCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResumeTextCache(config.RESUME_TEXT_CACHE_ENTRIES)
+    return _cache
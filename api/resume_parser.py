@@ -1,4 +1,13 @@
+import asyncio
+import io
 import logging
+import mmap
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api import config
 
 logger = logging.getLogger(__name__)
 
@@ -8,6 +17,14 @@ MAX_PAGES = 60  # Guard against huge PDFs hanging a worker
 PDF_MAGIC_BYTES = b"\x25\x50\x44\x46"
 
 
+class PdfExtractionError(Exception):
+    """A worker could not produce text for one file (crash, bad pipe, ...)."""
+
+
+class PdfExtractionTimeout(PdfExtractionError):
+    """A file exceeded the per-file extraction deadline and its worker was killed."""
+
+
 def is_valid_pdf(raw_bytes: bytes) -> bool:
     """
     Validate that the file starts with PDF magic bytes (%PDF).
@@ -35,25 +52,55 @@ def extract_text_from_pdf(uploaded_file) -> str:
         logger.error("Could not read uploaded file: %s", exc)
         return ""
 
-    text = _try_pypdf(raw_bytes)
+    text, _ = _extract_text(raw_bytes)
+    return text
+
+
+def extract_text_from_path(path: str) -> tuple[str, str | None]:
+    """Extract text from a PDF on disk through a read-only memory map.
+
+    The parsers page the file in on demand instead of holding a private copy,
+    so peak RSS stays flat however large the upload is.
+    """
+    with open(path, "rb") as fh:
+        try:
+            view = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:   # empty file
+            return "", None
+        with view:
+            return _extract_text(view)
+
+
+def _extract_text(source) -> tuple[str, str | None]:
+    """Run the pypdf → pdfplumber strategy; return (text, extractor name).
+
+    ``source`` is raw bytes or any seekable binary buffer (e.g. an mmap).
+    """
+    text = _try_pypdf(source)
     if text.strip():
-        return text
+        return text, "pypdf"
 
     logger.info("pypdf returned empty text — falling back to pdfplumber")
-    text = _try_pdfplumber(raw_bytes)
+    text = _try_pdfplumber(source)
     if text.strip():
-        return text
+        return text, "pdfplumber"
 
     logger.warning("Both PDF extractors returned empty text")
-    return ""
+    return "", None
+
+
+def _as_stream(source):
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
 
 
-def _try_pypdf(raw_bytes: bytes) -> str:
+def _try_pypdf(source) -> str:
     try:
-        import io
         from pypdf import PdfReader
 
-        reader = PdfReader(io.BytesIO(raw_bytes))
+        reader = PdfReader(_as_stream(source))
         pages = reader.pages[:MAX_PAGES]
         parts = []
         for page in pages:
@@ -67,13 +114,12 @@ def _try_pypdf(raw_bytes: bytes) -> str:
 
 
 
-def _try_pdfplumber(raw_bytes: bytes) -> str:
+def _try_pdfplumber(source) -> str:
     try:
-        import io
         import pdfplumber
 
         parts = []
-        with pdfplumber.open(io.BytesIO(raw_bytes)) as pdf:
+        with pdfplumber.open(_as_stream(source)) as pdf:
             for page in pdf.pages[:MAX_PAGES]:
                 content = page.extract_text()
                 if content:
@@ -81,4 +127,159 @@ def _try_pdfplumber(raw_bytes: bytes) -> str:
         return "\n".join(parts)
     except Exception as exc:
         logger.warning("pdfplumber extraction failed: %s", exc)
-        return ""
\ No newline at end of file
+        return ""
+
+
+# ---------------------------------------------------------------------------
+# Process-pool extractor
+#
+# pypdf and pdfplumber are pure Python and hold the GIL, so the default thread
+# pool extracts a batch roughly one file at a time, and a pathological PDF can
+# pin a thread forever. Each pool slot owns one long-lived worker process fed
+# over a pipe; a slot that misses its deadline has its process killed and is
+# respawned lazily, so only that file fails. Spooled uploads travel as a file
+# path and are memory-mapped in the worker, so PDF bytes never cross the pipe.
+# ---------------------------------------------------------------------------
+
+def _worker_main(conn) -> None:
+    while True:
+        try:
+            kind, payload = conn.recv()
+        except (EOFError, OSError):
+            break
+        try:
+            if kind == "path":
+                result = extract_text_from_path(payload)
+            else:
+                result = _extract_text(payload)
+            conn.send(("ok", result))
+        except Exception as exc:
+            conn.send(("error", str(exc)))
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def run(self, job: tuple[str, object], timeout: float) -> tuple[str, str | None]:
+        self.conn.send(job)
+        if not self.conn.poll(timeout):
+            raise PdfExtractionTimeout(f"extraction exceeded {timeout:g}s")
+        status, payload = self.conn.recv()
+        if status != "ok":
+            raise PdfExtractionError(payload)
+        return payload
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class PdfExtractorPool:
+    """Size-bounded pool of extractor processes with a hard per-file deadline.
+
+    ``size=0`` disables the processes and extracts on the event loop's default
+    thread pool instead (no hard deadline) — useful where fork/spawn is banned.
+    """
+
+    def __init__(self, size: int, timeout_seconds: float):
+        self.size = max(0, size)
+        self.timeout_seconds = timeout_seconds
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots: queue.SimpleQueue = queue.SimpleQueue()
+        self._workers: set[_Worker] = set()
+        self._workers_lock = threading.Lock()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="pdf-extract")
+            if self.size else None
+        )
+        for _ in range(self.size):
+            self._slots.put(None)   # workers spawn on first use
+
+    async def extract(self, raw_bytes: bytes) -> tuple[str, str | None]:
+        """Return (text, extractor) for one in-memory PDF, raising PdfExtractionError on failure."""
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            return await loop.run_in_executor(None, _extract_text, raw_bytes)
+        return await loop.run_in_executor(self._executor, self._run, ("bytes", raw_bytes))
+
+    async def extract_path(self, path: str) -> tuple[str, str | None]:
+        """Like extract(), for a PDF on disk; the worker memory-maps the file."""
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            return await loop.run_in_executor(None, extract_text_from_path, path)
+        return await loop.run_in_executor(self._executor, self._run, ("path", path))
+
+    def _run(self, job: tuple[str, object]) -> tuple[str, str | None]:
+        worker = self._slots.get()
+        try:
+            if worker is None or not worker.process.is_alive():
+                worker = self._spawn()
+            result = worker.run(job, self.timeout_seconds)
+        except (PdfExtractionError, EOFError, OSError) as exc:
+            if worker is not None:
+                self._retire(worker)
+            self._slots.put(None)
+            if isinstance(exc, PdfExtractionError):
+                raise
+            raise PdfExtractionError(f"extractor process died: {exc}") from exc
+        except BaseException:
+            if worker is not None:
+                self._retire(worker)
+            self._slots.put(None)
+            raise
+        self._slots.put(worker)
+        return result
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx)
+        with self._workers_lock:
+            self._workers.add(worker)
+        return worker
+
+    def _retire(self, worker: _Worker) -> None:
+        with self._workers_lock:
+            self._workers.discard(worker)
+        worker.kill()
+
+    def shutdown(self) -> None:
+        with self._workers_lock:
+            workers, self._workers = list(self._workers), set()
+        for worker in workers:
+            worker.kill()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: PdfExtractorPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pdf_extractor() -> PdfExtractorPool:
+    """Return the process-wide extractor pool, creating it on first call."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PdfExtractorPool(
+                    config.PDF_EXTRACT_WORKERS,
+                    config.PDF_EXTRACT_TIMEOUT_SECONDS,
+                )
+                logger.info(
+                    "PDF extractor pool ready: %d workers, %.1fs timeout",
+                    _pool.size, _pool.timeout_seconds,
+                )
+    return _pool
+
+
+def shutdown_pdf_extractor() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,68 @@
+"""
+Persisted MinHash signatures, keyed by resume content hash.
+
+Each scanned resume's signature (ml.dedupe.minhash_signature) is stored once
+in the ``resume_signatures`` table under the MinHash scheme's version stamp,
+so a user's earlier resumes can be indexed for duplicate flags without
+re-reading their text. Storage is best-effort, like the text cache: a
+failure only means the resume is not flagged later. Rows written under
+another scheme are ignored.
+"""
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from db.models import ResumeSignature
+from db.session import AsyncSessionLocal
+from ml.dedupe import MINHASH_VERSION, decode_signature, encode_signature
+
+log = structlog.get_logger()
+
+
+async def lookup_signatures(digests) -> dict:
+    """Return digest -> signature for every digest with a current-scheme row."""
+    digests = list(set(digests))
+    if not digests:
+        return {}
+    found = {}
+    try:
+        async with AsyncSessionLocal() as session:
+            rows = await session.execute(
+                select(ResumeSignature.content_hash, ResumeSignature.signature).where(
+                    ResumeSignature.scheme == MINHASH_VERSION,
+                    ResumeSignature.content_hash.in_(digests),
+                )
+            )
+            for digest, blob in rows.all():
+                found[digest] = decode_signature(blob)
+    except SQLAlchemyError as exc:
+        log.warning("resume_signature_lookup_failed", error=str(exc)[:200])
+    return found
+
+
+async def store_signatures(entries: dict) -> None:
+    """Persist digest -> signature rows; digests already stored are left untouched."""
+    if not entries:
+        return
+    try:
+        async with AsyncSessionLocal() as session:
+            existing = await session.execute(
+                select(ResumeSignature.content_hash).where(
+                    ResumeSignature.scheme == MINHASH_VERSION,
+                    ResumeSignature.content_hash.in_(list(entries)),
+                )
+            )
+            known = set(existing.scalars().all())
+            for digest, signature in entries.items():
+                if digest in known:
+                    continue
+                session.add(ResumeSignature(
+                    content_hash=digest,
+                    scheme=MINHASH_VERSION,
+                    signature=encode_signature(signature),
+                ))
+            await session.commit()
+    except SQLAlchemyError as exc:
+        # Most likely a concurrent scan stored the same resume first.
+        log.warning("resume_signature_store_failed", error=str(exc)[:200])
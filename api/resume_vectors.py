@@ -0,0 +1,71 @@
+"""
+Persisted relevance vectors, keyed by resume content hash.
+
+Each resume's hashed relevance vector (ml.relevance.hash_vectorize) is stored
+once in the ``resume_vectors`` table under the vectorizer's version stamp.
+A scan that sees the same PDF again skips tokenizing and vectorizing it, and
+GET /candidates/{id}/similar ranks a candidate against every stored vector
+of the user's other candidates, held in memory by api.talent_pools.
+
+Like the text cache, storage is best-effort: a failure only costs a
+re-vectorization. Rows written under another vectorizer version are ignored.
+"""
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from db.models import ResumeVector
+from db.session import AsyncSessionLocal
+from ml.relevance import HASHING_VECTOR_VERSION, decode_vector, encode_vector
+
+log = structlog.get_logger()
+
+
+async def lookup_vectors(digests) -> dict:
+    """Return digest -> 1 x N CSR row for every digest with a current-version vector."""
+    digests = list(set(digests))
+    if not digests:
+        return {}
+    found = {}
+    try:
+        async with AsyncSessionLocal() as session:
+            rows = await session.execute(
+                select(ResumeVector.content_hash, ResumeVector.vector).where(
+                    ResumeVector.vectorizer == HASHING_VECTOR_VERSION,
+                    ResumeVector.content_hash.in_(digests),
+                )
+            )
+            for digest, blob in rows.all():
+                found[digest] = decode_vector(blob)
+    except SQLAlchemyError as exc:
+        log.warning("resume_vector_lookup_failed", error=str(exc)[:200])
+    return found
+
+
+async def store_vectors(entries: dict) -> None:
+    """Persist digest -> vector rows; digests already stored are left untouched."""
+    if not entries:
+        return
+    try:
+        async with AsyncSessionLocal() as session:
+            existing = await session.execute(
+                select(ResumeVector.content_hash).where(
+                    ResumeVector.vectorizer == HASHING_VECTOR_VERSION,
+                    ResumeVector.content_hash.in_(list(entries)),
+                )
+            )
+            known = set(existing.scalars().all())
+            for digest, vector in entries.items():
+                if digest in known:
+                    continue
+                session.add(ResumeVector(
+                    content_hash=digest,
+                    vectorizer=HASHING_VECTOR_VERSION,
+                    vector=encode_vector(vector),
+                    nnz=vector.nnz,
+                ))
+            await session.commit()
+    except SQLAlchemyError as exc:
+        # Most likely a concurrent scan stored the same resume first.
+        log.warning("resume_vector_store_failed", error=str(exc)[:200])
@@ -13,12 +13,9 @@ Fixes vs previous version
 - scan_id type is str (UUID) everywhere — no implicit int cast.
 """
 
-import asyncio
-import io
 import json
 import logging
 import time
-from functools import partial
 from typing import List
 
 import structlog
@@ -26,66 +23,93 @@ from fastapi import (
     APIRouter, Depends, File, Form, HTTPException,
     Request, UploadFile, status,
 )
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.ai.groq_jd_parser import parse_jd_skill_tiers_with_groq
-from api.ai.groq_overview import generate_candidate_overviews
 from api.auth.dependencies import require_auth
 from api.config import (
     ENABLE_GROQ_JD_PARSING,
     FREE_SCAN_LIMIT,
     GROQ_API_KEY,
+    MAX_ARCHIVE_FILES,
+    MAX_ARCHIVE_SIZE,
     MAX_JD_FILE_SIZE,
     MAX_JOB_DESCRIPTION_CHARS,
     MAX_UPLOAD_SIZE,
     MAX_FILES_PER_SCAN,
+    POOL_SHORTLIST_SIZE,
     is_dev_mode,
     limiter,
 )
 from api.constants import PRIORITY_MAP
-from api.resume_parser import extract_text_from_pdf, is_valid_pdf
+from api.resume_cache import get_resume_text_cache
+from api.resume_parser import is_valid_pdf
+from api.resume_vectors import lookup_vectors
+from api.scan_events import format_sse, get_scan_event_hub
+from api.scan_jobs import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_QUEUED,
+    ScanJob,
+    get_scan_job_queue,
+)
+from api.scan_pipeline import (
+    ScanParams,
+    append_to_scan,
+    match_pool,
+    new_scan,
+    persist_scan,
+    purge_orphaned_resumes,
+    rescore_scan,
+    scan_params,
+    score_uploads,
+    stored_jd_skill_tiers,
+    stored_skipped_files,
+)
 from api.schemas import (
     CandidateResult,
+    PoolMatchResponse,
+    RankingPriorities,
     ScanDetail,
     ScanHistoryItem,
+    ScanJobAccepted,
     ScanResponse,
+    SimilarCandidate,
     UsageResponse,
 )
+from api.talent_pools import get_talent_pool_cache
+from api.uploads import (
+    ResumeSource,
+    SpooledUpload,
+    discard_uploads,
+    open_resume_archive,
+    spool_upload,
+)
 from db.models import Candidate, CandidateSkill, Scan, User
 from db.session import get_db
-from ml.matcher import (
-    calculate_ats_score,
-    calculate_component_scores_structured,
-    extract_skills,
-    extract_jd_skill_tiers,
-)
-from ml.nlp_utils import clean_texts_batch
-from pipeline.skills import normalize_skill
 
 log = structlog.get_logger()
 router = APIRouter()
 
 
-def _canonical_skill_set(skills) -> set[str]:
-    return {
-        normalize_skill(skill)
-        for skill in skills
-        if isinstance(skill, str) and skill and not skill.startswith("unknown:")
-    }
-
-
 # ── Health ────────────────────────────────────────────────────────────────────
 
 @router.get("/health", tags=["ops"])
 async def health():
-    from ml.nlp_utils import _nlp
+    from ml.nlp_utils import loaded_components
+    from ml.relevance import get_relevance_backend, get_tfidf_model
+    spacy_components = loaded_components()
+    tfidf_model = get_tfidf_model()
     return {
         "status": "ok",
         "models": {
-            "spacy": _nlp is not None,
+            "spacy": spacy_components is not None,
+            "spacy_components": spacy_components,
             "embedder_mode": "tfidf",
+            "relevance_backend": get_relevance_backend(),
+            "tfidf_model": tfidf_model.version if tfidf_model else None,
             "groq_jd_parser": bool(ENABLE_GROQ_JD_PARSING and GROQ_API_KEY),
         },
     }
@@ -134,56 +158,6 @@ async def get_usage(request: Request, current_user: User = Depends(require_auth)
     )
 
 
-# ── ML helpers ────────────────────────────────────────────────────────────────
-
-def _run_ml_sync(
-    job_description: str,
-    raw_resumes: List[str],
-    weights: dict,
-    required_skills: List[str],
-    preferred_skills: List[str],
-    experience_cap_years: float,
-    min_years_experience: float | None,
-    required_degree: str | None,
-    jd_skill_tiers: dict | None = None,
-):
-    all_texts = [job_description] + raw_resumes
-    all_cleaned = clean_texts_batch(all_texts)
-    cleaned_jd = all_cleaned[0]
-
-    tiers = jd_skill_tiers or extract_jd_skill_tiers(
-        job_description,
-        required_skills,
-        preferred_skills,
-    )
-    jd_required = _canonical_skill_set(tiers["required"])
-    jd_preferred = _canonical_skill_set(tiers["preferred"]) | _canonical_skill_set(tiers["implicit"])
-
-    component_scores = calculate_component_scores_structured(
-        job_desc_clean=cleaned_jd,
-        resumes_clean=all_cleaned[1:],
-        job_desc_raw=job_description,
-        resumes_raw=raw_resumes,
-        weights=weights,
-        jd_skills=jd_required,
-        preferred_skills=jd_preferred,
-        experience_cap_years=experience_cap_years,
-        min_years_experience=min_years_experience,
-        required_degree=required_degree,
-    )
-
-    ats_scores = [
-        calculate_ats_score(raw, job_keywords=jd_required)
-        for raw in raw_resumes
-    ]
-
-    return component_scores, ats_scores, jd_required, jd_preferred
-
-
-def _extract_pdf_sync(content: bytes) -> str:
-    return extract_text_from_pdf(io.BytesIO(content))
-
-
 def _decode_jd_text(content: bytes) -> str:
     for encoding in ("utf-8-sig", "utf-16", "utf-16-le", "utf-16-be", "latin-1"):
         try:
@@ -193,12 +167,9 @@ def _decode_jd_text(content: bytes) -> str:
     raise HTTPException(status_code=400, detail="Job description file could not be decoded.")
 
 
-# ── POST /scan/pdf ─────────────────────────────────────────────────────────────
+# ── Scan inputs (shared by /scan/pdf and /scan/archive) ───────────────────────
 
-@router.post("/scan/pdf", response_model=ScanResponse, status_code=200)
-@limiter.limit("30/minute")
-async def scan_pdf(
-    request: Request,
+async def scan_form(
     role_title:           str   = Form("Unnamed Scan"),
     job_description:      str   = Form(""),
     required_skills:      str   = Form("[]"),
@@ -211,19 +182,8 @@ async def scan_pdf(
     education_priority:   str   = Form("Low"),
     relevance_priority:   str   = Form("Low"),
     jd_file: UploadFile | None   = File(None),
-    files: List[UploadFile]     = File(...),
-    current_user: User          = Depends(require_auth),
-    db: AsyncSession            = Depends(get_db),
-):
-    t_start = time.perf_counter()
-    unlimited_scans = is_dev_mode()
-    free_scans_used = int(current_user.free_scans_used or 0)
-    if not unlimited_scans and free_scans_used >= FREE_SCAN_LIMIT:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Free scan limit reached ({FREE_SCAN_LIMIT}/{FREE_SCAN_LIMIT}).",
-        )
-
+) -> ScanParams:
+    """Parse and validate the job-description form fields into ScanParams."""
     # ── Parse JSON form fields ──
     try:
         req_skills  = json.loads(required_skills)
@@ -275,6 +235,46 @@ async def scan_pdf(
             detail="At least one scoring dimension must have a priority above Ignore.",
         )
 
+    return ScanParams(
+        role_title=role_title,
+        job_description=job_description,
+        required_skills=req_skills,
+        preferred_skills=pref_skills,
+        min_years_experience=min_yrs,
+        required_degree=req_degree,
+        experience_cap_years=experience_cap_years,
+        priorities={
+            "skills":     skills_priority,
+            "experience": experience_priority,
+            "education":  education_priority,
+            "relevance":  relevance_priority,
+        },
+    )
+
+
+def _check_scan_quota(current_user: User) -> None:
+    """403 once the user's free scans are spent (dev mode is unlimited)."""
+    free_scans_used = int(current_user.free_scans_used or 0)
+    if not is_dev_mode() and free_scans_used >= FREE_SCAN_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Free scan limit reached ({FREE_SCAN_LIMIT}/{FREE_SCAN_LIMIT}).",
+        )
+
+
+def _apply_top_k(params: ScanParams, top_k: int | None) -> None:
+    """top_k turns on cascade ranking: only resumes that can reach the top K are fully scored."""
+    if top_k is not None and top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1")
+    params.top_k = top_k
+
+
+def _check_scan_mode(mode: str) -> None:
+    if mode not in ("sync", "async"):
+        raise HTTPException(status_code=400, detail="mode must be 'sync' or 'async'")
+
+
+async def _validate_resume_files(files: List[UploadFile]) -> None:
     if not files:
         raise HTTPException(status_code=400, detail="At least one resume PDF is required")
     if len(files) > MAX_FILES_PER_SCAN:
@@ -283,7 +283,6 @@ async def scan_pdf(
             detail=f"Too many files. Maximum {MAX_FILES_PER_SCAN} per scan.",
         )
 
-    # ── Validate files ──
     for file in files:
         if file.content_type not in ("application/pdf", "application/octet-stream"):
             raise HTTPException(
@@ -298,180 +297,168 @@ async def scan_pdf(
             )
         await file.seek(0)
 
-    # ── Extract PDF text (parallel) ──
-    loop = asyncio.get_running_loop()
-
-    async def process_file(f: UploadFile):
-        chunks, total = [], 0
-        while True:
-            chunk = await f.read(65536)
-            if not chunk:
-                break
-            total += len(chunk)
-            if total > MAX_UPLOAD_SIZE:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"{f.filename} exceeds {MAX_UPLOAD_SIZE // (1024*1024)} MB limit",
-                )
-            chunks.append(chunk)
-        content = b"".join(chunks)
-        text = await loop.run_in_executor(None, partial(_extract_pdf_sync, content))
-        if not text.strip():
-            raise HTTPException(
-                status_code=400,
-                detail=f"Could not extract text from {f.filename} (image-only PDF?)",
-            )
-        return text, f.filename or "resume.pdf"
-
-    process_results = await asyncio.gather(*[process_file(f) for f in files])
-    raw_resumes = [r[0] for r in process_results]
-    filenames   = [r[1] for r in process_results]
-
-    jd_skill_tiers = await parse_jd_skill_tiers_with_groq(
-        job_description,
-        req_skills,
-        pref_skills,
-    )
-
-    # ── ML scoring (thread pool) ──
-    component_scores, ats_scores, jd_required, jd_preferred = await loop.run_in_executor(
-        None,
-        partial(
-            _run_ml_sync,
-            job_description, raw_resumes, weights,
-            req_skills, pref_skills,
-            experience_cap_years, min_yrs, req_degree,
-            jd_skill_tiers,
-        ),
-    )
 
-    # ── Build result objects ──
-    results: List[CandidateResult] = []
-    for idx, base in enumerate(component_scores):
-        resume_skills  = set(base["resume_skills"])
-        matched_skills = sorted(
-            set(base.get("matched_skills", [])) |
-            set(base.get("matched_preferred_skills", []))
+async def _spool_resume_files(files: List[UploadFile]) -> List[SpooledUpload]:
+    """Spool uploads to disk (size-checked and hashed while streaming)."""
+    spooled: List[SpooledUpload] = []
+    try:
+        for f in files:
+            spooled.append(await spool_upload(f, MAX_UPLOAD_SIZE))
+    except BaseException:
+        discard_uploads(spooled)
+        raise
+    return spooled
+
+
+async def _run_scan(
+    db: AsyncSession,
+    current_user: User,
+    params: ScanParams,
+    source: ResumeSource,
+    mode: str,
+    t_start: float,
+):
+    """Queue (mode=async) or run the scan over spooled ``source``, which this takes ownership of."""
+    unlimited_scans = is_dev_mode()
+    free_scans_used = int(current_user.free_scans_used or 0)
+    total = len(source)
+
+    # ── Async job mode: enqueue and return immediately ──
+    if mode == "async":
+        scan = new_scan(
+            current_user.id, params,
+            total_candidates=total,
+            jd_skills_count=0,
+            processing_time_ms=0.0,
+            status=STATUS_QUEUED,
+            progress_done=0,
+            progress_total=total,
         )
-        missing_skills = sorted(base.get("missing_required_skills", []))
-
-        results.append(CandidateResult(
-            filename=filenames[idx],
-            final_score=base["final_score"],
-            skills_score=base["skills_score"],
-            exp_score=base["exp_score"],
-            edu_score=base["edu_score"],
-            relevance_score=base["relevance_score"],
-            semantic_overlap_score=base.get("semantic_overlap_score"),
-            role_alignment_score=base.get("role_alignment_score"),
-            ats_score=ats_scores[idx],
-            matched_skills_count=len(matched_skills),
-            matched_skills=matched_skills,
-            missing_required_skills=missing_skills,
-            experience=base.get("experience_str", "0.0 Years"),
-            degree=base.get("degree"),
-            years_experience=base.get("years_experience"),
-            meets_min_experience=base.get("meets_min_experience"),
-            meets_degree_req=base.get("meets_degree_req"),
-            primary_backend_language=base.get("primary_backend_language"),
-            jd_primary_backend_language=base.get("jd_primary_backend_language"),
-            resume_role_family=base.get("resume_role_family"),
-            jd_role_family=base.get("jd_role_family"),
-            confidence_level=base.get("confidence_level"),
-            hiring_recommendation=base.get("hiring_recommendation"),
-            ai_overview=base.get("ai_overview"),
-            score_summary=base.get("score_summary"),
-            score_concerns=base.get("score_concerns", []),
-            score_improvements=base.get("score_improvements", []),
+        db.add(scan)
+        if not unlimited_scans:
+            current_user.free_scans_used = free_scans_used + 1
+        try:
+            await db.commit()
+        except BaseException:
+            discard_uploads(source)
+            raise
+        get_scan_job_queue().submit(ScanJob(
+            scan.id, current_user.id, params, source, charged_quota=not unlimited_scans,
         ))
+        log.info("scan_queued", scan_id=scan.id, files=total, user=current_user.email)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=ScanJobAccepted(scan_id=scan.id, status=STATUS_QUEUED).model_dump(),
+        )
 
-    results.sort(key=lambda r: r.final_score, reverse=True)
-    overview_map = await generate_candidate_overviews(
-        role_title,
-        sorted(jd_required),
-        sorted(jd_preferred),
-        results,
-    )
-    for rank, result in enumerate(results, start=1):
-        result.ai_overview = overview_map.get(rank)
-
+    try:
+        outcome = await score_uploads(params, source, user_id=current_user.id)
+    finally:
+        discard_uploads(source)
+    results = outcome.results
     elapsed_ms = round((time.perf_counter() - t_start) * 1000, 1)
-    top_score  = round(results[0].final_score, 1) if results else 0.0
-    avg_score  = round(sum(r.final_score for r in results) / len(results), 1) if results else 0.0
 
     # ── Persist ──
-    scan = Scan(
-        user_id=current_user.id,
-        role_title=role_title,
-        job_description=job_description,
-        required_skills=json.dumps(req_skills),
-        preferred_skills=json.dumps(pref_skills),
-        min_years_experience=min_yrs,
-        required_degree=req_degree,
-        experience_cap_years=experience_cap_years,
-        skills_priority=skills_priority,
-        experience_priority=experience_priority,
-        education_priority=education_priority,
-        relevance_priority=relevance_priority,
-        total_candidates=len(results),
-        top_score=top_score,
-        avg_score=avg_score,
-        jd_skills_count=len(jd_required),
-        processing_time_ms=elapsed_ms,
-    )
-    db.add(scan)
-    await db.flush()
-
-    for rank, r in enumerate(results, start=1):
-        cand = Candidate(
-            scan_id=scan.id,
-            rank=rank,
-            filename=r.filename,
-            final_score=r.final_score,
-            skills_score=r.skills_score,
-            exp_score=r.exp_score,
-            edu_score=r.edu_score,
-            relevance_score=r.relevance_score,
-            semantic_overlap_score=r.semantic_overlap_score,
-            role_alignment_score=r.role_alignment_score,
-            ats_score=r.ats_score,
-            matched_skills_count=r.matched_skills_count,
-            missing_required_skills=json.dumps(r.missing_required_skills),
-            experience=r.experience,
-            years_experience=r.years_experience,
-            degree=r.degree,
-            primary_backend_language=r.primary_backend_language,
-            jd_primary_backend_language=r.jd_primary_backend_language,
-            resume_role_family=r.resume_role_family,
-            jd_role_family=r.jd_role_family,
-            confidence_level=r.confidence_level,
-            hiring_recommendation=r.hiring_recommendation,
-            ai_overview=r.ai_overview,
-            score_summary=r.score_summary,
-            score_concerns=json.dumps(r.score_concerns),
-            score_improvements=json.dumps(r.score_improvements),
-        )
-        db.add(cand)
-        await db.flush()
-        for skill in r.matched_skills:
-            db.add(CandidateSkill(candidate_id=cand.id, skill=skill))
+    scan = new_scan(current_user.id, params)
+    await persist_scan(db, scan, outcome, elapsed_ms)
 
     if not unlimited_scans:
         current_user.free_scans_used = free_scans_used + 1
     await db.commit()
     log.info("scan_complete", scan_id=scan.id, candidates=len(results),
-             ms=elapsed_ms, user=current_user.email)
+             ms=elapsed_ms, user=current_user.email,
+             skipped_files=len(outcome.skipped_files),
+             text_cache_hits=outcome.text_cache_hits,
+             text_cache_misses=outcome.text_cache_misses)
 
     return ScanResponse(
         scan_id=scan.id,
         results=results,
         total_candidates=len(results),
-        jd_skills_count=len(jd_required),
+        jd_skills_count=len(outcome.jd_required),
         processing_time_ms=elapsed_ms,
-        experience_cap_years=experience_cap_years,
+        experience_cap_years=params.experience_cap_years,
+        skipped_files=outcome.skipped_files,
     )
 
 
+# ── POST /scan/pdf ─────────────────────────────────────────────────────────────
+
+@router.post(
+    "/scan/pdf",
+    response_model=ScanResponse,
+    status_code=200,
+    responses={202: {"model": ScanJobAccepted, "description": "mode=async: scan queued"}},
+)
+@limiter.limit("30/minute")
+async def scan_pdf(
+    request: Request,
+    current_user: User          = Depends(require_auth),
+    db: AsyncSession            = Depends(get_db),
+    params: ScanParams          = Depends(scan_form),   # after auth: 401 before form errors
+    files: List[UploadFile]     = File(...),
+    mode:                 str   = Form("sync"),
+    top_k:         int | None   = Form(None),
+):
+    t_start = time.perf_counter()
+    _check_scan_quota(current_user)
+    _check_scan_mode(mode)
+    _apply_top_k(params, top_k)
+    await _validate_resume_files(files)
+
+    # Release the auth write (api_keys.last_used) before the long-running part:
+    # on SQLite an open write transaction would block the text cache and job
+    # worker sessions for the whole scan.
+    await db.commit()
+
+    spooled = await _spool_resume_files(files)
+    return await _run_scan(db, current_user, params, spooled, mode, t_start)
+
+
+# ── POST /scan/archive ─────────────────────────────────────────────────────────
+
+@router.post(
+    "/scan/archive",
+    response_model=ScanResponse,
+    status_code=200,
+    responses={202: {"model": ScanJobAccepted, "description": "mode=async: scan queued"}},
+)
+@limiter.limit("10/minute")
+async def scan_archive(
+    request: Request,
+    current_user: User          = Depends(require_auth),
+    db: AsyncSession            = Depends(get_db),
+    params: ScanParams          = Depends(scan_form),   # after auth: 401 before form errors
+    archive: UploadFile         = File(...),
+    mode:                 str   = Form("sync"),
+    top_k:         int | None   = Form(None),
+):
+    """
+    Bulk scan: one ZIP of resume PDFs instead of one multipart part per file.
+
+    Entries are unpacked one at a time into a bounded extraction queue, each
+    held to the per-file size limit and the PDF magic-byte check, so memory
+    does not grow with the number of resumes in the archive.
+    """
+    t_start = time.perf_counter()
+    _check_scan_quota(current_user)
+    _check_scan_mode(mode)
+    _apply_top_k(params, top_k)
+    if not (archive.filename or "").lower().endswith(".zip"):
+        raise HTTPException(status_code=400, detail=f"{archive.filename}: only .zip archives are accepted.")
+
+    await db.commit()   # release the auth write, as in scan_pdf
+
+    source = await open_resume_archive(archive, MAX_ARCHIVE_SIZE)
+    try:
+        source.validate(MAX_ARCHIVE_FILES, MAX_UPLOAD_SIZE)
+    except BaseException:
+        source.discard()
+        raise
+
+    return await _run_scan(db, current_user, params, source, mode, t_start)
+
+
 # ── GET /scans ─────────────────────────────────────────────────────────────────
 
 @router.get("/scans", response_model=List[ScanHistoryItem], tags=["history"])
@@ -500,25 +487,13 @@ async def list_scans(
             top_score=round(float(s.top_score or 0.0), 1),
             avg_score=round(float(s.avg_score or 0.0), 1),
             jd_snippet=s.job_description[:120],
+            status=s.status or "completed",
         )
         for s in scans
     ]
 
 
-# ── GET /scans/{scan_id} ───────────────────────────────────────────────────────
-
-@router.get("/scans/{scan_id}", response_model=ScanDetail, tags=["history"])
-@limiter.limit("60/minute")
-async def get_scan(
-    request: Request,
-    scan_id: str,
-    current_user: User   = Depends(require_auth),
-    db: AsyncSession     = Depends(get_db),
-):
-    scan: Scan | None = await db.get(Scan, scan_id)
-    if scan is None or scan.user_id != current_user.id:
-        raise HTTPException(status_code=404, detail="Scan not found")
-
+async def _load_candidate_results(db: AsyncSession, scan_id: str) -> List[CandidateResult]:
     # FIX: single query with join instead of N+1 per candidate
     cands_result = await db.execute(
         select(Candidate).where(Candidate.scan_id == scan_id).order_by(Candidate.rank)
@@ -548,10 +523,16 @@ async def get_scan(
             improvements = json.loads(c.score_improvements or "[]")
         except json.JSONDecodeError:
             improvements = []
+        try:
+            earlier_duplicates = json.loads(c.earlier_duplicates or "[]")
+        except json.JSONDecodeError:
+            earlier_duplicates = []
 
         results.append(CandidateResult(
+            candidate_id=c.id,
             filename=c.filename,
             final_score=c.final_score,
+            score_upper_bound=c.score_upper_bound,
             skills_score=c.skills_score,
             exp_score=c.exp_score,
             edu_score=c.edu_score,
@@ -575,8 +556,29 @@ async def get_scan(
             score_summary=c.score_summary,
             score_concerns=concerns,
             score_improvements=improvements,
+            duplicate_of=c.duplicate_of,
+            earlier_duplicates=earlier_duplicates,
         ))
 
+    return results
+
+
+# ── GET /scans/{scan_id} ───────────────────────────────────────────────────────
+
+@router.get("/scans/{scan_id}", response_model=ScanDetail, tags=["history"])
+@limiter.limit("60/minute")
+async def get_scan(
+    request: Request,
+    scan_id: str,
+    current_user: User   = Depends(require_auth),
+    db: AsyncSession     = Depends(get_db),
+):
+    scan: Scan | None = await db.get(Scan, scan_id)
+    if scan is None or scan.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Scan not found")
+
+    results = await _load_candidate_results(db, scan_id)
+
     try:
         req_skills  = json.loads(scan.required_skills  or "[]")
         pref_skills = json.loads(scan.preferred_skills or "[]")
@@ -601,6 +603,270 @@ async def get_scan(
         jd_skills_count=scan.jd_skills_count,
         processing_time_ms=scan.processing_time_ms,
         results=results,
+        status=scan.status or "completed",
+        stage=scan.stage,
+        progress_done=scan.progress_done,
+        progress_total=scan.progress_total,
+        error=scan.error,
+        skipped_files=stored_skipped_files(scan),
+    )
+
+
+# ── GET /scans/{scan_id}/events ────────────────────────────────────────────────
+
+@router.get("/scans/{scan_id}/events", tags=["history"])
+@limiter.limit("30/minute")
+async def scan_events(
+    request: Request,
+    scan_id: str,
+    current_user: User   = Depends(require_auth),
+    db: AsyncSession     = Depends(get_db),
+):
+    """
+    Server-Sent Events for a mode=async scan.
+
+    Events: ``stage`` (stage + progress), ``extracted`` (one per file),
+    ``provisional`` (ranking of the resumes scored so far, each scored on its
+    own against the JD), ``ranked`` (final batch ranking), ``overviews`` (AI
+    overviews by rank), then ``completed`` or ``failed``. A scan that is not
+    running in this process gets a single terminal event from the database.
+    """
+    scan: Scan | None = await db.get(Scan, scan_id)
+    if scan is None or scan.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Scan not found")
+
+    stream = get_scan_event_hub().subscribe(scan_id)
+    if stream is None:
+        if scan.status == STATUS_FAILED:
+            events = [format_sse("failed", {"scan_id": scan_id, "error": scan.error})]
+        elif scan.status == STATUS_COMPLETED:
+            results = await _load_candidate_results(db, scan_id)
+            events = [
+                format_sse("ranked", {"results": [r.model_dump(mode="json") for r in results]}),
+                format_sse("completed", {
+                    "scan_id": scan_id,
+                    "total_candidates": scan.total_candidates,
+                    "processing_time_ms": scan.processing_time_ms,
+                }),
+            ]
+        else:   # owned by another process; fall back to polling
+            events = [format_sse("stage", {
+                "stage": scan.stage or scan.status,
+                "done": scan.progress_done,
+                "total": scan.progress_total,
+            })]
+        stream = _iterate(events)
+    await db.commit()   # don't hold a transaction open for the life of the stream
+
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _iterate(items):
+    for item in items:
+        yield item
+
+
+# ── POST /scans/{scan_id}/resumes ─────────────────────────────────────────────
+
+@router.post("/scans/{scan_id}/resumes", response_model=ScanResponse, tags=["history"])
+@limiter.limit("30/minute")
+async def append_resumes(
+    request: Request,
+    scan_id: str,
+    files: List[UploadFile] = File(...),
+    current_user: User      = Depends(require_auth),
+    db: AsyncSession        = Depends(get_db),
+):
+    """
+    Add resumes to a completed scan without reprocessing the ones it has.
+
+    The new files are scored against the scan's stored settings and JD tiers;
+    existing candidates keep their scores and the union is re-ranked. Files
+    whose content is already in the scan are skipped.
+    """
+    t_start = time.perf_counter()
+    scan: Scan | None = await db.get(Scan, scan_id)
+    if scan is None or scan.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Scan not found")
+    if (scan.status or STATUS_COMPLETED) != STATUS_COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Scan is {scan.status}; only completed scans accept new resumes.")
+    _check_scan_quota(current_user)
+    await _validate_resume_files(files)
+    known_hashes = set((await db.execute(
+        select(Candidate.content_hash).where(Candidate.scan_id == scan_id)
+    )).scalars().all())
+    await db.commit()   # release the auth write, as in scan_pdf
+
+    spooled = await _spool_resume_files(files)
+    fresh = [upload for upload in spooled if upload.sha256 not in known_hashes]
+    discard_uploads([upload for upload in spooled if upload.sha256 in known_hashes])
+
+    params = scan_params(scan)
+    if fresh:
+        try:
+            outcome = await score_uploads(
+                params, fresh, jd_skill_tiers=stored_jd_skill_tiers(scan), user_id=current_user.id,
+            )
+        finally:
+            discard_uploads(fresh)
+        elapsed_ms = round((time.perf_counter() - t_start) * 1000, 1)
+        await append_to_scan(db, scan, outcome, elapsed_ms)
+        if not is_dev_mode():
+            current_user.free_scans_used = int(current_user.free_scans_used or 0) + 1
+        await db.commit()
+        log.info("scan_appended", scan_id=scan.id, added=len(fresh),
+                 skipped=len(spooled) - len(fresh), candidates=scan.total_candidates,
+                 ms=elapsed_ms, user=current_user.email)
+
+    return ScanResponse(
+        scan_id=scan.id,
+        results=await _load_candidate_results(db, scan.id),
+        total_candidates=scan.total_candidates,
+        jd_skills_count=scan.jd_skills_count,
+        processing_time_ms=round((time.perf_counter() - t_start) * 1000, 1),
+        experience_cap_years=scan.experience_cap_years,
+        skipped_files=stored_skipped_files(scan),
+    )
+
+
+# ── POST /scans/{scan_id}/rescore ─────────────────────────────────────────────
+
+@router.post("/scans/{scan_id}/rescore", response_model=ScanResponse, tags=["history"])
+@limiter.limit("60/minute")
+async def rescore(
+    request: Request,
+    scan_id: str,
+    priorities: RankingPriorities,
+    current_user: User = Depends(require_auth),
+    db: AsyncSession   = Depends(get_db),
+):
+    """Re-rank a completed scan under new priorities from its stored signals (no re-parsing)."""
+    t_start = time.perf_counter()
+    scan: Scan | None = await db.get(Scan, scan_id)
+    if scan is None or scan.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Scan not found")
+    if (scan.status or STATUS_COMPLETED) != STATUS_COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Scan is {scan.status}; only completed scans can be re-weighted.")
+    if sum(PRIORITY_MAP[p] for p in priorities.model_dump().values()) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one scoring dimension must have a priority above Ignore.",
+        )
+
+    await rescore_scan(db, scan, priorities.model_dump())
+    await db.commit()
+    elapsed_ms = round((time.perf_counter() - t_start) * 1000, 1)
+    log.info("scan_rescored", scan_id=scan.id, candidates=scan.total_candidates,
+             ms=elapsed_ms, user=current_user.email)
+
+    return ScanResponse(
+        scan_id=scan.id,
+        results=await _load_candidate_results(db, scan.id),
+        total_candidates=scan.total_candidates,
+        jd_skills_count=scan.jd_skills_count,
+        processing_time_ms=elapsed_ms,
+        experience_cap_years=scan.experience_cap_years,
+        skipped_files=stored_skipped_files(scan),
+    )
+
+
+# ── GET /candidates/{candidate_id}/similar ─────────────────────────────────────
+
+@router.get("/candidates/{candidate_id}/similar", response_model=List[SimilarCandidate], tags=["history"])
+@limiter.limit("30/minute")
+async def similar_candidates(
+    request: Request,
+    candidate_id: str,
+    limit: int = 10,
+    current_user: User = Depends(require_auth),
+    db: AsyncSession   = Depends(get_db),
+):
+    """
+    The user's other stored resumes that read most like this candidate's,
+    by cosine over persisted relevance vectors. Each resume is listed once,
+    from its most recent scan; nothing is re-extracted or re-vectorized.
+    The vectors stay in the user's in-memory talent pool, so a request runs
+    one sparse product and loads only the rows it returns.
+    """
+    candidate: Candidate | None = await db.get(Candidate, candidate_id)
+    scan: Scan | None = await db.get(Scan, candidate.scan_id) if candidate else None
+    if scan is None or scan.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    vectors = await lookup_vectors([candidate.content_hash]) if candidate.content_hash else {}
+    target = vectors.get(candidate.content_hash)
+    if target is None:
+        raise HTTPException(status_code=409, detail="No stored resume vector for this candidate; re-run its scan.")
+
+    cache = get_talent_pool_cache()
+    async with cache.lock(current_user.id):
+        pool = await cache.pool(db, current_user.id, vectors=True)
+        nearest = pool.vectors.nearest(target, max(1, min(limit, 50)), exclude=candidate.content_hash)
+    if not nearest:
+        return []
+
+    rows = (await db.execute(
+        select(Candidate.id, Candidate.scan_id, Candidate.filename, Candidate.content_hash, Scan.role_title)
+        .join(Scan, Candidate.scan_id == Scan.id)
+        .where(Scan.user_id == current_user.id, Candidate.content_hash.in_([digest for digest, _ in nearest]))
+        .order_by(Scan.created_at.desc())
+    )).all()
+    latest = {}
+    for row in rows:
+        latest.setdefault(row.content_hash, row)
+    return [
+        SimilarCandidate(
+            candidate_id=latest[digest].id,
+            scan_id=latest[digest].scan_id,
+            role_title=latest[digest].role_title,
+            filename=latest[digest].filename,
+            similarity=round(score, 4),
+        )
+        for digest, score in nearest
+        if digest in latest   # deleted since the pool last synced
+    ]
+
+
+# ── POST /pool/match ──────────────────────────────────────────────────────────
+
+MAX_POOL_SHORTLIST = 1000
+
+
+@router.post("/pool/match", response_model=PoolMatchResponse, tags=["pool"])
+@limiter.limit("30/minute")
+async def match_talent_pool(
+    request: Request,
+    current_user: User          = Depends(require_auth),
+    db: AsyncSession            = Depends(get_db),
+    params: ScanParams          = Depends(scan_form),
+    shortlist_size:       int   = Form(POOL_SHORTLIST_SIZE),
+    top_k:                int   = Form(20),
+):
+    """
+    Rank every resume the user has scanned before against a new JD, without a
+    new upload. A skill index shortlists the pool; only the shortlist is
+    scored. Nothing is persisted and no scan quota is used.
+    """
+    t_start = time.perf_counter()
+    shortlist_size = max(1, min(shortlist_size, MAX_POOL_SHORTLIST))
+    top_k = max(1, min(top_k, shortlist_size))
+    await db.commit()   # release the auth write before scoring (see scan_pdf)
+
+    match = await match_pool(db, current_user.id, params, shortlist_size, top_k)
+    elapsed_ms = round((time.perf_counter() - t_start) * 1000, 1)
+    log.info("pool_matched", pool=match.pool_size, shortlisted=match.shortlisted,
+             scored=match.scored, ms=elapsed_ms, user=current_user.email)
+    return PoolMatchResponse(
+        results=match.results,
+        pool_size=match.pool_size,
+        shortlisted=match.shortlisted,
+        scored=match.scored,
+        jd_skills_count=len(match.jd_required),
+        processing_time_ms=elapsed_ms,
     )
 
 
@@ -614,9 +880,18 @@ async def delete_scan(
     current_user: User = Depends(require_auth),
     db: AsyncSession   = Depends(get_db),
 ):
-    """Delete a scan and all associated candidates/skills (cascade)."""
+    """
+    Delete a scan and all associated candidates/skills (cascade), plus the
+    stored text, vectors and signatures of resumes no other scan still holds.
+    """
     scan: Scan | None = await db.get(Scan, scan_id)
     if scan is None or scan.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Scan not found")
+    digests = (await db.execute(
+        select(Candidate.content_hash).where(Candidate.scan_id == scan_id)
+    )).scalars().all()
     await db.delete(scan)
+    await db.flush()
+    purged = await purge_orphaned_resumes(db, digests)
     await db.commit()
+    get_resume_text_cache().forget_local(purged)
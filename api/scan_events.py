@@ -0,0 +1,101 @@
+"""
+In-process fan-out of scan job events for ``GET /scans/{scan_id}/events``.
+
+The job worker publishes named events onto a per-scan channel; each SSE
+subscriber gets its own queue. A channel keeps a short replay history so a
+client that connects after the POST (the normal case) still sees the scan
+from the start. Only the latest snapshot of repeating events (``stage``,
+``provisional``) is kept, so history stays small for large batches.
+
+Channels exist only while a job runs in this process; once a scan is done
+the endpoint answers from the database instead.
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator
+
+TERMINAL_EVENTS = {"completed", "failed"}
+_SNAPSHOT_EVENTS = {"stage", "provisional"}
+
+# Comment line sent when nothing happened for a while, so idle proxies keep
+# the connection open.
+HEARTBEAT_SECONDS = 15.0
+
+Event = tuple[str, dict]
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class _Channel:
+    def __init__(self):
+        self.history: list[Event] = []
+        self.subscribers: set[asyncio.Queue] = set()
+        self.closed = False
+
+
+class ScanEventHub:
+    def __init__(self):
+        self._channels: dict[str, _Channel] = {}
+
+    def open(self, scan_id: str) -> None:
+        self._channels.setdefault(scan_id, _Channel())
+
+    def has_subscribers(self, scan_id: str) -> bool:
+        channel = self._channels.get(scan_id)
+        return bool(channel and channel.subscribers)
+
+    def publish(self, scan_id: str, event: str, data: dict) -> None:
+        channel = self._channels.get(scan_id)
+        if channel is None or channel.closed:
+            return
+        if event in _SNAPSHOT_EVENTS:
+            channel.history = [item for item in channel.history if item[0] != event]
+        channel.history.append((event, data))
+        for queue in channel.subscribers:
+            queue.put_nowait((event, data))
+
+    def close(self, scan_id: str) -> None:
+        channel = self._channels.pop(scan_id, None)
+        if channel is None:
+            return
+        channel.closed = True
+        for queue in channel.subscribers:
+            queue.put_nowait(None)
+
+    def subscribe(self, scan_id: str) -> AsyncIterator[str] | None:
+        """Return an SSE text stream for a live scan, or None if none is running here."""
+        channel = self._channels.get(scan_id)
+        if channel is None:
+            return None
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in channel.history:
+            queue.put_nowait(item)
+        channel.subscribers.add(queue)
+        return self._stream(channel, queue)
+
+    async def _stream(self, channel: _Channel, queue: asyncio.Queue) -> AsyncIterator[str]:
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    return
+                event, data = item
+                yield format_sse(event, data)
+                if event in TERMINAL_EVENTS:
+                    return
+        finally:
+            channel.subscribers.discard(queue)
+
+
+_hub = ScanEventHub()
+
+
+def get_scan_event_hub() -> ScanEventHub:
+    return _hub
@@ -0,0 +1,256 @@
+"""
+In-app job queue for asynchronous scans.
+
+``POST /scan/pdf`` (or ``/scan/archive``) with ``mode=async`` validates and
+spools the uploads, inserts a ``queued`` Scan row, charges the free-scan quota
+and hands a ScanJob to this queue. A small pool of asyncio worker tasks runs the shared
+scan pipeline and records status / stage progress on the Scan row, which
+``GET /scans/{scan_id}`` reports, and publishes the same progress plus
+provisional and final rankings to ``GET /scans/{scan_id}/events``
+subscribers. A failed job stores its error and refunds the quota.
+
+Jobs live in process memory: a restart loses anything queued or running, so
+startup marks such scans failed instead of leaving them pending forever.
+"""
+
+import asyncio
+import time
+from typing import List
+
+import structlog
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from api import config
+from api.scan_events import get_scan_event_hub
+from api.scan_pipeline import (
+    STAGE_EXTRACTING,
+    STAGE_SAVING,
+    ScanObserver,
+    ScanParams,
+    persist_scan,
+    score_uploads,
+)
+from api.schemas import CandidateResult
+from api.uploads import ResumeSource, discard_uploads
+from db.models import Scan, User
+from db.session import AsyncSessionLocal
+
+log = structlog.get_logger()
+
+STATUS_QUEUED    = "queued"
+STATUS_RUNNING   = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED    = "failed"
+
+
+class ScanJob:
+    def __init__(
+        self,
+        scan_id: str,
+        user_id: str,
+        params: ScanParams,
+        uploads: ResumeSource,
+        charged_quota: bool,
+    ):
+        self.scan_id = scan_id
+        self.user_id = user_id
+        self.params = params
+        self.uploads = uploads
+        self.charged_quota = charged_quota
+
+
+def _ranking_payload(results: List[CandidateResult]) -> dict:
+    return {"results": [r.model_dump(mode="json") for r in results]}
+
+
+class _JobObserver(ScanObserver):
+    """Records stage progress on the Scan row for pollers and streams it to SSE subscribers."""
+
+    def __init__(self, scan_id: str):
+        self.scan_id = scan_id
+        self.hub = get_scan_event_hub()
+
+    async def _record(self, stage: str, done: int, total: int) -> None:
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(Scan)
+                .where(Scan.id == self.scan_id)
+                .values(stage=stage, progress_done=done, progress_total=total)
+            )
+            await session.commit()
+
+    async def on_stage(self, stage: str, done: int, total: int) -> None:
+        await self._record(stage, done, total)
+        self.hub.publish(self.scan_id, "stage", {"stage": stage, "done": done, "total": total})
+
+    async def on_extracted(self, filename: str, done: int, total: int) -> None:
+        await self._record(STAGE_EXTRACTING, done, total)
+        self.hub.publish(self.scan_id, "extracted", {"filename": filename, "done": done, "total": total})
+
+    def wants_provisional(self) -> bool:
+        # Only pay for per-resume scoring while someone is watching.
+        return self.hub.has_subscribers(self.scan_id)
+
+    async def on_provisional(self, scored: CandidateResult, ranking: List[CandidateResult]) -> None:
+        self.hub.publish(self.scan_id, "provisional", {
+            "scored": scored.filename,
+            **_ranking_payload(ranking),
+        })
+
+    async def on_ranked(self, results: List[CandidateResult]) -> None:
+        self.hub.publish(self.scan_id, "ranked", _ranking_payload(results))
+
+    async def on_overviews(self, results: List[CandidateResult]) -> None:
+        self.hub.publish(self.scan_id, "overviews", {
+            "overviews": {rank: r.ai_overview for rank, r in enumerate(results, start=1) if r.ai_overview},
+        })
+
+
+class ScanJobQueue:
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def _ensure_workers(self) -> None:
+        # Workers are bound to the loop that serves requests; started lazily so
+        # the queue also works when the app runs without its lifespan.
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            loop.create_task(self._worker(), name=f"scan-job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    def submit(self, job: ScanJob) -> None:
+        self._ensure_workers()
+        hub = get_scan_event_hub()
+        hub.open(job.scan_id)
+        hub.publish(job.scan_id, "stage", {"stage": STATUS_QUEUED, "done": 0, "total": len(job.uploads)})
+        self._queue.put_nowait(job)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except Exception as exc:   # never let one job kill the worker
+                log.error("scan_job_crashed", scan_id=job.scan_id, error=str(exc)[:200])
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: ScanJob) -> None:
+        t_start = time.perf_counter()
+        hub = get_scan_event_hub()
+        try:
+            async with AsyncSessionLocal() as session:
+                scan = await session.get(Scan, job.scan_id)
+                if scan is None:   # deleted while queued
+                    return
+                scan.status = STATUS_RUNNING
+                scan.stage = STAGE_EXTRACTING
+                scan.progress_done = 0
+                scan.progress_total = len(job.uploads)
+                await session.commit()
+
+            try:
+                outcome = await score_uploads(
+                    job.params, job.uploads, _JobObserver(job.scan_id), user_id=job.user_id,
+                )
+            except HTTPException as exc:
+                await self._fail(job, str(exc.detail))
+                return
+            except Exception as exc:
+                log.error("scan_job_failed", scan_id=job.scan_id, error=str(exc)[:200])
+                await self._fail(job, "Internal error while processing the scan.")
+                return
+
+            elapsed_ms = round((time.perf_counter() - t_start) * 1000, 1)
+            try:
+                async with AsyncSessionLocal() as session:
+                    scan = await session.get(Scan, job.scan_id)
+                    if scan is None:   # deleted while running
+                        return
+                    scan.stage = STAGE_SAVING
+                    await persist_scan(session, scan, outcome, elapsed_ms)
+                    scan.status = STATUS_COMPLETED
+                    scan.stage = None
+                    scan.progress_done = scan.progress_total = len(outcome.results)
+                    await session.commit()
+            except Exception as exc:   # the session rolled back; _fail writes in a fresh one
+                log.error("scan_job_save_failed", scan_id=job.scan_id, error=str(exc)[:200])
+                await self._fail(job, "Internal error while saving the scan.")
+                return
+            hub.publish(job.scan_id, "completed", {
+                "scan_id": job.scan_id,
+                "total_candidates": len(outcome.results),
+                "processing_time_ms": elapsed_ms,
+                "skipped_files": [s.model_dump() for s in outcome.skipped_files],
+            })
+            log.info("scan_complete", scan_id=job.scan_id, candidates=len(outcome.results),
+                     ms=elapsed_ms, user_id=job.user_id, mode="async",
+                     skipped_files=len(outcome.skipped_files),
+                     text_cache_hits=outcome.text_cache_hits,
+                     text_cache_misses=outcome.text_cache_misses)
+        finally:
+            hub.close(job.scan_id)
+            discard_uploads(job.uploads)
+
+    async def _fail(self, job: ScanJob, error: str) -> None:
+        async with AsyncSessionLocal() as session:
+            scan = await session.get(Scan, job.scan_id)
+            if scan is not None:
+                scan.status = STATUS_FAILED
+                scan.stage = None
+                scan.error = error[:1000]
+            if job.charged_quota:
+                user = await session.get(User, job.user_id)
+                if user is not None:
+                    user.free_scans_used = max(int(user.free_scans_used or 0) - 1, 0)
+            await session.commit()
+        get_scan_event_hub().publish(job.scan_id, "failed", {"scan_id": job.scan_id, "error": error})
+
+    async def shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = self._queue = None
+
+
+async def fail_interrupted_scans() -> None:
+    """Mark scans left queued/running by a previous process as failed."""
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(Scan)
+            .where(Scan.status.in_((STATUS_QUEUED, STATUS_RUNNING)))
+            .values(
+                status=STATUS_FAILED,
+                stage=None,
+                error="Interrupted by a server restart; please run the scan again.",
+            )
+        )
+        await session.commit()
+
+
+_queue: ScanJobQueue | None = None
+
+
+def get_scan_job_queue() -> ScanJobQueue:
+    global _queue
+    if _queue is None:
+        _queue = ScanJobQueue(config.SCAN_JOB_WORKERS)
+    return _queue
+
+
+async def shutdown_scan_jobs() -> None:
+    global _queue
+    if _queue is not None:
+        await _queue.shutdown()
+        _queue = None
@@ -0,0 +1,1083 @@
+"""
+Scan execution shared by the request and job-queue paths of /scan/pdf and
+/scan/archive.
+
+  score_uploads()  — spooled resume PDFs (or a ZIP of them) → ranked CandidateResults + AI overviews
+  new_scan()       — the Scan row for a set of inputs
+  persist_scan()   — write ranked results and aggregates onto a Scan row
+  append_to_scan() — merge newly scored resumes into a stored scan and re-rank
+  rescore_scan()   — re-weight a stored scan from its persisted component signals
+  match_pool()     — rank a user's stored resumes against a new JD via the talent pool index
+
+Resumes are deduplicated with MinHash signatures (ml.dedupe): exact and near
+duplicates inside a scan are scored once and share their original's results,
+and each resume is checked against the user's earlier scans.
+
+Progress is reported through a ScanObserver so a caller can publish it (the
+job worker writes it to the scans table and streams it to SSE subscribers)
+without the scoring code knowing where it goes.
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from functools import partial
+from typing import AsyncIterator, List
+
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.ai.groq_jd_parser import parse_jd_skill_tiers_with_groq
+from api.ai.groq_overview import generate_candidate_overviews
+from api.config import (
+    MAX_UPLOAD_SIZE,
+    NER_BATCH_SIZE,
+    NER_N_PROCESS,
+    PDF_EXTRACT_TIMEOUT_SECONDS,
+    PDF_EXTRACT_WORKERS,
+)
+from api.constants import PRIORITY_MAP
+from api.resume_cache import get_resume_text_cache
+from api.resume_parser import PdfExtractionError, PdfExtractionTimeout, get_pdf_extractor
+from api.resume_signatures import store_signatures
+from api.resume_vectors import lookup_vectors, store_vectors
+from api.schemas import CandidateResult, DuplicateCandidate, SkippedFile
+from api.talent_pools import get_talent_pool_cache
+from api.uploads import ResumeArchive, ResumeSource, SpooledUpload
+from db.models import Candidate, CandidateSkill, ResumeSignature, ResumeText, ResumeVector, Scan
+from ml.dedupe import LshIndex, minhash_signature
+from ml.matcher import (
+    SCREENED_OUT,
+    ResumeFeatures,
+    calculate_ats_score,
+    calculate_component_scores_structured,
+    calculate_component_scores_top_k,
+    extract_jd_skill_tiers,
+    extract_resume_features_batch,
+    final_score_from_signals,
+    hiring_recommendation,
+)
+from ml.relevance import get_relevance_backend
+from pipeline.skills import SkillSet, normalize_skill
+
+STAGE_EXTRACTING = "extracting"
+STAGE_SCORING    = "scoring"
+STAGE_OVERVIEWS  = "overviews"
+STAGE_SAVING     = "saving"
+
+# Near-duplicates from earlier scans listed per resume, most similar first.
+EARLIER_DUPLICATE_LIMIT = 5
+
+# Per-resume feature extraction is GIL-bound spaCy/regex work; one thread keeps
+# it off the event loop without contending with itself across concurrent scans.
+_feature_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resume-features")
+
+
+def _settle(future: asyncio.Future, result, exc: BaseException | None) -> None:
+    if future.done():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
+
+
+class _FeatureBatcher:
+    """
+    Resume features on the feature thread, with NER batched across resumes.
+
+    Texts submitted while a batch is running wait and go through the next
+    extract_resume_features_batch call together, so a burst of arrivals
+    (text-cache hits, a fast archive) shares one nlp.pipe pass while a lone
+    resume still starts straight away.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, batch_size: int, n_process: int):
+        self._executor = executor
+        self._batch_size = max(batch_size, 1)
+        self._n_process = n_process
+        self._pending: list = []
+        self._draining = False
+        self._lock = threading.Lock()
+
+    def submit(self, text: str, relevance_vector=None) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            self._pending.append((loop, future, text, relevance_vector))
+            if self._draining:
+                return future
+            self._draining = True
+        self._executor.submit(self._drain)
+        return future
+
+    @staticmethod
+    def _post(batch: list, outcomes) -> None:
+        for (loop, future, _, _), (result, exc) in zip(batch, outcomes):
+            try:
+                loop.call_soon_threadsafe(_settle, future, result, exc)
+            except RuntimeError:   # the scan's event loop has already closed
+                pass
+
+    def _drain(self) -> None:
+        batch: list = []
+        try:
+            while True:
+                with self._lock:
+                    batch = [item for item in self._pending[:self._batch_size] if not item[1].cancelled()]
+                    del self._pending[:self._batch_size]
+                    if not self._pending and not batch:
+                        self._draining = False
+                        return
+                if not batch:
+                    continue
+                try:
+                    features = extract_resume_features_batch(
+                        [text for _, _, text, _ in batch], self._batch_size, self._n_process,
+                        [vector for _, _, _, vector in batch], vectorize=True,   # scans persist them
+                    )
+                    outcomes = [(result, None) for result in features]
+                except Exception as exc:
+                    outcomes = [(None, exc)] * len(batch)
+                self._post(batch, outcomes)
+                batch = []
+        except BaseException as exc:
+            # Nothing drains after this; fail everything waiting so no scan hangs.
+            with self._lock:
+                stranded, self._pending = batch + self._pending, []
+                self._draining = False
+            self._post(stranded, [(None, exc)] * len(stranded))
+            raise
+
+
+_feature_batcher = _FeatureBatcher(_feature_executor, NER_BATCH_SIZE, NER_N_PROCESS)
+
+
+class ScanParams:
+    """Validated /scan/pdf inputs; everything a worker needs to run the scan later."""
+
+    def __init__(
+        self,
+        *,
+        role_title: str,
+        job_description: str,
+        required_skills: list,
+        preferred_skills: list,
+        min_years_experience: float | None,
+        required_degree: str | None,
+        experience_cap_years: float,
+        priorities: dict[str, str],
+        top_k: int | None = None,
+    ):
+        self.role_title = role_title
+        self.job_description = job_description
+        self.required_skills = required_skills
+        self.preferred_skills = preferred_skills
+        self.min_years_experience = min_years_experience
+        self.required_degree = required_degree
+        self.experience_cap_years = experience_cap_years
+        self.priorities = priorities
+        self.top_k = top_k   # cascade mode: fully score only what can reach the top K
+
+    @property
+    def weights(self) -> dict[str, float]:
+        return {dim: PRIORITY_MAP[priority] for dim, priority in self.priorities.items()}
+
+
+class ScanOutcome:
+    """
+    Ranked results plus what persisting them needs; digests/resume_features/signals
+    align with results (features and signals are None for screened-out resumes;
+    features are None for near-duplicates, which share another resume's signals).
+    ``skipped_files`` lists uploads whose text could not be extracted.
+    """
+
+    def __init__(
+        self,
+        results: List[CandidateResult],
+        jd_required: set[str],
+        jd_preferred: set[str],
+        text_cache_hits: int,
+        text_cache_misses: int,
+        jd_skill_tiers: dict,
+        digests: List[str],
+        resume_features: List[ResumeFeatures | None],
+        signals: List[dict | None],
+        skipped_files: List[SkippedFile] | None = None,
+    ):
+        self.results = results
+        self.jd_required = jd_required
+        self.jd_preferred = jd_preferred
+        self.text_cache_hits = text_cache_hits
+        self.text_cache_misses = text_cache_misses
+        self.jd_skill_tiers = jd_skill_tiers
+        self.digests = digests
+        self.resume_features = resume_features
+        self.signals = signals
+        self.skipped_files = skipped_files or []
+
+
+class ScanObserver:
+    """No-op progress sink; subclasses override what they publish."""
+
+    async def on_stage(self, stage: str, done: int, total: int) -> None:
+        pass
+
+    async def on_extracted(self, filename: str, done: int, total: int) -> None:
+        await self.on_stage(STAGE_EXTRACTING, done, total)
+
+    def wants_provisional(self) -> bool:
+        """Score each resume on its own as it arrives? Costs one extra scoring pass."""
+        return False
+
+    async def on_provisional(self, scored: CandidateResult, ranking: List[CandidateResult]) -> None:
+        pass
+
+    async def on_ranked(self, results: List[CandidateResult]) -> None:
+        pass
+
+    async def on_overviews(self, results: List[CandidateResult]) -> None:
+        pass
+
+
+# ── ML helpers ────────────────────────────────────────────────────────────────
+
+def _canonical_skill_set(skills) -> set[str]:
+    return {
+        normalize_skill(skill)
+        for skill in skills
+        if isinstance(skill, str) and skill and not skill.startswith("unknown:")
+    }
+
+
+def _tiered_jd_skills(
+    job_description: str,
+    required_skills: List[str],
+    preferred_skills: List[str],
+    jd_skill_tiers: dict | None,
+) -> tuple[dict, set[str], set[str]]:
+    """JD tiers (parsed locally unless given) and the canonical required / preferred sets."""
+    tiers = jd_skill_tiers or extract_jd_skill_tiers(
+        job_description,
+        required_skills,
+        preferred_skills,
+    )
+    jd_required = _canonical_skill_set(tiers["required"])
+    jd_preferred = _canonical_skill_set(tiers["preferred"]) | _canonical_skill_set(tiers["implicit"])
+    return tiers, jd_required, jd_preferred
+
+
+def _run_ml_sync(
+    job_description: str,
+    raw_resumes: List[str],
+    weights: dict,
+    required_skills: List[str],
+    preferred_skills: List[str],
+    experience_cap_years: float,
+    min_years_experience: float | None,
+    required_degree: str | None,
+    jd_skill_tiers: dict | None = None,
+    resume_features: List[ResumeFeatures] | None = None,
+):
+    if resume_features is None:
+        resume_features = extract_resume_features_batch(raw_resumes)
+    tiers, jd_required, jd_preferred = _tiered_jd_skills(
+        job_description, required_skills, preferred_skills, jd_skill_tiers,
+    )
+
+    component_scores = calculate_component_scores_structured(
+        job_desc_clean="",        # lemmatized text is not read by the structured scorer
+        resumes_clean=[],
+        job_desc_raw=job_description,
+        resumes_raw=raw_resumes,
+        weights=weights,
+        jd_skills=jd_required,
+        preferred_skills=jd_preferred,
+        experience_cap_years=experience_cap_years,
+        min_years_experience=min_years_experience,
+        required_degree=required_degree,
+        resume_features=resume_features,
+    )
+
+    jd_required_bits = SkillSet.of(jd_required)   # encoded once, shared by every resume
+    ats_scores = [
+        calculate_ats_score(features, job_keywords=jd_required_bits)
+        for features in resume_features
+    ]
+
+    return component_scores, ats_scores, jd_required, jd_preferred, tiers
+
+
+def _run_top_k_sync(params: ScanParams, raw_resumes: List[str], jd_skill_tiers: dict | None, relevance_vectors: list):
+    """
+    _run_ml_sync in cascade mode (params.top_k): features are extracted only
+    for resumes whose score bound can still reach the top K, so the resume
+    features come back too (None for screened-out resumes, whose ATS score is 0).
+    """
+    tiers, jd_required, jd_preferred = _tiered_jd_skills(
+        params.job_description, params.required_skills, params.preferred_skills, jd_skill_tiers,
+    )
+
+    def extract(indices: List[int]) -> List[ResumeFeatures]:
+        return extract_resume_features_batch(
+            [raw_resumes[i] for i in indices], NER_BATCH_SIZE, NER_N_PROCESS,
+            [relevance_vectors[i] for i in indices], vectorize=True,   # score_uploads persists them
+        )
+
+    component_scores, resume_features = calculate_component_scores_top_k(
+        params.job_description, raw_resumes, params.weights, params.top_k,
+        jd_required, jd_preferred,
+        params.experience_cap_years, params.min_years_experience, params.required_degree,
+        extract,
+    )
+    jd_required_bits = SkillSet.of(jd_required)
+    ats_scores = [
+        calculate_ats_score(features, job_keywords=jd_required_bits) if features is not None else 0.0
+        for features in resume_features
+    ]
+    return component_scores, ats_scores, jd_required, jd_preferred, tiers, resume_features
+
+
+def _score_single_sync(params: ScanParams, raw: str, features: ResumeFeatures, jd_skill_tiers: dict | None):
+    """Score one resume against the JD on its own (TF-IDF fitted on just the pair)."""
+    component_scores, ats_scores, _, _, _ = _run_ml_sync(
+        params.job_description, [raw], params.weights,
+        params.required_skills, params.preferred_skills,
+        params.experience_cap_years, params.min_years_experience, params.required_degree,
+        jd_skill_tiers, [features],
+    )
+    return component_scores[0], ats_scores[0]
+
+
+def _candidate_result(filename: str, base: dict, ats_score: float) -> CandidateResult:
+    matched_skills = sorted(
+        set(base.get("matched_skills", [])) |
+        set(base.get("matched_preferred_skills", []))
+    )
+    missing_skills = sorted(base.get("missing_required_skills", []))
+
+    return CandidateResult(
+        filename=filename,
+        final_score=base["final_score"],
+        score_upper_bound=base.get("score_upper_bound"),
+        skills_score=base["skills_score"],
+        exp_score=base["exp_score"],
+        edu_score=base["edu_score"],
+        relevance_score=base["relevance_score"],
+        semantic_overlap_score=base.get("semantic_overlap_score"),
+        role_alignment_score=base.get("role_alignment_score"),
+        ats_score=ats_score,
+        matched_skills_count=len(matched_skills),
+        matched_skills=matched_skills,
+        missing_required_skills=missing_skills,
+        experience=base.get("experience_str", "0.0 Years"),
+        degree=base.get("degree"),
+        years_experience=base.get("years_experience"),
+        meets_min_experience=base.get("meets_min_experience"),
+        meets_degree_req=base.get("meets_degree_req"),
+        primary_backend_language=base.get("primary_backend_language"),
+        jd_primary_backend_language=base.get("jd_primary_backend_language"),
+        resume_role_family=base.get("resume_role_family"),
+        jd_role_family=base.get("jd_role_family"),
+        confidence_level=base.get("confidence_level"),
+        hiring_recommendation=base.get("hiring_recommendation"),
+        ai_overview=base.get("ai_overview"),
+        score_summary=base.get("score_summary"),
+        score_concerns=base.get("score_concerns", []),
+        score_improvements=base.get("score_improvements", []),
+    )
+
+
+def _duplicate_owners(digests: List[str], signatures: dict) -> List[int]:
+    """
+    For each upload, the index of the upload whose scores it shares: itself
+    for the first copy of each resume, else the earliest upload its text
+    near-duplicates (or repeats byte for byte). Depends only on upload order.
+    """
+    index = LshIndex()
+    first: dict[str, int] = {}
+    owners = []
+    for idx, digest in enumerate(digests):
+        if digest not in first:
+            matches = index.near_duplicates(signatures[digest])
+            if matches:
+                first[digest] = first[matches[0][0]]
+            else:
+                first[digest] = idx
+                index.add(digest, signatures[digest])
+        owners.append(first[digest])
+    return owners
+
+
+# ── Pipelined execution ──────────────────────────────────────────────────────
+
+async def _iter_source(source: ResumeSource) -> AsyncIterator[SpooledUpload]:
+    if isinstance(source, ResumeArchive):
+        async with aclosing(source.iter_uploads(MAX_UPLOAD_SIZE)) as entries:
+            async for upload in entries:
+                yield upload
+    else:
+        for upload in source:
+            yield upload
+
+
+async def score_uploads(
+    params: ScanParams,
+    uploads: ResumeSource,
+    observer: ScanObserver | None = None,
+    jd_skill_tiers: dict | None = None,
+    user_id: str | None = None,
+) -> ScanOutcome:
+    """
+    Extract, score and rank spooled resume PDFs.
+
+    ``uploads`` is a list of spooled files or a ResumeArchive. Either way the
+    files flow through a bounded queue to one extraction consumer per PDF
+    worker, so an archive is unpacked only as fast as it is extracted and each
+    spooled file is discarded as soon as its text has been read; only the
+    texts themselves are kept for the batch-wide TF-IDF pass.
+
+    The JD profile (Groq round-trip) runs concurrently with extraction, and
+    each resume's JD-independent features are computed as soon as its text is
+    available (reusing the stored relevance vector of a resume seen before). Only TF-IDF and ranking wait for the whole batch. When the
+    observer asks for it, each resume is also scored on its own as it arrives
+    so a provisional ranking can be shown before the batch finishes. Pass the
+    stored ``jd_skill_tiers`` of an existing scan to skip JD parsing. With
+    ``params.top_k`` set, nothing is extracted up front and no provisional
+    ranking is produced: once all texts are in, the top-K cascade extracts
+    features only for resumes that can still reach the top K.
+
+    Each text's MinHash signature is taken as it arrives; a text that
+    near-duplicates one already being processed gets no features or
+    provisional score. Once all texts are in, every copy of a resume (exact
+    or near) shares the scores of its first upload, flagged by
+    ``duplicate_of``; only first copies are scored. With ``user_id``, each
+    resume's ``earlier_duplicates`` lists near-duplicates from the user's
+    stored scans (looked up while scoring runs). A file whose text cannot
+    be extracted (timeout, unreadable or image-only PDF) is left out and
+    listed in ``skipped_files``; HTTPException(400) is raised only when no
+    file could be read. The caller still owns
+    (and discards) a ResumeArchive and any list entries left unprocessed.
+    """
+    observer = observer or ScanObserver()
+    loop = asyncio.get_running_loop()
+    text_cache = get_resume_text_cache()
+    extractor = get_pdf_extractor()
+    streaming = isinstance(uploads, ResumeArchive)
+    cascade = params.top_k is not None
+    total = len(uploads)
+    consumers = max(PDF_EXTRACT_WORKERS, 1)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=consumers)
+    arrivals: list[tuple[str, str]] = []                 # (filename, digest) in upload order
+    cached_texts: dict[str, tuple[str, str | None]] = {}
+    stored_vectors: dict = {}                            # digest -> persisted relevance vector
+    fresh_texts: dict[str, tuple[str, str | None]] = {}
+    extraction_errors: dict[str, str] = {}               # digest -> why it has no text
+    text_futures: dict[str, asyncio.Future] = {}         # one extraction per distinct digest
+    feature_futures: dict[str, asyncio.Future] = {}
+    provisional_scores: dict[str, asyncio.Future] = {}
+    provisional_tasks: list[asyncio.Task] = []
+    provisional_results: List[CandidateResult] = []
+    signatures: dict = {}                                # digest -> MinHash signature
+    arrived = LshIndex()                                 # texts whose features were submitted
+    earlier_task: asyncio.Task | None = None
+    resolved = 0
+
+    if jd_skill_tiers is not None:
+        jd_task = loop.create_future()
+        jd_task.set_result(jd_skill_tiers)
+    else:
+        jd_task = asyncio.create_task(
+            parse_jd_skill_tiers_with_groq(
+                params.job_description, params.required_skills, params.preferred_skills,
+            )
+        )
+
+    async def score_single(digest: str, text: str):
+        features = await feature_futures[digest]
+        return await loop.run_in_executor(
+            _feature_executor,
+            partial(_score_single_sync, params, text, features, jd_task.result()),
+        )
+
+    async def score_provisionally(filename: str, digest: str, text: str) -> None:
+        await feature_futures[digest]
+        await jd_task
+        if not observer.wants_provisional():
+            return
+        if digest not in provisional_scores:
+            provisional_scores[digest] = asyncio.ensure_future(score_single(digest, text))
+        base, ats_score = await provisional_scores[digest]
+        scored = _candidate_result(filename, base, ats_score)
+        provisional_results.append(scored)
+        provisional_results.sort(key=lambda r: r.final_score, reverse=True)
+        await observer.on_provisional(scored, list(provisional_results))
+
+    async def read_text(upload: SpooledUpload) -> str:
+        digest = upload.sha256
+        if streaming:
+            cached_texts.update(await text_cache.lookup_many([digest]))
+            stored_vectors.update(await lookup_vectors([digest]))
+        if digest in cached_texts:
+            return cached_texts[digest][0]
+        try:
+            fresh_texts[digest] = await extractor.extract_path(upload.path)
+        except PdfExtractionTimeout:
+            extraction_errors[digest] = f"PDF extraction timed out after {PDF_EXTRACT_TIMEOUT_SECONDS:g}s"
+            return ""
+        except PdfExtractionError as exc:
+            extraction_errors[digest] = str(exc)
+            return ""
+        return fresh_texts[digest][0]
+
+    async def process(upload: SpooledUpload) -> None:
+        nonlocal resolved
+        digest = upload.sha256
+        try:
+            if digest not in text_futures:   # duplicate uploads extract once
+                text_futures[digest] = asyncio.ensure_future(read_text(upload))
+            text = await text_futures[digest]
+        finally:
+            upload.discard()
+        if text.strip():
+            if digest not in signatures:
+                signatures[digest] = minhash_signature(text)
+            # Cascade mode extracts after screening; a near-duplicate waits for grouping.
+            if not cascade and digest not in feature_futures and not arrived.near_duplicates(signatures[digest]):
+                arrived.add(digest, signatures[digest])
+                feature_futures[digest] = _feature_batcher.submit(text, stored_vectors.get(digest))
+            if digest in feature_futures:
+                provisional_tasks.append(asyncio.create_task(
+                    score_provisionally(upload.filename or "resume.pdf", digest, text)
+                ))
+        resolved += 1
+        await observer.on_extracted(upload.filename, resolved, total)
+
+    async def produce() -> None:
+        async for upload in _iter_source(uploads):
+            arrivals.append((upload.filename or "resume.pdf", upload.sha256))
+            try:
+                await queue.put(upload)
+            except BaseException:
+                upload.discard()
+                raise
+        for _ in range(consumers):
+            await queue.put(None)
+
+    async def consume() -> None:
+        while (upload := await queue.get()) is not None:
+            await process(upload)
+
+    try:
+        await observer.on_stage(STAGE_EXTRACTING, 0, total)
+        # ── Serve repeat PDFs from the text cache (one query for a file list) ──
+        if not streaming:
+            cached_texts.update(await text_cache.lookup_many([upload.sha256 for upload in uploads]))
+            stored_vectors.update(await lookup_vectors([upload.sha256 for upload in uploads]))
+
+        # ── Extract cache misses (process pool, one worker per core) ──
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(produce())
+                for _ in range(consumers):
+                    group.create_task(consume())
+        except BaseExceptionGroup as failures:
+            raise failures.exceptions[0] from None
+        await text_cache.store_many(fresh_texts)
+        await store_signatures(signatures)
+
+        # ── Leave out files without text; the rest of the batch is still scored ──
+        raw_resumes: List[str] = []
+        filenames: List[str] = []
+        digests: List[str] = []
+        skipped: List[SkippedFile] = []
+        for filename, digest in arrivals:
+            text = text_futures[digest].result()
+            if not text.strip():
+                error = extraction_errors.get(digest, "no text found (image-only PDF?)")
+                skipped.append(SkippedFile(filename=filename, error=error))
+                continue
+            raw_resumes.append(text)
+            filenames.append(filename)
+            digests.append(digest)
+        if not raw_resumes:
+            raise HTTPException(
+                status_code=400,
+                detail="; ".join(f"Could not extract text from {s.filename}: {s.error}" for s in skipped),
+            )
+        text_cache_hits = sum(1 for digest in digests if digest in cached_texts)
+
+        # ── Score each resume once: duplicates share their first copy's results ──
+        owners = _duplicate_owners(digests, signatures)
+        originals = sorted(set(owners))
+        original_digests = [digests[idx] for idx in originals]
+        if user_id is not None:
+            earlier_task = asyncio.create_task(get_talent_pool_cache().earlier_duplicates(
+                user_id, {digest: signatures[digest] for digest in digests}, EARLIER_DUPLICATE_LIMIT,
+            ))
+
+        if not cascade:
+            for idx, digest in zip(originals, original_digests):
+                if digest not in feature_futures:   # it arrived after a near-duplicate of itself
+                    feature_futures[digest] = _feature_batcher.submit(raw_resumes[idx], stored_vectors.get(digest))
+            original_features = list(await asyncio.gather(*[feature_futures[d] for d in original_digests]))
+            await store_vectors({
+                digest: features.relevance_vector
+                for digest, features in zip(original_digests, original_features)
+                if digest not in stored_vectors
+            })
+        jd_skill_tiers = await jd_task
+        await asyncio.gather(*provisional_tasks)
+    except BaseException:
+        jd_task.cancel()
+        if earlier_task is not None:
+            earlier_task.cancel()
+        for future in [*text_futures.values(), *feature_futures.values(), *provisional_scores.values()]:
+            future.cancel()
+        for task in provisional_tasks:
+            task.cancel()
+        while not queue.empty():
+            upload = queue.get_nowait()
+            if upload is not None:
+                upload.discard()
+        raise
+
+    # ── ML scoring (thread pool) ──
+    await observer.on_stage(STAGE_SCORING, 0, total)
+    original_texts = [raw_resumes[idx] for idx in originals]
+    if cascade:
+        # Feature extraction (NER) happens here, on the feature thread.
+        (original_scores, original_ats, jd_required, jd_preferred, tiers,
+         original_features) = await loop.run_in_executor(
+            _feature_executor,
+            partial(
+                _run_top_k_sync, params, original_texts, jd_skill_tiers,
+                [stored_vectors.get(d) for d in original_digests],
+            ),
+        )
+        await store_vectors({
+            digest: features.relevance_vector
+            for digest, features in zip(original_digests, original_features)
+            if features is not None and digest not in stored_vectors
+        })
+    else:
+        original_scores, original_ats, jd_required, jd_preferred, tiers = await loop.run_in_executor(
+            None,
+            partial(
+                _run_ml_sync,
+                params.job_description, original_texts, params.weights,
+                params.required_skills, params.preferred_skills,
+                params.experience_cap_years, params.min_years_experience, params.required_degree,
+                jd_skill_tiers, original_features,
+            ),
+        )
+    position = {idx: pos for pos, idx in enumerate(originals)}
+    component_scores = [original_scores[position[owner]] for owner in owners]
+    ats_scores = [original_ats[position[owner]] for owner in owners]
+    # A near-duplicate's scores are not its own text's, so it stores no features.
+    resume_features = [
+        original_features[position[owner]] if digests[owner] == digest else None
+        for owner, digest in zip(owners, digests)
+    ]
+
+    ranked = sorted(
+        range(len(component_scores)),
+        key=lambda idx: component_scores[idx]["final_score"],
+        reverse=True,
+    )
+    if cascade:   # screened-out resumes rank after every fully scored one, by their bound
+        ranked.sort(key=lambda idx: (
+            bool(component_scores[idx].get("screened_out")),
+            -component_scores[idx].get("score_upper_bound", 0.0),
+        ))
+    results = [
+        _candidate_result(filenames[idx], component_scores[idx], ats_scores[idx])
+        for idx in ranked
+    ]
+    earlier = await earlier_task if earlier_task is not None else {}
+    for idx, result in zip(ranked, results):
+        if owners[idx] != idx:
+            result.duplicate_of = filenames[owners[idx]]
+        result.earlier_duplicates = [
+            DuplicateCandidate(candidate_id=row.id, scan_id=row.scan_id, filename=row.filename, similarity=similarity)
+            for row, similarity in earlier.get(digests[idx], [])
+        ]
+    await observer.on_ranked(results)
+
+    await observer.on_stage(STAGE_OVERVIEWS, 0, total)
+    overview_map = await generate_candidate_overviews(
+        params.role_title,
+        sorted(jd_required),
+        sorted(jd_preferred),
+        [r for r in results if r.hiring_recommendation != SCREENED_OUT],
+    )
+    for rank, result in enumerate(results, start=1):
+        result.ai_overview = overview_map.get(rank)
+    await observer.on_overviews(results)
+
+    return ScanOutcome(
+        results=results,
+        jd_required=jd_required,
+        jd_preferred=jd_preferred,
+        text_cache_hits=text_cache_hits,
+        text_cache_misses=len(digests) - text_cache_hits,
+        jd_skill_tiers=tiers,
+        digests=[digests[idx] for idx in ranked],
+        resume_features=[resume_features[idx] for idx in ranked],
+        signals=[component_scores[idx]["signals"] for idx in ranked],
+        skipped_files=skipped,
+    )
+
+
+# ── Persistence ───────────────────────────────────────────────────────────────
+
+def new_scan(user_id: str, params: ScanParams, **fields) -> Scan:
+    """Build the Scan row for ``params``; ``fields`` sets the result/status columns."""
+    return Scan(
+        user_id=user_id,
+        role_title=params.role_title,
+        job_description=params.job_description,
+        required_skills=json.dumps(params.required_skills),
+        preferred_skills=json.dumps(params.preferred_skills),
+        min_years_experience=params.min_years_experience,
+        required_degree=params.required_degree,
+        experience_cap_years=params.experience_cap_years,
+        skills_priority=params.priorities["skills"],
+        experience_priority=params.priorities["experience"],
+        education_priority=params.priorities["education"],
+        relevance_priority=params.priorities["relevance"],
+        **fields,
+    )
+
+
+def scan_params(scan: Scan) -> ScanParams:
+    """The ScanParams a stored scan was run with."""
+    return ScanParams(
+        role_title=scan.role_title,
+        job_description=scan.job_description,
+        required_skills=json.loads(scan.required_skills or "[]"),
+        preferred_skills=json.loads(scan.preferred_skills or "[]"),
+        min_years_experience=scan.min_years_experience,
+        required_degree=scan.required_degree,
+        experience_cap_years=scan.experience_cap_years,
+        priorities={
+            "skills":     scan.skills_priority,
+            "experience": scan.experience_priority,
+            "education":  scan.education_priority,
+            "relevance":  scan.relevance_priority,
+        },
+    )
+
+
+def stored_jd_skill_tiers(scan: Scan) -> dict | None:
+    """JD tiers persisted with the scan (None for scans stored before they were kept)."""
+    if not scan.jd_skill_tiers:
+        return None
+    try:
+        return json.loads(scan.jd_skill_tiers)
+    except json.JSONDecodeError:
+        return None
+
+
+def stored_skipped_files(scan: Scan) -> List[SkippedFile]:
+    """Uploads of ``scan`` that were left out because no text could be extracted."""
+    if not scan.skipped_files:
+        return []
+    try:
+        return [SkippedFile(**entry) for entry in json.loads(scan.skipped_files)]
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
+def _store_skipped_files(scan: Scan, skipped: List[SkippedFile]) -> None:
+    scan.skipped_files = json.dumps([s.model_dump() for s in skipped]) if skipped else None
+
+
+def features_to_json(features: ResumeFeatures) -> str:
+    stored = features.to_dict()
+    return json.dumps({**stored, "resume_skills": sorted(stored["resume_skills"])})
+
+
+def features_from_json(raw: str | None) -> ResumeFeatures | None:
+    if not raw:
+        return None
+    return ResumeFeatures.from_dict(json.loads(raw))
+
+
+def _candidate_row(
+    scan_id: str, rank: int, r: CandidateResult, digest: str, features: ResumeFeatures, signals: dict,
+) -> Candidate:
+    return Candidate(
+        scan_id=scan_id,
+        rank=rank,
+        filename=r.filename,
+        final_score=r.final_score,
+        score_upper_bound=r.score_upper_bound,
+        skills_score=r.skills_score,
+        exp_score=r.exp_score,
+        edu_score=r.edu_score,
+        relevance_score=r.relevance_score,
+        semantic_overlap_score=r.semantic_overlap_score,
+        role_alignment_score=r.role_alignment_score,
+        ats_score=r.ats_score,
+        matched_skills_count=r.matched_skills_count,
+        missing_required_skills=json.dumps(r.missing_required_skills),
+        experience=r.experience,
+        years_experience=r.years_experience,
+        degree=r.degree,
+        primary_backend_language=r.primary_backend_language,
+        jd_primary_backend_language=r.jd_primary_backend_language,
+        resume_role_family=r.resume_role_family,
+        jd_role_family=r.jd_role_family,
+        confidence_level=r.confidence_level,
+        hiring_recommendation=r.hiring_recommendation,
+        ai_overview=r.ai_overview,
+        score_summary=r.score_summary,
+        score_concerns=json.dumps(r.score_concerns),
+        score_improvements=json.dumps(r.score_improvements),
+        content_hash=digest,
+        features=features_to_json(features) if features is not None else None,   # None: screened out or a near-duplicate
+        signals=json.dumps(signals) if signals is not None else None,
+        duplicate_of=r.duplicate_of,
+        earlier_duplicates=json.dumps([d.model_dump() for d in r.earlier_duplicates]) if r.earlier_duplicates else None,
+    )
+
+
+async def _add_candidate(db: AsyncSession, cand: Candidate, matched_skills: List[str]) -> None:
+    db.add(cand)
+    await db.flush()
+    for skill in matched_skills:
+        db.add(CandidateSkill(candidate_id=cand.id, skill=skill))
+
+
+def _screened_out(row) -> bool:
+    """A CandidateResult or Candidate screened out in top-K mode (its final_score was never computed)."""
+    return row.hiring_recommendation == SCREENED_OUT
+
+
+def _set_aggregates(scan: Scan, rows: list) -> None:
+    """Candidate count over ``rows``; top and average score over the fully scored ones."""
+    scan.total_candidates = len(rows)
+    final_scores = [row.final_score for row in rows if not _screened_out(row)]
+    scan.top_score = round(max(final_scores), 1) if final_scores else 0.0
+    scan.avg_score = round(sum(final_scores) / len(final_scores), 1) if final_scores else 0.0
+
+
+async def persist_scan(db: AsyncSession, scan: Scan, outcome: ScanOutcome, elapsed_ms: float) -> None:
+    """Write ranked candidates and aggregates for ``scan``; the caller commits."""
+    _set_aggregates(scan, outcome.results)
+    scan.jd_skills_count = len(outcome.jd_required)
+    scan.jd_skill_tiers = json.dumps(outcome.jd_skill_tiers)
+    scan.processing_time_ms = elapsed_ms
+    _store_skipped_files(scan, outcome.skipped_files)
+    db.add(scan)
+    await db.flush()
+
+    rows = zip(outcome.results, outcome.digests, outcome.resume_features, outcome.signals)
+    for rank, (r, digest, features, signals) in enumerate(rows, start=1):
+        await _add_candidate(db, _candidate_row(scan.id, rank, r, digest, features, signals), r.matched_skills)
+
+
+async def append_to_scan(db: AsyncSession, scan: Scan, outcome: ScanOutcome, elapsed_ms: float) -> None:
+    """
+    Merge newly scored resumes into ``scan`` and re-rank the union; the caller commits.
+
+    Existing candidates keep their stored scores (nothing JD- or weight-related
+    changed), so only their rank moves. Ties keep existing candidates first;
+    screened-out candidates stay below every scored one.
+    """
+    existing = (await db.execute(
+        select(Candidate).where(Candidate.scan_id == scan.id).order_by(Candidate.rank)
+    )).scalars().all()
+    new_rows = [
+        (_candidate_row(scan.id, 0, r, digest, features, signals), r.matched_skills)
+        for r, digest, features, signals in zip(
+            outcome.results, outcome.digests, outcome.resume_features, outcome.signals,
+        )
+    ]
+    union = [(cand, None) for cand in existing] + new_rows
+    union.sort(key=lambda entry: (_screened_out(entry[0]), -entry[0].final_score))
+    for rank, (cand, _) in enumerate(union, start=1):
+        cand.rank = rank
+
+    _set_aggregates(scan, [cand for cand, _ in union])
+    if scan.jd_skill_tiers is None:
+        scan.jd_skill_tiers = json.dumps(outcome.jd_skill_tiers)
+    scan.processing_time_ms = (scan.processing_time_ms or 0.0) + elapsed_ms
+    _store_skipped_files(scan, stored_skipped_files(scan) + outcome.skipped_files)
+    await db.flush()
+    for cand, matched_skills in new_rows:
+        await _add_candidate(db, cand, matched_skills)
+
+
+async def purge_orphaned_resumes(db: AsyncSession, digests) -> set[str]:
+    """
+    Delete the stored text, vectors and signatures of ``digests`` that no
+    candidate references any more (call once a scan's candidates are gone);
+    the caller commits, then drops the returned digests from the text cache.
+    A running scan that uploaded one of these PDFs only loses its cache hit.
+    """
+    digests = {digest for digest in digests if digest}
+    if not digests:
+        return set()
+    referenced = set((await db.execute(
+        select(Candidate.content_hash).where(Candidate.content_hash.in_(digests)).distinct()
+    )).scalars().all())
+    orphaned = digests - referenced
+    if orphaned:
+        for model in (ResumeText, ResumeVector, ResumeSignature):
+            await db.execute(delete(model).where(model.content_hash.in_(orphaned)))
+    return orphaned
+
+
+async def rescore_scan(db: AsyncSession, scan: Scan, priorities: dict[str, str]) -> None:
+    """
+    Re-weight ``scan`` with new priorities and re-rank it; the caller commits.
+
+    Only the weighted sum changes, so final scores come straight from each
+    candidate's stored signals: no extraction, NLP, TF-IDF or Groq.
+    Candidates screened out in top-K mode were never fully scored; they stay
+    below every scored one in their current order, and their upper bound
+    (which held only for the old weights) is dropped. Raises
+    HTTPException(409) for scans stored before signals were persisted.
+    """
+    candidates = (await db.execute(
+        select(Candidate).where(Candidate.scan_id == scan.id).order_by(Candidate.rank)
+    )).scalars().all()
+    scored = [cand for cand in candidates if not _screened_out(cand)]
+    screened = [cand for cand in candidates if _screened_out(cand)]
+    if any(cand.signals is None for cand in scored):
+        raise HTTPException(
+            status_code=409,
+            detail=(
+                "Some candidates have no stored scoring signals (scanned before they were kept); "
+                "run the scan again to re-weight it."
+            ),
+        )
+
+    weights = {dim: PRIORITY_MAP[priority] for dim, priority in priorities.items()}
+    for cand in scored:
+        cand.final_score = final_score_from_signals(json.loads(cand.signals), weights)
+        cand.hiring_recommendation = hiring_recommendation(cand.final_score)
+    for cand in screened:
+        if cand.score_upper_bound is not None:
+            cand.score_upper_bound = None
+            cand.score_summary = f"{SCREENED_OUT}: not re-weighted; run the scan again to score it in full."
+    candidates = sorted(scored, key=lambda cand: cand.final_score, reverse=True) + screened
+    for rank, cand in enumerate(candidates, start=1):
+        cand.rank = rank
+
+    scan.skills_priority = priorities["skills"]
+    scan.experience_priority = priorities["experience"]
+    scan.education_priority = priorities["education"]
+    scan.relevance_priority = priorities["relevance"]
+    _set_aggregates(scan, candidates)
+    await db.flush()
+
+
+# ── Talent pool matching ──────────────────────────────────────────────────────
+
+class PoolMatch:
+    """Top results of a JD matched against a user's talent pool, plus how many resumes each stage saw."""
+
+    def __init__(
+        self,
+        results: List[CandidateResult],
+        jd_required: set[str],
+        pool_size: int,
+        shortlisted: int,
+        scored: int,
+    ):
+        self.results = results
+        self.jd_required = jd_required
+        self.pool_size = pool_size
+        self.shortlisted = shortlisted
+        self.scored = scored
+
+
+async def match_pool(
+    db: AsyncSession, user_id: str, params: ScanParams, shortlist_size: int, top_k: int,
+) -> PoolMatch:
+    """
+    Rank the user's stored resumes against ``params`` and return the best ``top_k``.
+
+    The talent pool index shortlists the ``shortlist_size`` resumes with the
+    best tier-weighted coverage of the JD's skills; only those are rebuilt
+    from their stored features and cached text and run through the structured
+    scorer (relevance is relative to the shortlist, as it is to a scan's
+    batch). Each resume is listed once, under its most recent candidate row.
+    Resumes whose text is no longer cached are skipped. No AI overviews are
+    generated. Raises HTTPException(400) when the JD yields no skills.
+    """
+    loop = asyncio.get_running_loop()
+    groq_tiers = await parse_jd_skill_tiers_with_groq(
+        params.job_description, params.required_skills, params.preferred_skills,
+    )
+    tiers, jd_required, jd_preferred = await loop.run_in_executor(None, partial(
+        _tiered_jd_skills, params.job_description, params.required_skills, params.preferred_skills, groq_tiers,
+    ))
+    if not jd_required and not jd_preferred:
+        raise HTTPException(status_code=400, detail="No skills found in the job description to match the pool on.")
+
+    cache = get_talent_pool_cache()
+    async with cache.lock(user_id):
+        pool = await cache.pool(db, user_id)
+        pool_size = len(pool.skills)
+        shortlist = pool.skills.shortlist(jd_required, jd_preferred, shortlist_size)
+    if not shortlist:
+        return PoolMatch([], jd_required, pool_size, 0, 0)
+
+    rows = (await db.execute(
+        select(Candidate.id, Candidate.content_hash, Candidate.filename, Candidate.features)
+        .join(Scan, Candidate.scan_id == Scan.id)
+        .where(
+            Scan.user_id == user_id,
+            Candidate.content_hash.in_(shortlist),
+            Candidate.features.is_not(None),   # near-duplicate rows carry another resume's scores
+        )
+        .order_by(Scan.created_at.desc())
+    )).all()
+    latest = {}
+    for row in rows:
+        latest.setdefault(row.content_hash, row)
+    texts = await get_resume_text_cache().lookup_many(shortlist)
+    vectors = await lookup_vectors(shortlist) if get_relevance_backend() == "hashing" else {}
+
+    candidates, raw_resumes, resume_features = [], [], []
+    for digest in shortlist:
+        row, cached = latest.get(digest), texts.get(digest)
+        if row is None or row.features is None or cached is None or not cached[0].strip():
+            continue
+        features = ResumeFeatures.from_dict(json.loads(row.features), raw=cached[0])
+        if digest in vectors:
+            features.relevance_vector = vectors[digest]
+        candidates.append(row)
+        raw_resumes.append(cached[0])
+        resume_features.append(features)
+    if not candidates:
+        return PoolMatch([], jd_required, pool_size, len(shortlist), 0)
+
+    component_scores, ats_scores, _, _, _ = await loop.run_in_executor(
+        None,
+        partial(
+            _run_ml_sync,
+            params.job_description, raw_resumes, params.weights,
+            params.required_skills, params.preferred_skills,
+            params.experience_cap_years, params.min_years_experience, params.required_degree,
+            tiers, resume_features,
+        ),
+    )
+    ranked = sorted(
+        range(len(component_scores)),
+        key=lambda idx: component_scores[idx]["final_score"],
+        reverse=True,
+    )
+    results = []
+    for idx in ranked[:top_k]:
+        result = _candidate_result(candidates[idx].filename, component_scores[idx], ats_scores[idx])
+        result.candidate_id = candidates[idx].id
+        results.append(result)
+    return PoolMatch(results, jd_required, pool_size, len(shortlist), len(candidates))
@@ -62,9 +62,17 @@ class RankingWeights(BaseModel):
     relevance:  float = Field(..., ge=0.0, le=1.0)
 
 
+class DuplicateCandidate(BaseModel):
+    candidate_id: str
+    scan_id:      str
+    filename:     str
+    similarity:   float   # estimated Jaccard of the two resumes' word shingles
+
+
 class CandidateResult(BaseModel):
     filename:                str
     final_score:             float
+    score_upper_bound:       Optional[float] = None   # screened out in top-K mode: final_score is 0, at most this
     skills_score:            float
     exp_score:               float
     edu_score:               float
@@ -90,6 +98,14 @@ class CandidateResult(BaseModel):
     score_summary:           Optional[str]   = None
     score_concerns:          List[str]       = Field(default_factory=list)
     score_improvements:      List[str]       = Field(default_factory=list)
+    candidate_id:            Optional[str]   = None   # set once stored (GET /scans/{id})
+    duplicate_of:            Optional[str]   = None   # filename in this scan whose scores it shares
+    earlier_duplicates:      List[DuplicateCandidate] = Field(default_factory=list)
+
+
+class SkippedFile(BaseModel):
+    filename: str
+    error:    str   # why no text could be extracted; the file was left out of the ranking
 
 
 class ScanResponse(BaseModel):
@@ -99,6 +115,12 @@ class ScanResponse(BaseModel):
     jd_skills_count:      int
     processing_time_ms:   float
     experience_cap_years: float
+    skipped_files:        List[SkippedFile] = Field(default_factory=list)
+
+
+class ScanJobAccepted(BaseModel):
+    scan_id: str
+    status:  str
 
 
 class ScanHistoryItem(BaseModel):
@@ -109,6 +131,7 @@ class ScanHistoryItem(BaseModel):
     top_score:        float
     avg_score:        float
     jd_snippet:       str
+    status:           str = "completed"
 
 
 class ScanDetail(BaseModel):
@@ -129,6 +152,29 @@ class ScanDetail(BaseModel):
     jd_skills_count:      int
     processing_time_ms:   float
     results:              List[CandidateResult]
+    status:               str           = "completed"
+    stage:                Optional[str] = None
+    progress_done:        Optional[int] = None
+    progress_total:       Optional[int] = None
+    error:                Optional[str] = None
+    skipped_files:        List[SkippedFile] = Field(default_factory=list)
+
+
+class SimilarCandidate(BaseModel):
+    candidate_id: str
+    scan_id:      str
+    role_title:   str
+    filename:     str
+    similarity:   float
+
+
+class PoolMatchResponse(BaseModel):
+    results:            List[CandidateResult]
+    pool_size:          int     # distinct stored resumes in the user's pool
+    shortlisted:        int     # resumes the skill index passed on to scoring
+    scored:             int     # shortlisted resumes whose text was still available
+    jd_skills_count:    int
+    processing_time_ms: float
 
 
 class UsageResponse(BaseModel):
@@ -0,0 +1,186 @@
+"""
+Per-user talent pools: every resume a user has scanned, indexed by skill
+and by MinHash signature.
+
+POST /pool/match ranks a user's stored resumes against a new JD without
+re-scoring all of them. Each user's pool holds an ml.talent_pool.TalentPool
+keyed by resume content hash and built from the ``features`` JSON persisted
+with each candidate, so no PDF is re-read and no NLP runs to index it. The
+pool's ml.dedupe.LshIndex, built from the persisted signatures, lets a scan
+flag resumes that near-duplicate ones from the user's earlier scans. The
+persisted relevance vectors (ml.relevance.VectorIndex) back GET
+/candidates/{id}/similar; they are loaded only once a user asks for them.
+
+Pools live in an in-process LRU of users. A request first compares a cheap
+signature of the user's stored candidates (row count, scan count, newest
+scan) with the one the pool was built at; only when it moved are the
+content hashes diffed, and only new resumes have their features loaded.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from functools import partial
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import TALENT_POOL_CACHE_USERS
+from api.resume_signatures import lookup_signatures
+from api.resume_vectors import lookup_vectors
+from db.models import Candidate, Scan
+from db.session import AsyncSessionLocal
+from ml.dedupe import LshIndex
+from ml.relevance import VectorIndex
+from ml.talent_pool import TalentPool
+
+log = structlog.get_logger()
+
+# Features JSON rows loaded per query while (re)building a pool.
+_LOAD_CHUNK = 500
+
+
+def _index_rows(pool: TalentPool, rows) -> None:
+    for digest, features in rows:
+        if digest not in pool:
+            pool.add(digest, json.loads(features)["resume_skills"])
+
+
+class UserPool:
+    """One user's indexes; each covers only the content hashes it actually indexed."""
+
+    def __init__(self):
+        self.skills = TalentPool()                   # resumes with stored features
+        self.signatures = LshIndex()                 # resumes with a stored MinHash signature
+        self.signature_hashes: set[str] = set()      # signatures found (empty ones are not indexed)
+        self.vectors: VectorIndex | None = None      # relevance vectors, once requested
+
+
+class TalentPoolCache:
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._pools: OrderedDict[str, tuple[tuple, UserPool]] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def lock(self, user_id: str) -> asyncio.Lock:
+        """Held while a user's pool is synced or queried."""
+        return self._locks.setdefault(user_id, asyncio.Lock())
+
+    def clear(self) -> None:
+        self._pools.clear()
+        self._locks.clear()
+
+    async def pool(self, db: AsyncSession, user_id: str, vectors: bool = False) -> UserPool:
+        """
+        The user's pool, brought up to date with their stored candidates (hold
+        ``lock``). ``vectors`` also loads the relevance vector index, which is
+        kept in sync from then on.
+        """
+        user_candidates = (
+            select(Candidate.content_hash)
+            .join(Scan, Candidate.scan_id == Scan.id)
+            .where(Scan.user_id == user_id, Candidate.content_hash.is_not(None))
+        )
+        # Screened-out and near-duplicate rows have no features of their own.
+        featured = user_candidates.where(Candidate.features.is_not(None))
+        signature = tuple((await db.execute(
+            select(func.count(Candidate.id), func.count(func.distinct(Scan.id)), func.max(Scan.created_at))
+            .join(Scan, Candidate.scan_id == Scan.id)
+            .where(Scan.user_id == user_id)
+        )).one())
+
+        cached = self._pools.get(user_id)
+        if cached is not None:
+            self._pools.move_to_end(user_id)
+            if cached[0] == signature and (cached[1].vectors is not None or not vectors):
+                return cached[1]
+        pool = cached[1] if cached is not None else UserPool()
+        if vectors and pool.vectors is None:
+            pool.vectors = VectorIndex()
+
+        current = set((await db.execute(featured.distinct())).scalars().all())
+        for digest in [digest for digest in pool.skills if digest not in current]:
+            pool.skills.remove(digest)
+        new = sorted(current.difference(pool.skills))
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(new), _LOAD_CHUNK):
+            rows = (await db.execute(
+                featured.add_columns(Candidate.features)
+                .where(Candidate.content_hash.in_(new[start:start + _LOAD_CHUNK]))
+            )).all()
+            await loop.run_in_executor(None, partial(_index_rows, pool.skills, rows))
+
+        # Signatures cover every stored resume; one not found yet is looked up again next sync.
+        current = set((await db.execute(user_candidates.distinct())).scalars().all())
+        for digest in pool.signature_hashes - current:
+            pool.signatures.remove(digest)
+            pool.signature_hashes.discard(digest)
+        missing = sorted(current - pool.signature_hashes)
+        for start in range(0, len(missing), _LOAD_CHUNK):
+            for digest, minhash in (await lookup_signatures(missing[start:start + _LOAD_CHUNK])).items():
+                pool.signatures.add(digest, minhash)
+                pool.signature_hashes.add(digest)
+        if pool.vectors is not None:
+            for digest in [digest for digest in pool.vectors if digest not in current]:
+                pool.vectors.remove(digest)
+            missing = sorted(current.difference(pool.vectors))
+            for start in range(0, len(missing), _LOAD_CHUNK):
+                for digest, row in (await lookup_vectors(missing[start:start + _LOAD_CHUNK])).items():
+                    pool.vectors.add(digest, row)
+
+        self._pools[user_id] = (signature, pool)
+        self._pools.move_to_end(user_id)
+        while len(self._pools) > self.max_users:
+            self._pools.popitem(last=False)
+        log.info("talent_pool_synced", user_id=user_id, size=len(pool.skills), added=len(new))
+        return pool
+
+    async def earlier_duplicates(self, user_id: str, signatures: dict, limit: int) -> dict:
+        """
+        digest -> [(candidate row, similarity)] for each signature that near-duplicates
+        resumes the user stored before, most similar first and at most ``limit`` each.
+
+        Each matched resume is reported under its most recent candidate row
+        (id, scan_id, filename, content_hash). Best-effort: a database error
+        means nothing is flagged.
+        """
+        try:
+            async with AsyncSessionLocal() as db:
+                async with self.lock(user_id):
+                    pool = await self.pool(db, user_id)
+                    found = {
+                        digest: pool.signatures.near_duplicates(signature)[:limit]
+                        for digest, signature in signatures.items()
+                    }
+                matched = {key for pairs in found.values() for key, _ in pairs}
+                if not matched:
+                    return {}
+                rows = (await db.execute(
+                    select(Candidate.id, Candidate.scan_id, Candidate.filename, Candidate.content_hash)
+                    .join(Scan, Candidate.scan_id == Scan.id)
+                    .where(Scan.user_id == user_id, Candidate.content_hash.in_(matched))
+                    .order_by(Scan.created_at.desc(), Candidate.rank)
+                )).all()
+        except SQLAlchemyError as exc:
+            log.warning("earlier_duplicates_lookup_failed", user_id=user_id, error=str(exc)[:200])
+            return {}
+        latest = {}
+        for row in rows:
+            latest.setdefault(row.content_hash, row)
+        return {
+            digest: [(latest[key], similarity) for key, similarity in pairs if key in latest]
+            for digest, pairs in found.items()
+            if pairs
+        }
+
+
+_talent_pool_cache: TalentPoolCache | None = None
+
+
+def get_talent_pool_cache() -> TalentPoolCache:
+    global _talent_pool_cache
+    if _talent_pool_cache is None:
+        _talent_pool_cache = TalentPoolCache(TALENT_POOL_CACHE_USERS)
+    return _talent_pool_cache
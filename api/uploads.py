@@ -0,0 +1,190 @@
+"""
+Disk-spooled resume uploads.
+
+Each upload is streamed in fixed-size chunks into its own temporary file,
+hashed and size-checked on the way, so a scan never holds a whole PDF in
+memory. The extractors then memory-map the spooled file (see
+``api.resume_parser.extract_text_from_path``), which keeps peak RSS roughly
+flat regardless of file size or count.
+
+A ZIP archive of resumes is spooled the same way and then unpacked one entry
+at a time (ResumeArchive), so a bulk scan's footprint does not grow with the
+number of PDFs in it.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+import zipfile
+import zlib
+from pathlib import PurePosixPath
+from typing import AsyncIterator, List, Union
+
+from fastapi import HTTPException, UploadFile
+
+from api import config
+from api.resume_parser import is_valid_pdf
+
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+class SpooledUpload:
+    """A validated upload copied to a private temp file. Call discard() when done."""
+
+    def __init__(self, filename: str | None, path: str, size: int, sha256: str):
+        self.filename = filename
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def discard(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+async def spool_upload(upload: UploadFile, max_bytes: int, suffix: str = ".pdf") -> SpooledUpload:
+    """Stream ``upload`` to disk, raising 413 as soon as it passes ``max_bytes``."""
+    fd, path = tempfile.mkstemp(prefix="talentmatch-", suffix=suffix, dir=config.UPLOAD_SPOOL_DIR)
+    digest = hashlib.sha256()
+    total = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await upload.read(SPOOL_CHUNK_SIZE)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if total > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"{upload.filename} exceeds {max_bytes // (1024*1024)} MB limit",
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return SpooledUpload(upload.filename, path, total, digest.hexdigest())
+
+
+# ── ZIP archives ──────────────────────────────────────────────────────────────
+
+def _is_resume_entry(info: zipfile.ZipInfo) -> bool:
+    name = PurePosixPath(info.filename)
+    if info.is_dir() or name.parts[:1] == ("__MACOSX",) or name.name.startswith("."):
+        return False
+    return name.suffix.lower() == ".pdf"
+
+
+class ResumeArchive:
+    """
+    A spooled ZIP of resume PDFs, unpacked lazily.
+
+    Only the central directory is read up front (entry count, declared sizes,
+    encryption). iter_uploads() then spools one entry at a time to its own
+    temp file, so how many entries are on disk at once is up to the consumer,
+    not the archive size. Call discard() when done.
+    """
+
+    def __init__(self, spooled: SpooledUpload):
+        self.filename = spooled.filename
+        self._spooled = spooled
+        try:
+            self._zip = zipfile.ZipFile(spooled.path)
+        except (zipfile.BadZipFile, OSError):
+            raise HTTPException(status_code=400, detail=f"{spooled.filename}: not a valid ZIP archive.")
+        self.entries = [info for info in self._zip.infolist() if _is_resume_entry(info)]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def validate(self, max_files: int, max_entry_bytes: int) -> None:
+        """Reject the archive on its central directory alone, before anything is unpacked."""
+        if not self.entries:
+            raise HTTPException(status_code=400, detail=f"{self.filename}: no PDF files found in archive.")
+        if len(self.entries) > max_files:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{self.filename}: too many PDFs. Maximum {max_files} per archive.",
+            )
+        for info in self.entries:
+            if info.flag_bits & 0x1:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"{info.filename}: encrypted archive entries are not supported.",
+                )
+            if info.file_size > max_entry_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"{info.filename} exceeds {max_entry_bytes // (1024*1024)} MB limit",
+                )
+
+    async def iter_uploads(self, max_entry_bytes: int) -> AsyncIterator[SpooledUpload]:
+        """Yield each PDF entry spooled to disk, in archive order."""
+        for info in self.entries:
+            yield await asyncio.to_thread(self._spool_entry, info, max_entry_bytes)
+
+    def _spool_entry(self, info: zipfile.ZipInfo, max_bytes: int) -> SpooledUpload:
+        filename = PurePosixPath(info.filename).name
+        fd, path = tempfile.mkstemp(prefix="talentmatch-", suffix=".pdf", dir=config.UPLOAD_SPOOL_DIR)
+        digest = hashlib.sha256()
+        total = 0
+        try:
+            with os.fdopen(fd, "wb") as out, self._zip.open(info) as entry:
+                while True:
+                    chunk = entry.read(SPOOL_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    if total == 0 and not is_valid_pdf(chunk):
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"{info.filename}: not a valid PDF (bad magic bytes).",
+                        )
+                    # The declared size was checked in validate(); this guards
+                    # against entries whose header understates what inflates.
+                    total += len(chunk)
+                    if total > max_bytes:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"{info.filename} exceeds {max_bytes // (1024*1024)} MB limit",
+                        )
+                    digest.update(chunk)
+                    out.write(chunk)
+            if total == 0:
+                raise HTTPException(status_code=400, detail=f"{info.filename}: empty file.")
+        except (zipfile.BadZipFile, zlib.error, EOFError, NotImplementedError) as exc:
+            os.unlink(path)
+            raise HTTPException(status_code=400, detail=f"{info.filename}: could not unpack ({exc}).")
+        except BaseException:
+            os.unlink(path)
+            raise
+        return SpooledUpload(filename, path, total, digest.hexdigest())
+
+    def discard(self) -> None:
+        self._zip.close()
+        self._spooled.discard()
+
+
+async def open_resume_archive(upload: UploadFile, max_bytes: int) -> ResumeArchive:
+    """Spool a ZIP upload and read its central directory (400 if it is not a ZIP)."""
+    spooled = await spool_upload(upload, max_bytes, suffix=".zip")
+    try:
+        return await asyncio.to_thread(ResumeArchive, spooled)
+    except BaseException:
+        spooled.discard()
+        raise
+
+
+ResumeSource = Union[List[SpooledUpload], ResumeArchive]
+
+
+def discard_uploads(source: ResumeSource) -> None:
+    """Remove every temp file behind ``source``; safe to call more than once."""
+    if isinstance(source, ResumeArchive):
+        source.discard()
+    else:
+        for upload in source:
+            upload.discard()
@@ -8,6 +8,11 @@ Tables
   scans         — one row per /scan/pdf call
   candidates    — one row per resume within a scan
   candidate_skills — many-to-many: skills matched for a candidate
+  resume_texts  — extracted PDF text keyed by SHA-256 of the PDF bytes
+  resume_vectors, resume_signatures — relevance vectors / MinHash signatures, same key
+
+The resume_* rows are kept while any candidate (of any user) still has that
+content_hash; deleting the last such scan purges them (DELETE /scans/{id}).
 """
 
 import uuid
@@ -15,7 +20,7 @@ from datetime import datetime, timezone
 
 from sqlalchemy import (
     Column, String, Float, Integer, Boolean,
-    DateTime, ForeignKey, Text, UniqueConstraint, Index,
+    DateTime, ForeignKey, Text, UniqueConstraint, Index, LargeBinary,
 )
 from sqlalchemy.orm import DeclarativeBase, relationship
 
@@ -107,6 +112,19 @@ class Scan(Base):
     avg_score            = Column(Float, default=0.0, nullable=False)
     jd_skills_count      = Column(Integer, nullable=False)
     processing_time_ms   = Column(Float, nullable=False)
+    # JD skill tiers the candidates were scored against (JSON), reused when
+    # resumes are appended later so the scan keeps one consistent profile
+    jd_skill_tiers       = Column(Text, nullable=True)
+    # Uploads left out because no text could be extracted (JSON list of
+    # {filename, error}); the rest of the batch was still scored
+    skipped_files        = Column(Text, nullable=True)
+
+    # Job state (mode=async scans move queued → running → completed/failed)
+    status               = Column(String(20), default="completed", nullable=False)
+    stage                = Column(String(20), nullable=True)   # extracting/scoring/overviews/saving
+    progress_done        = Column(Integer, nullable=True)
+    progress_total       = Column(Integer, nullable=True)
+    error                = Column(Text, nullable=True)
 
     candidates = relationship("Candidate", back_populates="scan", cascade="all, delete-orphan",
                               order_by="Candidate.rank")
@@ -134,6 +152,7 @@ class Candidate(Base):
 
     filename         = Column(String(255), nullable=False)
     final_score      = Column(Float, nullable=False)
+    score_upper_bound = Column(Float, nullable=True)   # set (with final_score 0) when screened out in top-K mode
     skills_score     = Column(Float, nullable=False)
     exp_score        = Column(Float, nullable=False)
     edu_score        = Column(Float, nullable=False)
@@ -157,6 +176,11 @@ class Candidate(Base):
     score_summary         = Column(Text, nullable=True)
     score_concerns        = Column(Text, nullable=True)  # JSON list
     score_improvements    = Column(Text, nullable=True)  # JSON list
+    content_hash          = Column(String(64), nullable=True, index=True)   # SHA-256 of the resume PDF
+    features              = Column(Text, nullable=True)  # JSON, JD-independent resume features
+    signals               = Column(Text, nullable=True)  # JSON, normalized sub-scores + penalty inputs
+    duplicate_of          = Column(String(255), nullable=True)  # filename in the scan it shares scores with
+    earlier_duplicates    = Column(Text, nullable=True)  # JSON list of near-duplicates from earlier scans
 
     scan = relationship("Scan", back_populates="candidates")
     skills = relationship("CandidateSkill", back_populates="candidate",
@@ -166,6 +190,56 @@ class Candidate(Base):
         return f"<Candidate {self.filename} score={self.final_score}>"
 
 
+# ---------------------------------------------------------------------------
+# Resume texts (content-addressed cache of extracted PDF text)
+# ---------------------------------------------------------------------------
+
+class ResumeText(Base):
+    __tablename__ = "resume_texts"
+
+    content_hash = Column(String(64), primary_key=True)       # SHA-256 hex of the PDF bytes
+    extractor    = Column(String(20), nullable=False)         # pypdf / pdfplumber
+    text_zlib    = Column(LargeBinary, nullable=False)        # zlib-compressed UTF-8 text
+    text_chars   = Column(Integer, nullable=False)
+    created_at   = Column(DateTime(timezone=True), default=_utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ResumeText {self.content_hash[:12]} via {self.extractor}>"
+
+
+# ---------------------------------------------------------------------------
+# Resume vectors (sparse relevance vectors keyed by resume content hash)
+# ---------------------------------------------------------------------------
+
+class ResumeVector(Base):
+    __tablename__ = "resume_vectors"
+
+    content_hash = Column(String(64), primary_key=True)       # SHA-256 hex of the PDF bytes
+    vectorizer   = Column(String(40), primary_key=True)       # ml.relevance.HASHING_VECTOR_VERSION
+    vector       = Column(LargeBinary, nullable=False)        # int32 indices + float32 values
+    nnz          = Column(Integer, nullable=False)
+    created_at   = Column(DateTime(timezone=True), default=_utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ResumeVector {self.content_hash[:12]} {self.vectorizer} nnz={self.nnz}>"
+
+
+# ---------------------------------------------------------------------------
+# Resume signatures (MinHash signatures for near-duplicate detection)
+# ---------------------------------------------------------------------------
+
+class ResumeSignature(Base):
+    __tablename__ = "resume_signatures"
+
+    content_hash = Column(String(64), primary_key=True)       # SHA-256 hex of the PDF bytes
+    scheme       = Column(String(40), primary_key=True)       # ml.dedupe.MINHASH_VERSION
+    signature    = Column(LargeBinary, nullable=False)        # uint32 MinHash values
+    created_at   = Column(DateTime(timezone=True), default=_utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ResumeSignature {self.content_hash[:12]} {self.scheme}>"
+
+
 # ---------------------------------------------------------------------------
 # Candidate Skills (matched skills list stored normalised)
 # ---------------------------------------------------------------------------
@@ -109,6 +109,20 @@ async def init_db():
                 await conn.execute(text("ALTER TABLE scans ADD COLUMN top_score FLOAT DEFAULT 0"))
             if "avg_score" not in existing_columns:
                 await conn.execute(text("ALTER TABLE scans ADD COLUMN avg_score FLOAT DEFAULT 0"))
+            if "status" not in existing_columns:
+                await conn.execute(text("ALTER TABLE scans ADD COLUMN status VARCHAR(20) DEFAULT 'completed' NOT NULL"))
+            if "stage" not in existing_columns:
+                await conn.execute(text("ALTER TABLE scans ADD COLUMN stage VARCHAR(20)"))
+            if "progress_done" not in existing_columns:
+                await conn.execute(text("ALTER TABLE scans ADD COLUMN progress_done INTEGER"))
+            if "progress_total" not in existing_columns:
+                await conn.execute(text("ALTER TABLE scans ADD COLUMN progress_total INTEGER"))
+            if "error" not in existing_columns:
+                await conn.execute(text("ALTER TABLE scans ADD COLUMN error TEXT"))
+            if "jd_skill_tiers" not in existing_columns:
+                await conn.execute(text("ALTER TABLE scans ADD COLUMN jd_skill_tiers TEXT"))
+            if "skipped_files" not in existing_columns:
+                await conn.execute(text("ALTER TABLE scans ADD COLUMN skipped_files TEXT"))
             if "primary_backend_language" not in existing_candidate_columns:
                 await conn.execute(text("ALTER TABLE candidates ADD COLUMN primary_backend_language VARCHAR(50)"))
             if "jd_primary_backend_language" not in existing_candidate_columns:
@@ -133,6 +147,22 @@ async def init_db():
                 await conn.execute(text("ALTER TABLE candidates ADD COLUMN score_concerns TEXT"))
             if "score_improvements" not in existing_candidate_columns:
                 await conn.execute(text("ALTER TABLE candidates ADD COLUMN score_improvements TEXT"))
+            if "content_hash" not in existing_candidate_columns:
+                await conn.execute(text("ALTER TABLE candidates ADD COLUMN content_hash VARCHAR(64)"))
+            # create_all only indexes new tables; talent pools, similar candidates and appends filter on it.
+            await conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_candidates_content_hash ON candidates (content_hash)"
+            ))
+            if "features" not in existing_candidate_columns:
+                await conn.execute(text("ALTER TABLE candidates ADD COLUMN features TEXT"))
+            if "signals" not in existing_candidate_columns:
+                await conn.execute(text("ALTER TABLE candidates ADD COLUMN signals TEXT"))
+            if "score_upper_bound" not in existing_candidate_columns:
+                await conn.execute(text("ALTER TABLE candidates ADD COLUMN score_upper_bound FLOAT"))
+            if "duplicate_of" not in existing_candidate_columns:
+                await conn.execute(text("ALTER TABLE candidates ADD COLUMN duplicate_of VARCHAR(255)"))
+            if "earlier_duplicates" not in existing_candidate_columns:
+                await conn.execute(text("ALTER TABLE candidates ADD COLUMN earlier_duplicates TEXT"))
 
             await conn.execute(text("""
                 UPDATE users
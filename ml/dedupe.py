@@ -0,0 +1,132 @@
+"""
+Near-duplicate resumes: MinHash signatures over word shingles plus an LSH index.
+
+A resume's text is lowercased and split into word tokens; every run of
+SHINGLE_WORDS tokens is a shingle, hashed with CRC-32. The signature keeps,
+for each of MINHASH_PERMUTATIONS fixed hash functions, the smallest hash of
+any shingle, so the share of equal positions in two signatures estimates
+the Jaccard similarity of their shingle sets.
+
+LshIndex cuts signatures into LSH_BANDS bands; resumes sharing any band
+become candidates, and only candidates have their signatures compared. With
+8-row bands, pairs at Jaccard 0.8 collide with ~95% probability and pairs
+below 0.5 rarely do, so a lookup touches a handful of resumes however many
+are indexed.
+
+Everything is deterministic (CRC-32 and seeded coefficients), so signatures
+can be persisted and compared across processes.
+"""
+
+import re
+import zlib
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+SHINGLE_WORDS = 3
+MINHASH_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+# Estimated Jaccard at or above which two resumes count as the same resume.
+NEAR_DUPLICATE_THRESHOLD = 0.8
+# Stored with persisted signatures; change it with any of the settings above.
+MINHASH_VERSION = f"minhash-v1-{SHINGLE_WORDS}w-{MINHASH_PERMUTATIONS}x{LSH_BANDS}"
+
+_MERSENNE_61 = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(20240611)
+# h_i(x) = (a_i * x + b_i) mod p; uint64 products wrap, which is deterministic.
+_A = _rng.integers(1, 1 << 61, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 61, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_EMPTY = np.full(MINHASH_PERMUTATIONS, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    tokens = _TOKEN.findall(text.lower())
+    if not tokens:
+        return np.zeros(0, dtype=np.uint64)
+    width = min(SHINGLE_WORDS, len(tokens))
+    hashes = {
+        zlib.crc32(" ".join(tokens[i:i + width]).encode("utf-8"))
+        for i in range(len(tokens) - width + 1)
+    }
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """MINHASH_PERMUTATIONS uint32 values; a text without words gets the empty signature."""
+    shingles = _shingle_hashes(text)
+    if not len(shingles):
+        return _EMPTY.copy()
+    hashed = (np.outer(_A, shingles) + _B[:, None]) % _MERSENNE_61
+    return (hashed.min(axis=1) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+
+def is_empty(signature: np.ndarray) -> bool:
+    return bool(np.array_equal(signature, _EMPTY))
+
+
+def estimated_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / MINHASH_PERMUTATIONS
+
+
+def encode_signature(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def decode_signature(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype="<u4").astype(np.uint32)
+
+
+class LshIndex:
+    """Keys (content hashes) by signature band, for near-duplicate lookups."""
+
+    def __init__(self):
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(LSH_BANDS)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    @staticmethod
+    def _bands(signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        for band in range(LSH_BANDS):
+            yield band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+
+    def add(self, key: str, signature: np.ndarray) -> None:
+        """Index ``signature`` under ``key``; empty signatures are not indexed."""
+        self.remove(key)
+        if is_empty(signature):
+            return
+        self._signatures[key] = signature
+        for band, value in self._bands(signature):
+            self._buckets[band].setdefault(value, set()).add(key)
+
+    def remove(self, key: str) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, value in self._bands(signature):
+            bucket = self._buckets[band][value]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band][value]
+
+    def near_duplicates(
+        self, signature: np.ndarray, threshold: float = NEAR_DUPLICATE_THRESHOLD,
+    ) -> List[Tuple[str, float]]:
+        """Indexed keys whose estimated Jaccard with ``signature`` reaches ``threshold``, most similar first."""
+        if is_empty(signature):
+            return []
+        candidates: Set[str] = set()
+        for band, value in self._bands(signature):
+            candidates |= self._buckets[band].get(value, set())
+        found = [(key, estimated_jaccard(signature, self._signatures[key])) for key in candidates]
+        return sorted(
+            ((key, similarity) for key, similarity in found if similarity >= threshold),
+            key=lambda pair: (-pair[1], pair[0]),
+        )
@@ -10,10 +10,17 @@ Memory-optimised edition for small production containers:
 
 import re
 import logging
+from bisect import bisect_left
 from datetime import datetime
+from functools import cached_property
 import threading
-from typing import List, Set, Dict, Any, Tuple, Optional
+from typing import List, Set, Dict, Any, Callable, NamedTuple, Tuple, Optional
+from ml.relevance import TFIDF_PARAMS, get_relevance_backend, get_tfidf_model, hash_vectorize
+from ml.sections import COLON_TAIL, LINE_TAIL, WORD_END, ResumeSections, SectionScanner
 from pipeline.skills import (
+    SkillExpansion,
+    SkillSet,
+    crediting_names,
     match_skills,
     extract_jd_skills,
     extract_jd_skill_tiers,
@@ -23,6 +30,7 @@ from pipeline.skills import (
 )
 
 import numpy as np
+from scipy import sparse
 from sklearn.metrics.pairwise import cosine_similarity
 
 logger = logging.getLogger(__name__)
@@ -111,44 +119,127 @@ _NER_BLOCKLIST = {
 }
 
 
-def extract_skills(text: str) -> list:
+# Seed boundary rules. Short tokens ("c", "r", "go", "aws", "c++") need
+# whitespace on the left and whitespace/punctuation on the right; longer ones a
+# plain word boundary on both sides.
+_SHORT_SEED_LEFT  = r"(?<!\S)"
+_SHORT_SEED_RIGHT = r"(?=$|[\s,./])"
+
+
+def _is_short_seed(normalized: str) -> bool:
+    return len(normalized.replace(" ", "")) <= 3
+
+
+def _trie_regex(words) -> str:
+    """Alternation over ``words`` factored by common prefix; longer words are tried first."""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        alternation = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{alternation})?" if "" in node else alternation
+
+    return build(trie)
+
+
+class _SkillMatcher:
+    """
+    Every SKILLS_SEED pattern compiled into one pass per boundary rule.
+
+    Each rule's seeds become a single prefix-trie regex inside a lookahead, so
+    overlapping hits ("data structures" inside "data structures and
+    algorithms", "algorithms" after it) are all seen. At any position the trie
+    reports the longest seed that matches; the only other seeds that can match
+    there are its proper prefixes, which are checked individually. The result
+    is exactly the set of seeds whose own pattern would match the text.
+    """
+
+    def __init__(self, seeds):
+        self._seeds_by_norm: Dict[str, List[str]] = {}
+        for seed in seeds:
+            self._seeds_by_norm.setdefault(_normalize(seed), []).append(seed)
+
+        self._scanners = []
+        self._prefixes: Dict[str, List[Tuple[str, "re.Pattern"]]] = {}
+        for short in (True, False):
+            norms = [ns for ns in self._seeds_by_norm if _is_short_seed(ns) == short]
+            left, right = (_SHORT_SEED_LEFT, _SHORT_SEED_RIGHT) if short else (r"\b", r"\b")
+            self._scanners.append(re.compile(rf"{left}(?=({_trie_regex(norms)}){right})"))
+            for ns in norms:
+                self._prefixes[ns] = [
+                    (other, re.compile(rf"{left}{re.escape(other)}{right}"))
+                    for other in norms
+                    if other != ns and ns.startswith(other)
+                ]
+
+    def find(self, norm: str) -> Set[str]:
+        """Seeds present in ``norm`` (text already passed through _normalize)."""
+        found: Set[str] = set()
+        for scanner in self._scanners:
+            for m in scanner.finditer(norm):
+                hit, pos = m.group(1), m.start(1)
+                found.update(self._seeds_by_norm[hit])
+                for prefix, pattern in self._prefixes[hit]:
+                    if pattern.match(norm, pos):
+                        found.update(self._seeds_by_norm[prefix])
+        return found
+
+
+_skill_matcher = _SkillMatcher(SKILLS_SEED)
+
+
+_NER_TEXT_CHARS = 8000
+_NER_ORG_NOISE = re.compile(
+    r"[,;]|\binc\b|\bltd\b|\bllc\b|\buniversity\b|\binstitute\b"
+    r"|\bcollege\b|\bschool\b|\bpvt\b|\bcorp\b"
+)
+
+
+def _entity_skills(ents) -> Set[str]:
     found = set()
-    norm = _normalize(text)
+    for ent in ents:
+        if ent.label_ in ("ORG", "PRODUCT"):
+            val = ent.text.strip()
+            val_lower = val.lower()
+            if 1 <= len(val.split()) <= 3 and len(val) <= 30:
+                if val_lower in _NER_BLOCKLIST or set(val_lower.split()) & _NER_BLOCKLIST:
+                    continue
+                if not _NER_ORG_NOISE.search(val_lower):
+                    found.add(val_lower)
+    return found
+
+
+def extract_skills_batch(texts: List[str], batch_size: int = 32, n_process: int = 1) -> List[list]:
+    """
+    extract_skills for many texts, with one ``nlp.pipe`` pass for the NER step.
 
-    for skill in SKILLS_SEED:
-        ns = _normalize(skill)
-        if len(ns.replace(" ", "")) <= 3:
-            pat = rf"(?:^|\s){re.escape(ns)}(?:$|[\s,./])"
-        else:
-            pat = rf"\b{re.escape(ns)}\b"
-        if re.search(pat, norm):
-            found.add(skill)
+    Only the NER components run (see ml.nlp_utils.analyze_texts). Results come
+    back in input order; if spaCy fails, every text falls back to seed matches.
+    """
+    found = [_skill_matcher.find(_normalize(text)) for text in texts]
 
     try:
-        from ml.nlp_utils import get_nlp
-        nlp = get_nlp()
-        doc = nlp(text[:8000])
-        for ent in doc.ents:
-            if ent.label_ in ("ORG", "PRODUCT"):
-                val = ent.text.strip()
-                val_lower = val.lower()
-                if 1 <= len(val.split()) <= 3 and len(val) <= 30:
-                    if val_lower in _NER_BLOCKLIST or set(val_lower.split()) & _NER_BLOCKLIST:
-                        continue
-                    if not re.search(
-                        r"[,;]|\binc\b|\bltd\b|\bllc\b|\buniversity\b|\binstitute\b"
-                        r"|\bcollege\b|\bschool\b|\bpvt\b|\bcorp\b",
-                        val_lower
-                    ):
-                        found.add(val_lower)
+        from ml.nlp_utils import analyze_texts
+        analyses = analyze_texts([text[:_NER_TEXT_CHARS] for text in texts], batch_size, n_process)
+        entity_skills = [_entity_skills(analysis.entities) for analysis in analyses]
     except Exception as e:
         logger.debug("NER skill extraction failed: %s", e)
+    else:
+        for skills, entities in zip(found, entity_skills):
+            skills |= entities
+
+    return [sorted({SKILL_ALIASES.get(s, s) for s in skills}) for skills in found]
 
-    final_skills = set()
-    for s in found:
-        final_skills.add(SKILL_ALIASES.get(s, s))
 
-    return sorted(final_skills)
+def extract_skills(text: str) -> list:
+    return extract_skills_batch([text])[0]
 
 
 # ---------------------------------------------------------------------------
@@ -227,17 +318,133 @@ ROLE_KEYWORDS = [
 ]
 
 
-def _find_section(text_l: str, headers: list) -> int | None:
-    for h in headers:
-        m = re.search(rf"(?:^|\n)\s*{re.escape(h)}[\s:.\-_]*(?:\n|$)", text_l)
-        if m:
-            return m.end()
-    return None
+# Roles within this many characters of a date range make it count as a job.
+ROLE_CONTEXT_CHARS = 150
+# Ranges longer than this are usually degrees or "2010 - 2020" project spans.
+MAX_RANGE_YEARS = 6
+
+_DATE_RANGE_RE = re.compile(DATE_RANGE_PATTERN, re.IGNORECASE)
+_ROLE_PATTERN = re.compile(
+    r"\b(" + "|".join(map(re.escape, sorted(ROLE_KEYWORDS, key=len, reverse=True))) + r")\b"
+)
+# Role keywords found inside longer ones ("founder" in "co-founder"), as
+# (offset, keyword): finditer does not overlap matches, so these are added
+# by hand to keep every whole-word occurrence.
+_NESTED_ROLES = {
+    role: [(m.start(), m.group(1)) for i in range(1, len(role)) if (m := _ROLE_PATTERN.match(role, i))]
+    for role in ROLE_KEYWORDS
+}
+
+
+class ExperienceRange(NamedTuple):
+    start: datetime
+    end: datetime
+    role: str
 
 
 def extract_experience(text: str) -> list:
+    return [_experience_str(text.lower())]
+
+
+def extract_experience_timeline(text: str) -> Tuple[str, List[ExperienceRange]]:
+    """
+    ``("N.N Years", timeline)``: the extract_experience string plus every dated
+    role in the work section, in document order. The timeline is found even
+    when an explicit "N years of experience" statement decides the total.
+    """
     text_l = text.lower()
-    text_l = re.sub(r"[\u2010-\u2015\u2212]", "-", text_l)
+    return _experience_str(text_l), _experience_timeline(_normalize_dashes(text_l))
+
+
+def _normalize_dashes(text_l: str) -> str:
+    return re.sub(r"[\u2010-\u2015\u2212]", "-", text_l)   # same length: spans still line up
+
+
+def _work_section(text_l: str, sections: Optional[ResumeSections] = None) -> Optional[str]:
+    """The experience section of dash-normalized lowercased text, or None."""
+    if sections is None:
+        sections = _SECTION_SCANNER.scan(text_l)
+    header = next(
+        (found for h in EXPERIENCE_HEADERS if (found := sections.find(h, LINE_TAIL, text=text_l))), None
+    )
+    if header is None:
+        return None
+    start = header[1]
+
+    end = len(text_l)
+    for h in STOP_HEADERS:
+        found = sections.find(h, COLON_TAIL, lo=start, text=text_l)
+        if found and found[0] > start:
+            end = min(end, found[0])
+
+    for h in WORK_SECTION_STOP_HEADERS:
+        found = sections.find(h, COLON_TAIL, lo=start, hi=end, text=text_l)
+        if found:
+            end = found[0]
+
+    return text_l[start:end]
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _experience_timeline(text_l: str, sections: Optional[ResumeSections] = None) -> List[ExperienceRange]:
+    """Dated roles in the work section, each tied to its closest role keyword."""
+    work_section = _work_section(text_l, sections)
+    if not work_section:
+        return []
+
+    role_starts, role_ends, roles = [], [], []
+    for m in _ROLE_PATTERN.finditer(work_section):
+        for offset, role in [(0, m.group(1)), *_NESTED_ROLES[m.group(1)]]:
+            role_starts.append(m.start() + offset)
+            role_ends.append(m.start() + offset + len(role))
+            roles.append(role)
+
+    timeline = []
+    for match in _DATE_RANGE_RE.finditer(work_section):
+        start, end = match.span()
+        lo, hi = max(0, start - ROLE_CONTEXT_CHARS), min(len(work_section), end + ROLE_CONTEXT_CHARS)
+        # No role keyword ends inside another one, so role_ends is sorted as
+        # well: the roles inside the window start at ``first``.
+        first = bisect_left(role_starts, lo)
+        if first < len(roles) and role_ends[first] <= hi:
+            before = bisect_left(role_starts, start) - 1    # last role ending before the range
+            after = before + 1                              # first role starting after it
+            while before > first and role_ends[before - 1] == role_ends[before]:
+                before -= 1                                 # "co-founder" rather than "founder"
+            # A role on the range's own line wins, then the one above it
+            # ("Engineer, Acme" / "Jan 2020 - Mar 2022"), then the one below.
+            candidates = []
+            if before >= first:
+                gap = work_section[role_ends[before]:start]
+                candidates.append(("\n" in gap, False, len(gap), before))
+            if after < len(roles) and role_ends[after] <= hi:
+                gap = work_section[end:role_starts[after]]
+                candidates.append(("\n" in gap, True, len(gap), after))
+            role = roles[min(candidates)[-1]]
+        elif (lo > 0 and _is_word_char(work_section[lo - 1])) or (hi < len(work_section) and _is_word_char(work_section[hi])):
+            # The window cuts a word, and the cut-off end still counts as a
+            # word boundary (e.g. "...engineers" cut after "engineer").
+            cut = _ROLE_PATTERN.search(work_section[lo:hi])
+            if cut is None:
+                continue
+            role = cut.group(1)
+        else:
+            continue
+
+        s_str, e_str = match.groups()
+        d1 = parse_date(s_str)
+        d2 = parse_date(e_str)
+        if d1 and d2 and d2 >= d1 and (d2 - d1).days / 365.25 <= MAX_RANGE_YEARS:
+            timeline.append(ExperienceRange(d1, d2, role))
+    return timeline
+
+
+def _experience_str(text_l: str, sections: Optional[ResumeSections] = None) -> str:
+    """extract_experience on already-lowercased text (``sections`` from _SECTION_SCANNER)."""
+    text_l = _normalize_dashes(text_l)
 
     explicit = re.findall(
         r"(\d+\.?\d*)\s*\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:professional\s+|relevant\s+|production\s+|industry\s+|commercial\s+)?experience",
@@ -245,7 +452,7 @@ def extract_experience(text: str) -> list:
     )
     if explicit:
         years = max(float(x) for x in explicit)
-        return [f"{min(years, 40):.1f} Years"]
+        return f"{min(years, 40):.1f} Years"
 
     explicit_words = re.findall(
         r"\b(" + "|".join(NUMBER_WORDS) + r")\b\s*\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:professional\s+|relevant\s+|production\s+|industry\s+|commercial\s+)?experience",
@@ -253,44 +460,12 @@ def extract_experience(text: str) -> list:
     )
     if explicit_words:
         years = max(NUMBER_WORDS[x] for x in explicit_words)
-        return [f"{min(float(years), 40):.1f} Years"]
-
-    start = _find_section(text_l, EXPERIENCE_HEADERS)
-    if start is None:
-        return ["0.0 Years"]
-
-    end = len(text_l)
-    for h in STOP_HEADERS:
-        m = re.search(rf"(?:^|\n)\s*{re.escape(h)}\s*(?::|$)", text_l[start:])
-        if m:
-            cand = start + m.start()
-            if cand > start:
-                end = min(end, cand)
-
-    work_section = text_l[start:end]
-
-    for h in ["education","projects","leadership","achievements"]:
-        m = re.search(rf"(?:^|\n)\s*{re.escape(h)}\s*(?::|$)", work_section)
-        if m:
-            work_section = work_section[:m.start()]
-
-    ranges = []
-    for match in re.finditer(DATE_RANGE_PATTERN, work_section, re.IGNORECASE):
-        s_str, e_str = match.groups()
-        ctx = work_section[max(0, match.start()-150):match.end()+150]
-        has_role = any(re.search(rf"\b{re.escape(role)}\b", ctx) for role in ROLE_KEYWORDS)
-        if has_role:
-            d1 = parse_date(s_str)
-            d2 = parse_date(e_str)
-            if d1 and d2 and d2 >= d1:
-                span_years = (d2 - d1).days / 365.25
-                if span_years <= 6:
-                    ranges.append((d1, d2))
+        return f"{min(float(years), 40):.1f} Years"
 
+    ranges = sorted((r.start, r.end) for r in _experience_timeline(text_l, sections))
     if not ranges:
-        return ["0.0 Years"]
+        return "0.0 Years"
 
-    ranges.sort()
     merged = [ranges[0]]
     for s, e in ranges[1:]:
         ls, le = merged[-1]
@@ -301,7 +476,7 @@ def extract_experience(text: str) -> list:
 
     total_days = sum((e - s).days for s, e in merged)
     years = total_days / 365.25
-    return [f"{min(years, 40):.1f} Years"]
+    return f"{min(years, 40):.1f} Years"
 
 
 # ---------------------------------------------------------------------------
@@ -319,6 +494,27 @@ EDUCATION_STOP_HEADERS = [
 ]
 
 
+# Line-start phrases checked by the ATS section score and the evidence analysis.
+ATS_SECTION_HEADERS = {
+    "experience": ["experience", "employment", "work history"],
+    "education":  ["education", "academic"],
+    "skills":     ["skills", "technical skills", "technologies"],
+    "projects":   ["projects", "portfolio"],
+    "summary":    ["summary", "objective", "profile", "about"],
+}
+PROJECT_EVIDENCE_HEADERS = ["projects", "project", "portfolio", "experience", "work experience", "employment"]
+SKILLS_ONLY_HEADERS = ["skills", "skill"]
+# Cut the work section short even where STOP_HEADERS were skipped.
+WORK_SECTION_STOP_HEADERS = ["education", "projects", "leadership", "achievements"]
+
+_SECTION_SCANNER = SectionScanner([
+    *EXPERIENCE_HEADERS, *STOP_HEADERS, *WORK_SECTION_STOP_HEADERS,
+    *EDUCATION_HEADERS, *EDUCATION_STOP_HEADERS,
+    *(h for headers in ATS_SECTION_HEADERS.values() for h in headers),
+    *PROJECT_EVIDENCE_HEADERS, *SKILLS_ONLY_HEADERS,
+])
+
+
 def extract_education(text: str) -> str:
     for header in ["EDUCATION","SKILLS","EXPERIENCE","PROJECTS","SUMMARY","AWARDS"]:
         text = re.sub(rf"([a-z\.,])({header})", r"\1\n\2", text)
@@ -326,22 +522,18 @@ def extract_education(text: str) -> str:
     text_l = text.lower()
     text_l = re.sub(r"\be\s+d\s+u\s+c\s+a\s+t\s+i\s+o\s+n\b", "education", text_l)
 
-    start = None
-    for h in EDUCATION_HEADERS:
-        m = re.search(rf"(?:^|\n)\s*{re.escape(h)}\s*(?::|$)", text_l)
-        if m:
-            start = m.end()
-            break
+    # Header splitting rewrote the text, so it gets its own scan.
+    sections = _SECTION_SCANNER.scan(text_l)
+    header = next((found for h in EDUCATION_HEADERS if (found := sections.find(h, COLON_TAIL))), None)
 
     section = text_l
-    if start is not None:
+    if header is not None:
+        start = header[1]
         end = len(text_l)
         for h in EDUCATION_STOP_HEADERS:
-            m = re.search(rf"(?:^|\n)\s*{re.escape(h)}\s*(?::|$)", text_l[start:])
-            if m:
-                cand = start + m.start()
-                if cand > start:
-                    end = min(end, cand)
+            found = sections.find(h, COLON_TAIL, lo=start)
+            if found and found[0] > start:
+                end = min(end, found[0])
         section = text_l[start:end]
 
     if re.search(r"\b(ph\.?\s*d\.?|doctorate|doctor of philosophy|d\.phil)\b", section):
@@ -364,24 +556,37 @@ def extract_education(text: str) -> str:
 # TF-IDF with bigrams + sublinear_tf is a solid lightweight alternative.
 # ---------------------------------------------------------------------------
 
-def calculate_similarity(job_desc: str, resumes: list) -> list:
+def calculate_similarity(
+    job_desc: str,
+    resumes: list,
+    resume_vectors: Optional[list] = None,
+    backend: Optional[str] = None,
+) -> list:
     """
-    Compute TF-IDF cosine similarity between the job description and each resume.
-    ~2 MB footprint, no external model download, instant startup.
+    Compute cosine similarity between the job description and each resume.
+
+    ``backend`` defaults to ml.relevance.get_relevance_backend():
+      tfidf    the corpus model when one is loaded (IDF weights independent of
+               the batch); otherwise fits on the JD plus these resumes.
+      hashing  stateless hashed term vectors; ``resume_vectors`` (rows from
+               ResumeFeatures.relevance_vector) skip re-vectorizing resumes.
     """
     if not resumes or not job_desc:
         return [0.0] * len(resumes)
 
-    from sklearn.feature_extraction.text import TfidfVectorizer
+    backend = backend or get_relevance_backend()
+    if backend == "hashing":
+        jd_vector = hash_vectorize([job_desc])
+        matrix = sparse.vstack(resume_vectors) if resume_vectors is not None else hash_vectorize(resumes)
+        return cosine_similarity(jd_vector, matrix)[0].tolist()
+
     docs = [job_desc] + resumes
-    tfidf = TfidfVectorizer(
-        stop_words="english",
-        ngram_range=(1, 2),
-        min_df=1,
-        sublinear_tf=True,
-        max_features=20_000,   # cap vocabulary to keep memory bounded
-    )
-    matrix = tfidf.fit_transform(docs)
+    model = get_tfidf_model()
+    if model is not None:
+        matrix = model.transform(docs)
+    else:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        matrix = TfidfVectorizer(min_df=1, **TFIDF_PARAMS).fit_transform(docs)
     scores = cosine_similarity(matrix[0:1], matrix[1:])
     return scores[0].tolist()
 
@@ -390,9 +595,28 @@ def calculate_similarity(job_desc: str, resumes: list) -> list:
 # REAL ATS SCORING
 # ---------------------------------------------------------------------------
 
-def calculate_ats_score(resume_raw: str, job_keywords: set = None) -> float:
-    text = resume_raw
-    text_l = text.lower()
+def calculate_ats_score(
+    resume_raw: "str | ResumeFeatures",
+    job_keywords: Set[str] | SkillSet | None = None,
+    resume_skills: Optional[Set[str]] = None,
+) -> float:
+    features = resume_raw if isinstance(resume_raw, ResumeFeatures) else ResumeFeatures(resume_raw)
+    score, max_score = features.ats_checks
+
+    if job_keywords:
+        if resume_skills is None:
+            resume_skills = features.resume_skills
+        overlap = SkillSet.of(resume_skills).overlap(SkillSet.of(job_keywords))
+        kw_ratio = overlap / max(len(job_keywords), 1)
+        max_score += 25
+        score += round(min(25.0, kw_ratio * 25.0), 2)
+
+    raw = (score / max_score) * 100 if max_score else 0
+    return round(min(100, max(0, raw)), 2)
+
+
+def _ats_checks(text: str, text_l: str, sections: Optional[ResumeSections] = None) -> Tuple[float, float]:
+    """JD-independent part of calculate_ats_score: (points earned, points available)."""
     words = text_l.split()
     wc = len(words)
     score = 0.0
@@ -408,16 +632,10 @@ def calculate_ats_score(resume_raw: str, job_keywords: set = None) -> float:
     check(5, bool(re.search(r"[\w.+-]+@[\w-]+\.\w+", email_compact)))
     check(5, bool(re.search(r"(\+?\d[\d\s\-().]{7,}\d)", text)))
 
-    sections = {
-        "experience": ["experience", "employment", "work history"],
-        "education":  ["education", "academic"],
-        "skills":     ["skills", "technical skills", "technologies"],
-        "projects":   ["projects", "portfolio"],
-        "summary":    ["summary", "objective", "profile", "about"],
-    }
-    for sec, keywords in sections.items():
-        has = any(re.search(rf"(?:^|\n)\s*{kw}", text_l) for kw in keywords)
-        check(6, has)
+    if sections is None:
+        sections = _SECTION_SCANNER.scan(text_l)
+    for keywords in ATS_SECTION_HEADERS.values():
+        check(6, sections.has(keywords))
 
     garble_ratio = len(re.findall(r"\s{3,}", text)) / max(wc, 1)
     check(5, garble_ratio < 0.5)
@@ -435,16 +653,7 @@ def calculate_ats_score(resume_raw: str, job_keywords: set = None) -> float:
     )
     bad_dates = re.findall(r"\b\d{1,2}/\d{1,2}/\d{2,4}\b", text_l)
     check(10, len(std_dates) >= len(bad_dates))
-
-    if job_keywords:
-        resume_skills = set(extract_skills(resume_raw))
-        overlap = len(resume_skills & job_keywords)
-        kw_ratio = overlap / max(len(job_keywords), 1)
-        max_score += 25
-        score += round(min(25.0, kw_ratio * 25.0), 2)
-
-    raw = (score / max_score) * 100 if max_score else 0
-    return round(min(100, max(0, raw)), 2)
+    return score, max_score
 
 
 # ---------------------------------------------------------------------------
@@ -469,9 +678,10 @@ def calculate_component_scores(
     LOWER_BOUND = 0.0
     UPPER_BOUND = 0.6
 
+    skills_by_resume = extract_skills_batch(resumes_raw)
     results = []
     for i, raw in enumerate(resumes_raw):
-        resume_skills = set(extract_skills(raw))
+        resume_skills = set(skills_by_resume[i])
 
         # 🔥 NEW SKILL MATCHING
         if jd_skills:
@@ -585,13 +795,27 @@ def _confidence_credit(weight: float) -> float:
     return weight * 0.55
 
 
-def _primary_backend_language(text: str, skills: Set[str]) -> str | None:
-    text_l = text.lower()
+_BACKEND_STACK_BITS = {
+    language: (SkillSet.of(cfg["languages"]), SkillSet.of(cfg["frameworks"]))
+    for language, cfg in BACKEND_STACK_SIGNALS.items()
+}
+
+
+def _tier_credit(match: Dict[str, Any]) -> float:
+    """One JD tier's skill credit: 1 per listed skill, confidence credit per inferred one."""
+    credit = len(match["matched_skills"])
+    credit += sum(_confidence_credit(match["inference_weights"].get(skill, 0)) for skill in match["inferred_skills"])
+    return credit
+
+
+def _primary_backend_language(text_l: str, skills: Set[str] | SkillSet) -> str | None:
+    bits = SkillSet.of(skills)
     scores: dict[str, float] = {}
     for language, cfg in BACKEND_STACK_SIGNALS.items():
+        languages, frameworks = _BACKEND_STACK_BITS[language]
         score = len(re.findall(cfg["pattern"], text_l))
-        score += 3 * len(skills & cfg["languages"])
-        score += 2 * len(skills & cfg["frameworks"])
+        score += 3 * bits.overlap(languages)
+        score += 2 * bits.overlap(frameworks)
         if score:
             scores[language] = float(score)
     if not scores:
@@ -624,9 +848,12 @@ ROLE_SIGNALS = {
 }
 
 
-def _role_family(text: str, skills: Set[str]) -> str | None:
-    text_l = text.lower()
-    scores = {role: len(skills & signals) for role, signals in ROLE_SIGNALS.items()}
+_ROLE_SIGNAL_BITS = {role: SkillSet.of(signals) for role, signals in ROLE_SIGNALS.items()}
+
+
+def _role_family(text_l: str, skills: Set[str] | SkillSet) -> str | None:
+    bits = SkillSet.of(skills)
+    scores = {role: bits.overlap(signals) for role, signals in _ROLE_SIGNAL_BITS.items()}
     if re.search(r"\bbackend|api|microservice|server-side|server side\b", text_l):
         scores["backend"] += 4
     if re.search(r"\bmachine learning|deep learning|model|tensorflow|pytorch|data scientist\b", text_l):
@@ -651,10 +878,11 @@ def _role_alignment(jd_role: str | None, resume_role: str | None) -> float:
     return 0.35
 
 
-def _evidence_quality(text: str, skills: Set[str]) -> dict[str, Any]:
-    text_l = text.lower()
-    has_project = bool(re.search(r"(?m)^\s*(projects?|portfolio|experience|work experience|employment)\b", text_l))
-    has_skills_only_section = bool(re.search(r"(?m)^\s*skills?\b", text_l)) and not has_project
+def _evidence_quality(text_l: str, skills: Set[str], sections: Optional[ResumeSections] = None) -> dict[str, Any]:
+    if sections is None:
+        sections = _SECTION_SCANNER.scan(text_l)
+    has_project = sections.has(PROJECT_EVIDENCE_HEADERS, WORD_END)
+    has_skills_only_section = sections.has(SKILLS_ONLY_HEADERS, WORD_END) and not has_project
     action_hits = len(re.findall(
         r"\b(built|designed|implemented|deployed|optimized|scaled|improved|reduced|increased|maintained|developed)\b",
         text_l,
@@ -681,7 +909,7 @@ def _evidence_quality(text: str, skills: Set[str]) -> dict[str, Any]:
     }
 
 
-def _hiring_recommendation(score: float) -> str:
+def hiring_recommendation(score: float) -> str:
     if score >= 85:
         return "Strong Hire"
     if score >= 70:
@@ -787,6 +1015,272 @@ def _explanation_for_candidate(
     }
 
 
+class ResumeFeatures:
+    """
+    JD-independent signals for one resume, each derived lazily and at most once.
+
+    Nothing here depends on the job description or the rest of the batch, so a
+    scan can compute it as soon as a resume's text is available and overlap it
+    with the remaining PDF extraction. Every scorer reads the same instance, so
+    the lowercased text, skill set, experience, degree, evidence and ATS checks
+    are each computed once per resume.
+    """
+
+    # Persisted with a candidate (see to_dict) and read by the structured scorer.
+    STORED = (
+        "resume_skills", "evidence", "role_family", "primary_backend_language",
+        "experience_str", "years", "degree",
+    )
+
+    def __init__(self, raw: str | None, skills: Optional[List[str]] = None):
+        self.raw = raw
+        if skills is not None:   # already extracted in a batched NER pass
+            self.resume_skills = set(skills)
+
+    @classmethod
+    def from_dict(cls, stored: Dict[str, Any], raw: str | None = None) -> "ResumeFeatures":
+        """
+        Rebuild from to_dict output. Without ``raw`` only the stored fields are
+        available; with it the rest (ATS checks, relevance vector) is derived
+        from the text as usual.
+        """
+        features = cls(raw)
+        features.__dict__.update({name: stored[name] for name in cls.STORED})
+        features.resume_skills = set(stored["resume_skills"])
+        return features
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.STORED}
+
+    def warm(self, vectorize: bool = False) -> "ResumeFeatures":
+        """
+        Compute everything scoring reads (call off the event loop). The hashed
+        relevance vector is only read by the hashing backend; ``vectorize``
+        computes it anyway, for a caller that persists it (api.resume_vectors).
+        """
+        for name in self.STORED:
+            getattr(self, name)
+        self.ats_checks
+        if vectorize or get_relevance_backend() == "hashing":
+            self.relevance_vector
+        return self
+
+    @cached_property
+    def lower(self) -> str:
+        return self.raw.lower()
+
+    @cached_property
+    def sections(self) -> ResumeSections:
+        return _SECTION_SCANNER.scan(self.lower)
+
+    @cached_property
+    def resume_skills(self) -> Set[str]:
+        return set(extract_skills(self.raw))
+
+    @cached_property
+    def skill_bits(self) -> SkillSet:
+        return SkillSet.of(self.resume_skills)
+
+    @cached_property
+    def evidence(self) -> Dict[str, Any]:
+        return _evidence_quality(self.lower, self.resume_skills, self.sections)
+
+    @cached_property
+    def role_family(self) -> str | None:
+        return _role_family(self.lower, self.skill_bits)
+
+    @cached_property
+    def primary_backend_language(self) -> str | None:
+        return _primary_backend_language(self.lower, self.skill_bits)
+
+    @cached_property
+    def experience_str(self) -> str:
+        return _experience_str(self.lower, self.sections)
+
+    @cached_property
+    def relevance_vector(self):
+        """1 x HASHING_FEATURES float32 row for the hashing relevance backend."""
+        return hash_vectorize([self.raw])
+
+    @cached_property
+    def timeline(self) -> List[ExperienceRange]:
+        return _experience_timeline(_normalize_dashes(self.lower), self.sections)
+
+    @cached_property
+    def years(self) -> float:
+        return float(re.search(r"\d+(\.\d+)?", self.experience_str).group())
+
+    @cached_property
+    def degree(self) -> str:
+        return extract_education(self.raw)
+
+    @cached_property
+    def ats_checks(self) -> Tuple[float, float]:
+        return _ats_checks(self.raw, self.lower, self.sections)
+
+
+def extract_resume_features(raw: str) -> ResumeFeatures:
+    """ResumeFeatures for one resume, fully computed."""
+    return extract_resume_features_batch([raw])[0]
+
+
+def extract_resume_features_batch(
+    raws: List[str], batch_size: int = 32, n_process: int = 1, relevance_vectors: Optional[list] = None,
+    vectorize: bool = False,
+) -> List[ResumeFeatures]:
+    """
+    extract_resume_features for several resumes, sharing one NER pass.
+    ``relevance_vectors`` may hold stored rows (or None) to skip re-vectorizing;
+    ``vectorize`` is passed on to ResumeFeatures.warm.
+    """
+    features = [
+        ResumeFeatures(raw, skills)
+        for raw, skills in zip(raws, extract_skills_batch(raws, batch_size, n_process))
+    ]
+    for f, vector in zip(features, relevance_vectors or []):
+        if vector is not None:
+            f.relevance_vector = vector
+    return [f.warm(vectorize) for f in features]
+
+
+def final_score_from_signals(signals: Dict[str, Any], weights: Dict[str, float]) -> float:
+    """
+    Final 0-100 score from a candidate's normalized component signals.
+
+    ``signals`` carries everything the JD and resume contribute (the four
+    0-1 sub-scores plus the penalty/bonus flags), so re-weighting a stored
+    candidate needs nothing but this function.
+    """
+    raw_score = (
+        weights["skills"] * signals["skills"]
+        + weights["experience"] * signals["experience"]
+        + weights["education"] * signals["education"]
+        + weights["relevance"] * signals["relevance"]
+    )
+
+    total_weight = sum(weights.values()) or 1.0
+    final_normalized = raw_score / total_weight
+    if signals["stack_penalty"]:
+        final_normalized *= 0.95 if signals["has_jd_language"] else 0.90
+    if signals["skill_only_risk"]:
+        final_normalized *= 0.70
+    elif signals["evidence_bonus"]:
+        final_normalized *= 1.04
+    final_normalized = max(0.0, min(1.0, final_normalized))
+    return round((final_normalized ** 0.7) * 100, 2)
+
+
+# ---------------------------------------------------------------------------
+# BATCH SCORING — one feature row per resume, sub-scores as array operations
+# ---------------------------------------------------------------------------
+
+EDU_SCORES = {"PhD": 1.0, "Master": 0.8, "Bachelor": 0.6, "Associate": 0.4}
+SEMANTIC_LOWER_BOUND = 0.05
+SEMANTIC_UPPER_BOUND = 0.35
+
+
+def _clip01(values: np.ndarray) -> np.ndarray:
+    return np.minimum(1.0, np.maximum(0.0, values))
+
+
+def score_feature_rows(
+    rows: Dict[str, np.ndarray],
+    weights: Dict[str, float],
+    required_count: int,
+    preferred_count: int,
+    experience_cap_years: float = 15.0,
+    min_years_experience: Optional[float] = None,
+    required_degree: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Component scores for a whole batch of resumes at once.
+
+    ``rows`` holds one equal-length column per feature: ``req_credit`` and
+    ``pref_credit`` (matched count plus inferred confidence credit),
+    ``years``, ``degree_rank``, ``edu_base``, ``similarity``,
+    ``role_alignment`` and the boolean ``skill_only_risk``, ``evidence_bonus``,
+    ``stack_penalty`` and ``has_jd_language``. Every step mirrors the
+    per-candidate arithmetic in the same operation order, so the values are
+    identical to scoring resumes one at a time. The final ``** 0.7`` curve
+    and rounding run per element: NumPy's vectorised ``pow`` can differ from
+    libm in the last bit, which is enough to flip a rounded score.
+    """
+    risk = rows["skill_only_risk"]
+    bonus = rows["evidence_bonus"]
+
+    # SKILLS
+    req_ratio = rows["req_credit"] / max(1, required_count) if required_count else np.zeros_like(rows["req_credit"])
+    pref_ratio = rows["pref_credit"] / max(1, preferred_count) if preferred_count else np.zeros_like(rows["pref_credit"])
+    if required_count and preferred_count:
+        skills = (0.85 * req_ratio) + (0.15 * pref_ratio)
+    elif required_count:
+        skills = req_ratio
+    else:
+        skills = pref_ratio
+    skills = _clip01(skills)
+    skills = np.where(risk, skills * 0.55, np.where(bonus, np.minimum(1.0, skills + 0.03), skills))
+
+    # EXPERIENCE
+    years = rows["years"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        experience = np.where(years == 0, 0.5, np.minimum(1.0, years / experience_cap_years))
+    meets_min_exp = None
+    if min_years_experience is not None:
+        meets_min_exp = years >= min_years_experience
+        experience = np.where(
+            meets_min_exp,
+            np.maximum(experience, np.minimum(1.0, years / max(min_years_experience, 1.0))),
+            np.minimum(experience, 0.5),
+        )
+
+    # EDUCATION
+    education = rows["edu_base"]
+    meets_degree_req = None
+    if required_degree and required_degree != "None":
+        meets_degree_req = rows["degree_rank"] >= DEGREE_ORDER.get(required_degree, 0)
+        education = np.where(meets_degree_req, 1.0, education * 0.5)
+
+    # RELEVANCE
+    semantic = _clip01(
+        (rows["similarity"] - SEMANTIC_LOWER_BOUND) / (SEMANTIC_UPPER_BOUND - SEMANTIC_LOWER_BOUND)
+    )
+    skill_context = (0.75 * req_ratio) + (0.25 * pref_ratio)
+    relevance = np.maximum(
+        semantic,
+        _clip01((0.62 * skill_context) + (0.38 * rows["role_alignment"]) - 0.05),
+    )
+    relevance = np.where(risk, np.minimum(relevance, 0.45), relevance)
+
+    # FINAL (same steps as final_score_from_signals)
+    raw_score = (
+        weights["skills"] * skills
+        + weights["experience"] * experience
+        + weights["education"] * education
+        + weights["relevance"] * relevance
+    )
+    total_weight = sum(weights.values()) or 1.0
+    final_normalized = raw_score / total_weight
+    stack_factor = np.where(rows["has_jd_language"], 0.95, 0.90)
+    final_normalized = np.where(rows["stack_penalty"], final_normalized * stack_factor, final_normalized)
+    final_normalized = np.where(
+        risk, final_normalized * 0.70, np.where(bonus, final_normalized * 1.04, final_normalized)
+    )
+    final_normalized = _clip01(final_normalized)
+
+    return {
+        "req_ratio": req_ratio,
+        "pref_ratio": pref_ratio,
+        "skills": skills,
+        "experience": experience,
+        "education": education,
+        "semantic_overlap": semantic,
+        "relevance": relevance,
+        "meets_min_experience": meets_min_exp,
+        "meets_degree_req": meets_degree_req,
+        "final_score": [round((x ** 0.7) * 100, 2) for x in final_normalized.tolist()],
+    }
+
+
 def calculate_component_scores_structured(
     job_desc_clean: str,
     resumes_clean: List[str],
@@ -798,8 +1292,24 @@ def calculate_component_scores_structured(
     experience_cap_years: float = 15.0,
     min_years_experience: Optional[float] = None,
     required_degree: Optional[str] = None,
+    resume_features: Optional[List[ResumeFeatures]] = None,
+    similarity_scores: Optional[List[float]] = None,
 ) -> List[Dict[str, Any]]:
-    similarity_scores = calculate_similarity(job_desc_raw, resumes_raw)
+    """
+    Score resumes against tiered JD skills.
+
+    Everything is computed from the raw texts; ``job_desc_clean`` and
+    ``resumes_clean`` are accepted for call-site compatibility and never
+    read, so callers need not lemmatize anything. Pass ``similarity_scores``
+    to reuse relevance similarities computed over a larger batch.
+    """
+    if resume_features is None:
+        resume_features = extract_resume_features_batch(resumes_raw)
+    if similarity_scores is None:
+        resume_vectors = None
+        if get_relevance_backend() == "hashing" and all(f.raw is not None for f in resume_features):
+            resume_vectors = [f.relevance_vector for f in resume_features]
+        similarity_scores = calculate_similarity(job_desc_raw, resumes_raw, resume_vectors)
 
     # 🔥 FIX: better JD extraction
     if jd_skills is None:
@@ -816,22 +1326,28 @@ def calculate_component_scores_structured(
         for s in preferred_skills
         if isinstance(s, str) and not s.startswith("unknown:")
     }
-    jd_primary_backend_language = _primary_backend_language(job_desc_raw, jd_skills)
-    jd_role_family = _role_family(job_desc_raw, jd_skills | preferred_skills)
-
-    LOWER_BOUND = 0.05
-    UPPER_BOUND = 0.35
-
-    results = []
-    for i, raw in enumerate(resumes_raw):
-        resume_skills = set(extract_skills(raw))
-        evidence = _evidence_quality(raw, resume_skills)
-        resume_role_family = _role_family(raw, resume_skills)
-        role_alignment_score = _role_alignment(jd_role_family, resume_role_family)
+    jd_bits = SkillSet.of(jd_skills)
+    jd_lower = job_desc_raw.lower()
+    jd_primary_backend_language = _primary_backend_language(jd_lower, jd_bits)
+    jd_role_family = _role_family(jd_lower, jd_bits | SkillSet.of(preferred_skills))
+
+    # ── Pass 1: per-resume skill matching → feature rows ─────────────────
+    matches = []
+    columns: Dict[str, list] = {
+        name: [] for name in (
+            "req_credit", "pref_credit", "years", "degree_rank", "edu_base", "similarity",
+            "role_alignment", "skill_only_risk", "evidence_bonus", "stack_penalty", "has_jd_language",
+        )
+    }
+    for i, features in enumerate(resume_features):
+        resume_skills = features.resume_skills
+        evidence = features.evidence
 
         # 🔥 NEW SKILL MATCHING
-        skill_result = match_skills(list(resume_skills), list(jd_skills))
-        preferred_result = match_skills(list(resume_skills), list(preferred_skills))
+        expansion = SkillExpansion(resume_skills)   # shared by both JD tiers
+        skill_result = match_skills(resume_skills, list(jd_skills), expansion)
+        preferred_result = match_skills(resume_skills, list(preferred_skills), expansion)
+        matches.append((skill_result, preferred_result))
 
         matched = skill_result["matched_skills"]
         weights_inf = skill_result["inference_weights"]
@@ -844,96 +1360,72 @@ def calculate_component_scores_structured(
         logger.debug(f"  Inferred: {list(weights_inf.keys())}")
         logger.debug(f"  Missing: {skill_result['missing_skills']}")
 
-        req_score = len(matched)
-        req_score += sum(_confidence_credit(weights_inf.get(skill, 0)) for skill in skill_result["inferred_skills"])
-        req_ratio = req_score / max(1, len(jd_skills)) if jd_skills else 0.0
-
-        pref_score = len(preferred_result["matched_skills"])
-        pref_score += sum(
-            _confidence_credit(preferred_result["inference_weights"].get(skill, 0))
-            for skill in preferred_result["inferred_skills"]
-        )
-        pref_ratio = pref_score / max(1, len(preferred_skills)) if preferred_skills else 0.0
-
-        if jd_skills and preferred_skills:
-            skills_score = (0.85 * req_ratio) + (0.15 * pref_ratio)
-        elif jd_skills:
-            skills_score = req_ratio
-        else:
-            skills_score = pref_ratio
-        skills_score = max(0.0, min(1.0, skills_score))
-        if evidence["skill_only_risk"]:
-            skills_score *= 0.55
-        elif evidence["has_metrics"] and evidence["has_project_evidence"]:
-            skills_score = min(1.0, skills_score + 0.03)
-
-        # EXPERIENCE
-        exp_str = extract_experience(raw)[0]
-        years = float(re.search(r"\d+(\.\d+)?", exp_str).group())
-        if years == 0:
-            exp_score = 0.5
-        else:
-            exp_score = min(1.0, years / experience_cap_years)
-
-        meets_min_exp = None
-        if min_years_experience is not None:
-            meets_min_exp = years >= min_years_experience
-            if not meets_min_exp:
-                exp_score = min(exp_score, 0.5)
-            else:
-                exp_score = max(exp_score, min(1.0, years / max(min_years_experience, 1.0)))
+        req_score = _tier_credit(skill_result)
+        pref_score = _tier_credit(preferred_result)
 
-        # EDUCATION
-        degree = extract_education(raw)
-        edu_map = {"PhD": 1.0, "Master": 0.8, "Bachelor": 0.6, "Associate": 0.4}
-        edu_score = edu_map.get(degree, 0.3)
-
-        meets_degree_req = None
-        if required_degree and required_degree != "None":
-            candidate_rank = DEGREE_ORDER.get(degree, 0)
-            required_rank  = DEGREE_ORDER.get(required_degree, 0)
-            meets_degree_req = candidate_rank >= required_rank
-            if not meets_degree_req:
-                edu_score = edu_score * 0.5
-            else:
-                edu_score = 1.0
-
-        # RELEVANCE
-        raw_sim = float(similarity_scores[i])
-        semantic_overlap_score = max(0.0, min(1.0, (raw_sim - LOWER_BOUND) / (UPPER_BOUND - LOWER_BOUND)))
-        skill_context_score = (0.75 * req_ratio) + (0.25 * pref_ratio)
-        relevance_score = max(
-            semantic_overlap_score,
-            max(0.0, min(1.0, (0.62 * skill_context_score) + (0.38 * role_alignment_score) - 0.05)),
-        )
-        if evidence["skill_only_risk"]:
-            relevance_score = min(relevance_score, 0.45)
-
-        # FINAL
-        raw_score = (
-            weights["skills"] * skills_score
-            + weights["experience"] * exp_score
-            + weights["education"] * edu_score
-            + weights["relevance"] * relevance_score
-        )
-
-        total_weight = sum(weights.values()) or 1.0
-        final_normalized = raw_score / total_weight
-        resume_primary_backend_language = _primary_backend_language(raw, resume_skills)
+        resume_primary_backend_language = features.primary_backend_language
         stack_penalty = (
             jd_primary_backend_language is not None
             and resume_primary_backend_language is not None
             and jd_primary_backend_language != resume_primary_backend_language
         )
-        if stack_penalty:
-            has_jd_language = jd_primary_backend_language in resume_skills
-            final_normalized *= 0.95 if has_jd_language else 0.90
-        if evidence["skill_only_risk"]:
-            final_normalized *= 0.70
-        elif evidence["has_metrics"] and evidence["has_project_evidence"]:
-            final_normalized *= 1.04
-        final_normalized = max(0.0, min(1.0, final_normalized))
-        final = final_normalized ** 0.7
+        columns["req_credit"].append(req_score)
+        columns["pref_credit"].append(pref_score)
+        columns["years"].append(features.years)
+        columns["degree_rank"].append(DEGREE_ORDER.get(features.degree, 0))
+        columns["edu_base"].append(EDU_SCORES.get(features.degree, 0.3))
+        columns["similarity"].append(float(similarity_scores[i]))
+        columns["role_alignment"].append(_role_alignment(jd_role_family, features.role_family))
+        columns["skill_only_risk"].append(bool(evidence["skill_only_risk"]))
+        columns["evidence_bonus"].append(bool(evidence["has_metrics"] and evidence["has_project_evidence"]))
+        columns["stack_penalty"].append(stack_penalty)
+        columns["has_jd_language"].append(stack_penalty and jd_primary_backend_language in resume_skills)
+
+    # ── Pass 2: every sub-score for the whole batch ──────────────────────
+    rows = {
+        name: np.array(values, dtype=bool if isinstance(values[0], bool) else np.float64)
+        if values else np.zeros(0)
+        for name, values in columns.items()
+    }
+    scored = score_feature_rows(
+        rows, weights, len(jd_skills), len(preferred_skills),
+        experience_cap_years, min_years_experience, required_degree,
+    )
+    as_list = {
+        name: value.tolist() if isinstance(value, np.ndarray) else value
+        for name, value in scored.items()
+    }
+    row_list = {name: values.tolist() for name, values in rows.items()}
+
+    # ── Pass 3: explanations and result dicts ─────────────────────────────
+    results = []
+    for i, features in enumerate(resume_features):
+        skill_result, preferred_result = matches[i]
+        resume_skills = features.resume_skills
+        evidence = features.evidence
+        years = features.years
+        degree = features.degree
+        resume_primary_backend_language = features.primary_backend_language
+        role_alignment_score = row_list["role_alignment"][i]
+        stack_penalty = row_list["stack_penalty"][i]
+        skills_score = as_list["skills"][i]
+        exp_score = as_list["experience"][i]
+        edu_score = as_list["education"][i]
+        relevance_score = as_list["relevance"][i]
+        final_score = as_list["final_score"][i]
+        meets_min_exp = None if as_list["meets_min_experience"] is None else as_list["meets_min_experience"][i]
+        meets_degree_req = None if as_list["meets_degree_req"] is None else as_list["meets_degree_req"][i]
+
+        signals = {
+            "skills":          skills_score,
+            "experience":      exp_score,
+            "education":       edu_score,
+            "relevance":       relevance_score,
+            "stack_penalty":   stack_penalty,
+            "has_jd_language": row_list["has_jd_language"][i],
+            "skill_only_risk": evidence["skill_only_risk"],
+            "evidence_bonus":  evidence["has_metrics"] and evidence["has_project_evidence"],
+        }
         explicit_count = len(skill_result["matched_skills"]) + len(preferred_result["matched_skills"])
         inferred_count = len(skill_result["inferred_skills"]) + len(preferred_result["inferred_skills"])
         confidence_level = _confidence_level(
@@ -942,17 +1434,16 @@ def calculate_component_scores_structured(
             evidence_score=evidence["score"],
             skill_only_risk=evidence["skill_only_risk"],
         )
-        final_score = round(final * 100, 2)
         explanation = _explanation_for_candidate(
             jd_primary=jd_primary_backend_language,
             resume_primary=resume_primary_backend_language,
             stack_penalty=stack_penalty,
             jd_role=jd_role_family,
-            resume_role=resume_role_family,
+            resume_role=features.role_family,
             role_alignment_score=role_alignment_score,
             evidence=evidence,
-            req_ratio=req_ratio,
-            pref_ratio=pref_ratio,
+            req_ratio=as_list["req_ratio"][i],
+            pref_ratio=as_list["pref_ratio"][i],
             required_match=skill_result,
             preferred_match=preferred_result,
             years=years,
@@ -967,11 +1458,11 @@ def calculate_component_scores_structured(
             "exp_score":               round(exp_score * 100, 1),
             "edu_score":               round(edu_score * 100, 1),
             "relevance_score":         round(relevance_score * 100, 1),
-            "semantic_overlap_score":   round(semantic_overlap_score * 100, 1),
+            "semantic_overlap_score":   round(as_list["semantic_overlap"][i] * 100, 1),
             "role_alignment_score":     round(role_alignment_score * 100, 1),
             "degree":                  degree,
             "years_experience":        round(years, 1),
-            "experience_str":          exp_str,
+            "experience_str":          features.experience_str,
             "resume_skills":           resume_skills,
 
             # 🔥 UPDATED OUTPUT
@@ -980,11 +1471,188 @@ def calculate_component_scores_structured(
             "matched_preferred_skills": sorted(set(preferred_result["matched_skills"]) | set(preferred_result["inferred_skills"])),
             "inferred_skills": sorted(set(skill_result["inferred_skills"]) | set(preferred_result["inferred_skills"])),
             "confidence_level": confidence_level,
-            "hiring_recommendation": _hiring_recommendation(final_score),
+            "hiring_recommendation": hiring_recommendation(final_score),
             **explanation,
 
             "meets_min_experience":    meets_min_exp,
             "meets_degree_req":        meets_degree_req,
+            "signals":                 signals,
         })
 
     return results
+
+
+# ---------------------------------------------------------------------------
+# TOP-K CASCADE — full extraction only for resumes that can still make the cut
+# ---------------------------------------------------------------------------
+
+SCREENED_OUT = "Screened out (fast path)"
+
+
+def _seed_skills(raw: str) -> List[str]:
+    """The seed-pattern half of extract_skills: no NER pass."""
+    return sorted({SKILL_ALIASES.get(s, s) for s in _skill_matcher.find(_normalize(raw))})
+
+
+def _possible_credit(match: Dict[str, Any], head: str) -> int:
+    """
+    JD skills one tier could credit once NER runs: everything the seeds
+    already earn, plus missing skills one of whose crediting names occurs in
+    the text NER reads (entities are spans of it).
+    """
+    possible = len(match["matched_skills"]) + len(match["inferred_skills"])
+    for skill in match["missing_skills"]:
+        if any(name in head for name in crediting_names(skill)):
+            possible += 1
+    return possible
+
+
+def calculate_component_scores_top_k(
+    job_desc_raw: str,
+    resumes_raw: List[str],
+    weights: Dict[str, float],
+    top_k: int,
+    jd_skills: Set[str],
+    preferred_skills: Set[str],
+    experience_cap_years: float = 15.0,
+    min_years_experience: Optional[float] = None,
+    required_degree: Optional[str] = None,
+    extract_features: Optional[Callable[[List[int]], List[ResumeFeatures]]] = None,
+) -> Tuple[List[Dict[str, Any]], List[Optional[ResumeFeatures]]]:
+    """
+    calculate_component_scores_structured for the ``top_k`` best resumes,
+    without extracting features for resumes that cannot be among them.
+
+    A cheap pass finds each resume's seed skills (no NER) and the batch's
+    relevance similarities, and feeds score_feature_rows the best case of
+    everything else: every JD skill NER could still credit counted as fully
+    matched, full experience, education and role alignment, the evidence
+    bonus and no penalties. Every step there is monotone, so the result is
+    an upper bound on the final score. The ``top_k`` highest bounds are
+    scored in full; their k-th best score is the cutoff, and only the other
+    resumes whose bound reaches it are scored as well. The rest are
+    screened out with their partial scores (seed-skill skills score,
+    similarity-only relevance), a ``final_score`` of 0 and their bound as
+    ``score_upper_bound``.
+
+    Fully scored resumes get exactly the results a full run gives (the
+    similarities are shared), so the top ``top_k`` match it. Returns results
+    and features aligned with ``resumes_raw``, features None where screened
+    out. ``extract_features`` maps resume indices to their features
+    (default: extract_resume_features_batch).
+    """
+    if extract_features is None:
+        extract_features = lambda indices: extract_resume_features_batch([resumes_raw[i] for i in indices])
+    jd_skills = {normalize_skill(s) for s in jd_skills if isinstance(s, str) and not s.startswith("unknown:")}
+    preferred_skills = {
+        normalize_skill(s) for s in preferred_skills if isinstance(s, str) and not s.startswith("unknown:")
+    }
+    similarity = [float(x) for x in calculate_similarity(job_desc_raw, resumes_raw)]
+    count = len(resumes_raw)
+    results: List[Optional[Dict[str, Any]]] = [None] * count
+    features: List[Optional[ResumeFeatures]] = [None] * count
+
+    def score_fully(indices: List[int]) -> None:
+        if not indices:
+            return
+        batch_features = extract_features(indices)
+        scored = calculate_component_scores_structured(
+            job_desc_clean="",
+            resumes_clean=[],
+            job_desc_raw=job_desc_raw,
+            resumes_raw=[resumes_raw[i] for i in indices],
+            weights=weights,
+            jd_skills=jd_skills,
+            preferred_skills=preferred_skills,
+            experience_cap_years=experience_cap_years,
+            min_years_experience=min_years_experience,
+            required_degree=required_degree,
+            resume_features=batch_features,
+            similarity_scores=[similarity[i] for i in indices],
+        )
+        for i, f, result in zip(indices, batch_features, scored):
+            features[i], results[i] = f, result
+
+    if top_k >= count:
+        score_fully(list(range(count)))
+        return results, features
+
+    # ── Cheap pass: seed skills and the best case of everything else ─────
+    matches = []
+    columns: Dict[str, list] = {name: [] for name in ("req_possible", "pref_possible", "req_seed", "pref_seed")}
+    for raw in resumes_raw:
+        seeds = _seed_skills(raw)
+        expansion = SkillExpansion(seeds)
+        head = raw[:_NER_TEXT_CHARS].lower()
+        required = match_skills(seeds, list(jd_skills), expansion)
+        preferred = match_skills(seeds, list(preferred_skills), expansion)
+        matches.append((required, preferred))
+        columns["req_possible"].append(_possible_credit(required, head))
+        columns["pref_possible"].append(_possible_credit(preferred, head))
+        columns["req_seed"].append(_tier_credit(required))
+        columns["pref_seed"].append(_tier_credit(preferred))
+
+    best_case = {
+        "req_credit": np.array(columns["req_possible"], dtype=np.float64),
+        "pref_credit": np.array(columns["pref_possible"], dtype=np.float64),
+        "years": np.full(count, max(experience_cap_years, min_years_experience or 0.0)),
+        "degree_rank": np.full(count, float(max(DEGREE_ORDER.values()))),
+        "edu_base": np.full(count, max(EDU_SCORES.values())),
+        "similarity": np.array(similarity, dtype=np.float64),
+        "role_alignment": np.ones(count),
+        "skill_only_risk": np.zeros(count, dtype=bool),
+        "evidence_bonus": np.ones(count, dtype=bool),
+        "stack_penalty": np.zeros(count, dtype=bool),
+        "has_jd_language": np.zeros(count, dtype=bool),
+    }
+    seed_only = {
+        **best_case,
+        "req_credit": np.array(columns["req_seed"], dtype=np.float64),
+        "pref_credit": np.array(columns["pref_seed"], dtype=np.float64),
+        "evidence_bonus": np.zeros(count, dtype=bool),
+    }
+    tier_args = (
+        weights, len(jd_skills), len(preferred_skills),
+        experience_cap_years, min_years_experience, required_degree,
+    )
+    bounds = score_feature_rows(best_case, *tier_args)["final_score"]
+    partial = score_feature_rows(seed_only, *tier_args)
+
+    # ── Full scoring for the best bounds, then whatever can still beat them ─
+    order = sorted(range(count), key=lambda i: -bounds[i])
+    score_fully(order[:top_k])
+    cutoff = sorted((results[i]["final_score"] for i in order[:top_k]), reverse=True)[-1]
+    score_fully([i for i in order[top_k:] if bounds[i] >= cutoff])
+
+    for i in range(count):
+        if results[i] is not None:
+            continue
+        required, preferred = matches[i]
+        semantic = round(float(partial["semantic_overlap"][i]) * 100, 1)
+        results[i] = {
+            "final_score":              0.0,   # never computed; see score_upper_bound
+            "score_upper_bound":        bounds[i],
+            "skills_score":             round(float(partial["skills"][i]) * 100, 1),
+            "exp_score":                0.0,
+            "edu_score":                0.0,
+            "relevance_score":          semantic,
+            "semantic_overlap_score":   semantic,
+            "role_alignment_score":     None,
+            "degree":                   None,
+            "years_experience":         None,
+            "experience_str":           "Not evaluated",
+            "missing_required_skills":  required["missing_skills"],
+            "matched_skills":           sorted(set(required["matched_skills"]) | set(required["inferred_skills"])),
+            "matched_preferred_skills": sorted(set(preferred["matched_skills"]) | set(preferred["inferred_skills"])),
+            "confidence_level":         None,
+            "hiring_recommendation":    SCREENED_OUT,
+            "score_summary": (
+                f"{SCREENED_OUT}: scores at most {bounds[i]:.1f}, below the top-{top_k} cutoff of {cutoff:.1f}. "
+                "Skills and relevance are from seed skills and text similarity only."
+            ),
+            "score_concerns":           [],
+            "score_improvements":       [],
+            "screened_out":             True,
+            "signals":                  None,
+        }
+    return results, features
@@ -29,6 +29,65 @@ def get_nlp():
     return _nlp
 
 
+# ── Document analysis ─────────────────────────────────────────
+#
+# Each text goes through spaCy once, with just the components NER needs.
+# tok2vec stays in that pass so the tagger can later read its output from
+# doc.tensor: lemmas are added to the same Doc only when a consumer asks.
+
+ANALYSIS_COMPONENTS = ("tok2vec", "ner")
+LEMMA_COMPONENTS = ("tagger", "attribute_ruler", "lemmatizer")
+
+
+class DocumentAnalysis:
+    """One spaCy Doc for a text; entities from the shared pass, lemmas on demand."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._lemmas: str | None = None
+
+    @property
+    def entities(self):
+        return self.doc.ents
+
+    def lemmas(self) -> str:
+        """Lemmatized text without stop words or punctuation (runs the lemma components once)."""
+        if self._lemmas is None:
+            nlp = get_nlp()
+            doc = self.doc
+            for name in LEMMA_COMPONENTS:
+                if name in nlp.pipe_names:
+                    doc = nlp.get_pipe(name)(doc)
+            tokens = [
+                token.lemma_
+                for token in doc
+                if not (token.is_stop or token.is_punct or token.is_space)
+            ]
+            # _preprocess strips URLs and emails, as clean_text always did; token.like_url
+            # would also drop skills such as "Node.js".
+            self._lemmas = " ".join(_preprocess(" ".join(tokens)).split())
+        return self._lemmas
+
+
+def analyze_texts(texts: list[str], batch_size: int = 32, n_process: int = 1) -> list[DocumentAnalysis]:
+    """One DocumentAnalysis per text, in order, from a single nlp.pipe pass."""
+    nlp = get_nlp()
+    disable = [name for name in nlp.pipe_names if name not in ANALYSIS_COMPONENTS]
+    docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=disable)
+    return [DocumentAnalysis(doc) for doc in docs]
+
+
+def loaded_components() -> dict | None:
+    """spaCy components for /health: None until the model has been loaded."""
+    if _nlp is None:
+        return None
+    return {
+        "loaded": list(_nlp.pipe_names),
+        "analysis_pass": [name for name in _nlp.pipe_names if name in ANALYSIS_COMPONENTS],
+        "on_demand": [name for name in _nlp.pipe_names if name in LEMMA_COMPONENTS],
+    }
+
+
 def _preprocess(text: str) -> str:
     """Lowercase, strip URLs/emails, invisible Unicode artifacts, then remove
     characters that are neither alphabetic nor numeric nor whitespace.
@@ -54,14 +113,7 @@ def clean_text(text: str) -> str:
     """Clean and lemmatize a single text string."""
     if not text:
         return ""
-    nlp = get_nlp()
-    doc = nlp(_preprocess(text))
-    tokens = [
-        token.lemma_
-        for token in doc
-        if not token.is_stop and not token.is_punct and token.text.strip()
-    ]
-    return " ".join(tokens)
+    return analyze_texts([text])[0].lemmas()
 
 
 def clean_texts_batch(texts: list[str]) -> list[str]:
@@ -69,16 +121,4 @@ def clean_texts_batch(texts: list[str]) -> list[str]:
     Clean and lemmatize a list of texts in one spaCy pass.
     3-5x faster than calling clean_text() in a loop.
     """
-    if not texts:
-        return []
-    nlp = get_nlp()
-    preprocessed = [_preprocess(t) for t in texts]
-    results = []
-    for doc in nlp.pipe(preprocessed, batch_size=16):
-        tokens = [
-            token.lemma_
-            for token in doc
-            if not token.is_stop and not token.is_punct and token.text.strip()
-        ]
-        results.append(" ".join(tokens))
-    return results
\ No newline at end of file
+    return [analysis.lemmas() for analysis in analyze_texts(texts)] if texts else []
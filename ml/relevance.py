@@ -0,0 +1,221 @@
+"""
+Relevance vectorizers for calculate_similarity.
+
+Two backends, chosen with set_relevance_backend() (RELEVANCE_BACKEND):
+
+  tfidf    Fitting a TfidfVectorizer on one JD plus a handful of resumes gives
+           noisy IDF weights that move with the batch. A model fitted offline
+           on historical resumes and JDs (scripts/fit_tfidf.py) is loaded once
+           at startup instead, and scans only call ``transform``. Without a
+           model, calculate_similarity fits per scan with the same settings.
+  hashing  Stateless HashingVectorizer: no fit, no vocabulary, float32 output
+           of fixed width. Each text is vectorized on its own, so resume
+           vectors can be built in parallel or ahead of the scan.
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+logger = logging.getLogger(__name__)
+
+# Vectorizer settings shared by the per-scan fit and the offline model.
+TFIDF_PARAMS = dict(
+    stop_words="english",
+    ngram_range=(1, 2),
+    sublinear_tf=True,
+    max_features=20_000,   # cap vocabulary to keep memory bounded
+)
+# Bumped when the saved payload changes shape; older files are ignored.
+TFIDF_MODEL_FORMAT = 1
+
+
+class TfidfModel:
+    """A fitted TfidfVectorizer plus the stamp that identifies it."""
+
+    def __init__(self, vectorizer: TfidfVectorizer, version: str, fitted_at: str, documents: int):
+        self.vectorizer = vectorizer
+        self.version = version
+        self.fitted_at = fitted_at
+        self.documents = documents
+
+    def transform(self, texts: list):
+        return self.vectorizer.transform(texts)
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        joblib.dump({
+            "format": TFIDF_MODEL_FORMAT,
+            "version": self.version,
+            "fitted_at": self.fitted_at,
+            "documents": self.documents,
+            "vectorizer": self.vectorizer,
+        }, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TfidfModel":
+        payload = joblib.load(path)
+        if not isinstance(payload, dict) or payload.get("format") != TFIDF_MODEL_FORMAT:
+            raise ValueError(f"unsupported TF-IDF model format in {path}")
+        return cls(payload["vectorizer"], payload["version"], payload["fitted_at"], payload["documents"])
+
+
+def fit_tfidf_model(documents: Iterable[str], min_df: int = 2) -> TfidfModel:
+    """Fit on a corpus of resumes and JDs; terms in fewer than ``min_df`` documents are dropped."""
+    docs = [d for d in documents if d and d.strip()]
+    vectorizer = TfidfVectorizer(min_df=min_df, **TFIDF_PARAMS)
+    vectorizer.fit(docs)
+
+    # The version is derived from the fitted vocabulary and IDF weights, so
+    # the same corpus always yields the same stamp.
+    digest = hashlib.sha256()
+    for term, index in sorted(vectorizer.vocabulary_.items()):
+        digest.update(f"{term}\t{vectorizer.idf_[index]:.6f}\n".encode("utf-8"))
+    fitted_at = datetime.now(timezone.utc)
+    version = f"tfidf-{fitted_at:%Y%m%d}-{digest.hexdigest()[:8]}"
+    return TfidfModel(vectorizer, version, fitted_at.isoformat(), len(docs))
+
+
+# ── Loaded model ──────────────────────────────────────────────
+
+_model: Optional[TfidfModel] = None
+
+
+def get_tfidf_model() -> Optional[TfidfModel]:
+    """The model loaded at startup, or None (scans then fit per scan)."""
+    return _model
+
+
+def set_tfidf_model(model: Optional[TfidfModel]) -> None:
+    global _model
+    _model = model
+
+
+def load_tfidf_model(path: str) -> Optional[TfidfModel]:
+    """Load ``path`` as the active model; a missing or unreadable file leaves per-scan fitting on."""
+    if not path or not os.path.exists(path):
+        logger.info("No TF-IDF model at %s; fitting per scan", path)
+        set_tfidf_model(None)
+        return None
+    try:
+        model = TfidfModel.load(path)
+    except Exception as exc:
+        logger.warning("Ignoring TF-IDF model at %s: %s", path, exc)
+        set_tfidf_model(None)
+        return None
+    logger.info("TF-IDF model loaded: %s (%d documents)", model.version, model.documents)
+    set_tfidf_model(model)
+    return model
+
+
+# ── Hashing backend ───────────────────────────────────────────
+
+RELEVANCE_BACKENDS = ("tfidf", "hashing")
+
+# 2**18 columns keep bigram collisions rare; a float32 CSR row costs only
+# its non-zero terms, so memory does not grow with the batch.
+HASHING_FEATURES = 2 ** 18
+# Stamp stored with persisted vectors; change it whenever the hashing
+# vectorizer or hash_vectorize changes so stale rows are not compared.
+HASHING_VECTOR_VERSION = "hash-v1-2^18-bigram-sublinear"
+
+_hashing_vectorizer = HashingVectorizer(
+    n_features=HASHING_FEATURES,
+    stop_words=TFIDF_PARAMS["stop_words"],
+    ngram_range=TFIDF_PARAMS["ngram_range"],
+    alternate_sign=False,
+    norm=None,
+    dtype=np.float32,
+)
+
+_backend = "tfidf"
+
+
+def get_relevance_backend() -> str:
+    return _backend
+
+
+def set_relevance_backend(name: str) -> None:
+    global _backend
+    if name not in RELEVANCE_BACKENDS:
+        raise ValueError(f"unknown relevance backend {name!r}; expected one of {RELEVANCE_BACKENDS}")
+    _backend = name
+
+
+def hash_vectorize(texts: list):
+    """
+    L2-normalized float32 CSR rows, one per text, with sublinear term
+    frequency (1 + log tf) as in the TF-IDF backend. Rows do not depend on
+    each other, so vectorizing texts separately or together is the same.
+    """
+    matrix = _hashing_vectorizer.transform(texts)
+    np.log(matrix.data, out=matrix.data)
+    matrix.data += 1
+    return normalize(matrix, norm="l2", copy=False)
+
+
+def encode_vector(row) -> bytes:
+    """A 1 x HASHING_FEATURES row as int32 column indices followed by float32 values."""
+    row = sparse.csr_matrix(row)
+    return row.indices.astype("<i4").tobytes() + row.data.astype("<f4").tobytes()
+
+
+def decode_vector(blob: bytes):
+    """Inverse of encode_vector."""
+    nnz = len(blob) // 8
+    indices = np.frombuffer(blob, dtype="<i4", count=nnz)
+    data = np.frombuffer(blob, dtype="<f4", offset=nnz * 4)
+    return sparse.csr_matrix(
+        (data.astype(np.float32), indices.astype(np.int32), np.array([0, nnz], dtype=np.int32)),
+        shape=(1, HASHING_FEATURES),
+    )
+
+
+class VectorIndex:
+    """
+    Stored relevance rows keyed by resume content hash, stacked into one CSR
+    matrix on the first query after a change so each lookup is a single
+    sparse product. Rows are L2-normalized, so the product is cosine.
+    """
+
+    def __init__(self):
+        self._rows: dict = {}
+        self._keys: list = []
+        self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def add(self, key: str, row) -> None:
+        self._rows[key] = row
+        self._matrix = None
+
+    def remove(self, key: str) -> None:
+        if self._rows.pop(key, None) is not None:
+            self._matrix = None
+
+    def nearest(self, target, n: int, exclude: Optional[str] = None) -> list:
+        """Up to ``n`` (key, cosine) pairs closest to ``target``, best first; ties by key."""
+        if self._matrix is None:
+            self._keys = sorted(self._rows)
+            self._matrix = sparse.vstack([self._rows[key] for key in self._keys]).tocsr() if self._keys else None
+        if self._matrix is None:
+            return []
+        scores = (self._matrix @ target.T).toarray().ravel()
+        k = min(n + 1, len(scores))   # one spare in case ``exclude`` is among them
+        top = sorted(np.argpartition(-scores, k - 1)[:k], key=lambda i: (-scores[i], i))
+        return [(self._keys[i], float(scores[i])) for i in top if self._keys[i] != exclude][:n]
@@ -0,0 +1,107 @@
+"""
+One-pass resume section segmenter.
+
+A SectionScanner compiles every known header phrase into one pattern and
+records, in a single scan, each line that starts with one of them as a
+``(name, start, head, end)`` span:
+
+  name   the longest header phrase the line starts with
+  start  where ``(?:^|\\n)\\s*`` would begin matching it (first newline of
+         the blank run before the line, or 0)
+  head   where the phrase itself starts
+  end    start of the next header span (or the end of the text)
+
+Extractors then ask ResumeSections.find() for a particular header instead of
+running their own ``(?:^|\\n)\\s*{header}...`` regex over the whole text.
+find() reproduces ``re.search`` on ``text[lo:hi]`` exactly, including the
+slice start acting as ``^`` and ``$`` matching at ``hi``, so results are the
+same as the per-header scans it replaces.
+"""
+
+import re
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+# Tails that may follow a header phrase, matched right after it.
+LINE_TAIL = re.compile(r"[\s:.\-_]*(?:\n|$)")   # header alone on its line
+COLON_TAIL = re.compile(r"\s*(?::|$)")          # "Skills:" or header at end of text
+WORD_END = re.compile(r"\b")                     # header followed by a word boundary
+
+_LEADING_SPACE = re.compile(r"\s*")
+
+
+class Section(NamedTuple):
+    name: str
+    start: int
+    head: int
+    end: int
+
+
+class ResumeSections:
+    """Header spans of one text, as found by SectionScanner.scan()."""
+
+    def __init__(self, text: str, spans: List[Section]):
+        self.text = text
+        self.spans = spans
+
+    def find(
+        self,
+        header: str,
+        tail: Optional[re.Pattern] = None,
+        lo: int = 0,
+        hi: Optional[int] = None,
+        text: Optional[str] = None,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        ``(start, end)`` of the first ``(?:^|\\n)\\s*{header}{tail}`` match in
+        ``text[lo:hi]``, in absolute offsets, or None.
+
+        ``header`` must be one of the scanner's phrases. ``text`` may be a
+        same-length rewrite of the scanned text (e.g. with dashes normalized);
+        the tail is matched against it.
+        """
+        text = self.text if text is None else text
+        hi = len(text) if hi is None else hi
+        # The slice start matches ``^`` whether or not a newline precedes it.
+        first = _LEADING_SPACE.match(text, lo, hi).end()
+        end = self._match_at(text, header, tail, first, hi)
+        if end is not None:
+            return lo, end
+        for span in self.spans:
+            if span.start < lo:
+                continue
+            if span.head >= hi:
+                break
+            if span.name.startswith(header):
+                end = self._match_at(text, header, tail, span.head, hi)
+                if end is not None:
+                    return span.start, end
+        return None
+
+    def has(self, headers: Iterable[str], tail: Optional[re.Pattern] = None) -> bool:
+        """True when any line of the text starts with one of ``headers`` (+ ``tail``)."""
+        return any(self.find(header, tail) is not None for header in headers)
+
+    @staticmethod
+    def _match_at(text: str, header: str, tail: Optional[re.Pattern], pos: int, hi: int) -> Optional[int]:
+        if not text.startswith(header, pos, hi):
+            return None
+        pos += len(header)
+        if tail is None:
+            return pos
+        m = tail.match(text, pos, hi)
+        return m.end() if m else None
+
+
+class SectionScanner:
+    """Compiled header vocabulary; scan() segments a (lowercased) text in one pass."""
+
+    def __init__(self, headers: Iterable[str]):
+        phrases = sorted(set(headers), key=len, reverse=True)   # longest phrase wins
+        self._pattern = re.compile(r"(?:^|\n)\s*(" + "|".join(map(re.escape, phrases)) + ")")
+
+    def scan(self, text: str) -> ResumeSections:
+        found = [(m.group(1), m.start(), m.start(1)) for m in self._pattern.finditer(text)]
+        ends = [start for _, start, _ in found[1:]] + [len(text)]
+        return ResumeSections(
+            text, [Section(name, start, head, end) for (name, start, head), end in zip(found, ends)]
+        )
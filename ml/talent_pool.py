@@ -0,0 +1,104 @@
+"""
+Talent pool index: shortlist stored resumes against a new JD without scoring them all.
+
+Each pooled resume is posted under every skill it has, implies through the
+inference graph, or satisfies as a group ("nosql database" via mongodb), keyed
+by SKILL_VOCAB ID (skills outside the vocabulary by name). A JD then touches
+only the postings of its own skills: a vectorized pass gives every matching
+resume the skills sub-score's tier weights (0.85 required, 0.15 preferred),
+and the best ``n`` go on to calculate_component_scores_structured.
+
+The shortlist is recall-oriented: it ignores experience, education and
+relevance, so callers shortlist well beyond the number of results they show.
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from pipeline.skills import SKILL_VOCAB, SkillExpansion, normalize_skill
+
+# Share of the skills sub-score carried by each JD tier (see score_feature_rows).
+REQUIRED_TIER_WEIGHT = 0.85
+PREFERRED_TIER_WEIGHT = 0.15
+
+PostingKey = Union[int, str]
+
+
+def _posting_key(skill: str) -> PostingKey:
+    skill_id = SKILL_VOCAB.id(skill)
+    return skill if skill_id is None else skill_id
+
+
+class TalentPool:
+    """Inverted index from skill ID to pooled resumes (entries keyed by content hash)."""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self._entries: Dict[str, int] = {}
+        self._removed: List[int] = []                     # entries replaced or deleted
+        self._postings: Dict[PostingKey, array] = {}      # int32 entries: ~4 bytes per posting
+        self._arrays: Dict[PostingKey, np.ndarray] = {}   # postings as int32, built on demand
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def add(self, key: str, skills: Iterable[str]) -> None:
+        """Index a resume's skills; re-adding a key replaces its entry."""
+        self.remove(key)
+        entry = len(self.keys)
+        self.keys.append(key)
+        self._entries[key] = entry
+        expansion = SkillExpansion(skills)
+        for skill in expansion.expanded | expansion.satisfied_groups:
+            posting = _posting_key(skill)
+            self._postings.setdefault(posting, array("i")).append(entry)
+            self._arrays.pop(posting, None)
+
+    def remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._removed.append(entry)   # postings are filtered at query time
+
+    def _posting_array(self, posting: PostingKey) -> Optional[np.ndarray]:
+        entries = self._arrays.get(posting)
+        if entries is None and posting in self._postings:
+            entries = self._arrays[posting] = np.frombuffer(self._postings[posting], dtype=np.int32).copy()
+        return entries
+
+    def shortlist(self, required: Iterable[str], preferred: Iterable[str], n: int) -> List[str]:
+        """
+        Keys of up to ``n`` resumes with the highest tier-weighted JD skill
+        coverage, best first (ties keep insertion order). Resumes matching no
+        JD skill are never shortlisted.
+        """
+        required = {normalize_skill(s) for s in required if s and not s.startswith("unknown:")}
+        preferred = {normalize_skill(s) for s in preferred if s and not s.startswith("unknown:")} - required
+        ids, weights = [], []
+        for tier, tier_weight in ((required, REQUIRED_TIER_WEIGHT), (preferred, PREFERRED_TIER_WEIGHT)):
+            for skill in tier:
+                entries = self._posting_array(_posting_key(skill))
+                if entries is not None:
+                    ids.append(entries)
+                    weights.append(np.full(len(entries), tier_weight / len(tier), dtype=np.float64))
+        if not ids or n <= 0:
+            return []
+
+        scores = np.bincount(np.concatenate(ids), weights=np.concatenate(weights), minlength=len(self.keys))
+        scores[self._removed] = 0.0
+        hits = np.flatnonzero(scores)
+        if len(hits) > n:
+            # Everything above the n-th best score, then ties in insertion order.
+            threshold = np.partition(scores[hits], len(hits) - n)[len(hits) - n]
+            above = hits[scores[hits] > threshold]
+            ties = hits[scores[hits] == threshold][:n - len(above)]
+            hits = np.concatenate([above, ties])
+        order = hits[np.lexsort((hits, -scores[hits]))]
+        return [self.keys[i] for i in order]
@@ -1,4 +1,7 @@
+import heapq
 import re
+from functools import lru_cache
+from types import MappingProxyType
 
 # ── Skills Database (moved from ml.matcher to avoid circular imports) ────────
 
@@ -264,22 +267,222 @@ SKILL_INFERENCE = {
 
 
 # ── Normalization ─────────────────────────────────────────────
+#
+# Aliases are applied first, then synonyms; the first SKILL_SYNONYMS entry
+# naming a skill (as main or variant) wins. Both steps are folded into one
+# read-only index at import so normalisation is a single lookup.
 
-def normalize_skill(skill):
-    skill = skill.lower().strip()
-    skill = SKILL_ALIASES.get(skill, skill)
-
+def _build_canonical_index() -> MappingProxyType:
+    synonyms: dict[str, str] = {}
     for main, variants in SKILL_SYNONYMS.items():
-        if skill == main or skill in variants:
-            return main
+        for name in (main, *variants):
+            synonyms.setdefault(name, main)
+    index = dict(synonyms)
+    for alias, target in SKILL_ALIASES.items():
+        index[alias] = synonyms.get(target, target)
+    return MappingProxyType(index)
+
 
-    return skill
+_CANONICAL_SKILLS = _build_canonical_index()
+
+
+@lru_cache(maxsize=4096)
+def normalize_skill(skill):
+    skill = skill.lower().strip()
+    return _CANONICAL_SKILLS.get(skill, skill)
 
 
 def extract_skills(skill_list):
     return list(set(normalize_skill(s) for s in skill_list))
 
 
+# ── Inference closure ─────────────────────────────────────────
+#
+# SKILL_INFERENCE folded into per-hop lookup tables at import.
+# Inference follows at most two hops (next.js → react → html); a skill
+# reachable in one hop never takes a two-hop weight, and each implied skill
+# keeps the best confidence among the edges that reach it.
+
+def _build_inference_closure():
+    hop1 = {skill: MappingProxyType(dict(implied)) for skill, implied in SKILL_INFERENCE.items()}
+    hop2 = {}
+    for skill, direct in SKILL_INFERENCE.items():
+        second: dict[str, float] = {}
+        for via in direct:
+            for implied, weight in SKILL_INFERENCE.get(via, {}).items():
+                if implied != skill and implied not in direct:
+                    second[implied] = max(second.get(implied, 0), weight)
+        hop2[skill] = MappingProxyType(second)
+    return MappingProxyType(hop1), MappingProxyType(hop2)
+
+
+_INFERENCE_HOP1, _INFERENCE_HOP2 = _build_inference_closure()
+
+
+# ── Skill vocabulary ──────────────────────────────────────────
+#
+# Every canonical name the tables above can produce gets a stable integer ID
+# (its rank in sorted order), so a skill set is an int bitmask: intersection
+# is ``a & b`` and overlap size ``(a & b).bit_count()``. Free-form names (NER
+# hits, explicit JD tags outside the seed) have no ID and ride along in
+# SkillSet.extra, which keeps every set operation exact.
+
+class SkillVocabulary:
+    """Canonical skill name ↔ integer ID, plus mask encode/decode."""
+
+    def __init__(self, names):
+        self.names = tuple(sorted(set(names)))
+        self._ids = MappingProxyType({name: i for i, name in enumerate(self.names)})
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def id(self, name):
+        return self._ids.get(name)
+
+    def mask(self, names) -> int:
+        bits = 0
+        for name in names:
+            i = self._ids.get(name)
+            if i is not None:
+                bits |= 1 << i
+        return bits
+
+    def decode(self, mask: int) -> list:
+        """Names for the set bits, in ID (= alphabetical) order."""
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self.names[low.bit_length() - 1])
+            mask ^= low
+        return names
+
+
+def _vocabulary_names() -> set:
+    names = set(SKILLS_SEED) | set(_CANONICAL_SKILLS) | set(_CANONICAL_SKILLS.values())
+    names |= set(SKILL_GROUPS) | set().union(*SKILL_GROUPS.values())
+    names |= set(SKILL_INFERENCE) | set().union(*SKILL_INFERENCE.values())
+    return names
+
+
+SKILL_VOCAB = SkillVocabulary(_vocabulary_names())
+
+
+class SkillSet:
+    """Immutable skill set: vocabulary names as a bitmask, anything else in ``extra``."""
+
+    __slots__ = ("mask", "extra")
+
+    def __init__(self, mask: int = 0, extra: frozenset = frozenset()):
+        self.mask = mask
+        self.extra = extra
+
+    @classmethod
+    def of(cls, names) -> "SkillSet":
+        if isinstance(names, SkillSet):
+            return names
+        mask = 0
+        extra = []
+        ids = SKILL_VOCAB._ids
+        for name in names:
+            i = ids.get(name)
+            if i is None:
+                extra.append(name)
+            else:
+                mask |= 1 << i
+        return cls(mask, frozenset(extra))
+
+    def overlap(self, other: "SkillSet") -> int:
+        """``len(self & other)`` without building the intersection."""
+        count = (self.mask & other.mask).bit_count()
+        if self.extra and other.extra:
+            count += len(self.extra & other.extra)
+        return count
+
+    def __and__(self, other):
+        return SkillSet(self.mask & other.mask, self.extra & other.extra)
+
+    def __or__(self, other):
+        return SkillSet(self.mask | other.mask, self.extra | other.extra)
+
+    def __contains__(self, name):
+        i = SKILL_VOCAB.id(name)
+        return name in self.extra if i is None else bool(self.mask >> i & 1)
+
+    def __len__(self):
+        return self.mask.bit_count() + len(self.extra)
+
+    def __iter__(self):
+        return iter(self.sorted())
+
+    def __eq__(self, other):
+        return isinstance(other, SkillSet) and self.mask == other.mask and self.extra == other.extra
+
+    def __hash__(self):
+        return hash((self.mask, self.extra))
+
+    def __repr__(self):
+        return f"SkillSet({self.sorted()!r})"
+
+    def sorted(self) -> list:
+        return list(heapq.merge(SKILL_VOCAB.decode(self.mask), sorted(self.extra)))
+
+
+# skill group concept → mask of the skills that satisfy it
+_GROUP_MASKS = MappingProxyType({group: SKILL_VOCAB.mask(members) for group, members in SKILL_GROUPS.items()})
+
+
+class SkillExpansion:
+    """A candidate's skills plus everything they imply; shared by every JD tier."""
+
+    def __init__(self, candidate_skills):
+        self.skills = set(extract_skills(candidate_skills))
+        hop1: dict[str, float] = {}
+        for skill in self.skills:
+            for implied, weight in _INFERENCE_HOP1.get(skill, {}).items():
+                if implied not in self.skills and weight > hop1.get(implied, 0):
+                    hop1[implied] = weight
+        hop2: dict[str, float] = {}
+        for skill in self.skills:
+            for implied, weight in _INFERENCE_HOP2.get(skill, {}).items():
+                if implied not in self.skills and implied not in hop1 and weight > hop2.get(implied, 0):
+                    hop2[implied] = weight
+        self.inferred_weights = {**hop1, **hop2}
+        self.expanded = self.skills | self.inferred_weights.keys()
+        self.bits = SkillSet.of(self.skills)
+        expanded_mask = self.bits.mask | SKILL_VOCAB.mask(self.inferred_weights)
+        self.satisfied_groups = frozenset(
+            group for group, members in _GROUP_MASKS.items() if members & expanded_mask
+        )
+
+
+# Every name normalize_skill knows, as written before and after aliasing.
+_KNOWN_NAMES = frozenset(_CANONICAL_SKILLS) | frozenset(_CANONICAL_SKILLS.values()) | frozenset(SKILL_ALIASES.values())
+
+
+@lru_cache(maxsize=1024)
+def crediting_names(skill: str) -> frozenset:
+    """
+    Every lowercase name that, extracted from a resume (and passed through
+    SKILL_ALIASES like any extracted skill), could earn ``skill`` credit in
+    match_skills: the skill itself, anything implying it within two hops,
+    the members of the group it names, and the aliases and synonyms of all
+    of those. A superset, used to bound what a resume can still match.
+    """
+    skill = normalize_skill(skill)
+    targets = {skill} | SKILL_GROUPS.get(skill, set())
+    sources = set(targets)
+    for name, implied in _INFERENCE_HOP1.items():
+        if targets & (implied.keys() | _INFERENCE_HOP2[name].keys()):
+            sources.add(name)
+    return frozenset(sources) | frozenset(
+        name for name in _KNOWN_NAMES if normalize_skill(SKILL_ALIASES.get(name, name)) in sources
+    )
+
+
 # ── JD Skill Extraction ───────────────────────────────────────
 #
 # PRIMARY:  Match against SKILLS_SEED (curated, precision-first).
@@ -535,12 +738,14 @@ def extract_jd_skill_tiers(
     }
 
 
-def match_skills(candidate_skills, jd_skills):
+def match_skills(candidate_skills, jd_skills, expansion: SkillExpansion | None = None):
     """
     Compare candidate skills against JD skills, using the inference graph
     to credit implied skills.
 
     Supports two-hop inference chains (e.g. next.js → react → html/css).
+    Pass a precomputed ``expansion`` to reuse one candidate's inference
+    across several JD tiers (``candidate_skills`` is then ignored).
 
     Returns
     -------
@@ -552,7 +757,9 @@ def match_skills(candidate_skills, jd_skills):
         "inference_weights": {...},  # skill → best confidence weight
     }
     """
-    candidate_skills = extract_skills(candidate_skills)
+    if expansion is None:
+        expansion = SkillExpansion(candidate_skills)
+    candidate_skills = expansion.skills
 
     # Separate known vs unknown JD skills
     known_jd = []
@@ -567,26 +774,11 @@ def match_skills(candidate_skills, jd_skills):
                 seen_known_jd.add(normalized)
                 known_jd.append(normalized)
 
-    # ── Build expanded skill set via inference (2-pass for chains) ───────────
-    expanded = set(candidate_skills)
-    inferred_weights: dict = {}
-
-    for _pass in range(2):
-        for skill in list(expanded):
-            if skill in SKILL_INFERENCE:
-                for implied_skill, weight in SKILL_INFERENCE[skill].items():
-                    if implied_skill not in expanded:
-                        inferred_weights[implied_skill] = max(
-                            inferred_weights.get(implied_skill, 0), weight
-                        )
-                        expanded.add(implied_skill)
+    inferred_weights = dict(expansion.inferred_weights)
 
     # ── Classify each JD skill ────────────────────────────────
     def group_weight(skill_norm: str) -> float:
-        group = SKILL_GROUPS.get(skill_norm)
-        if not group:
-            return 0.0
-        return 1.0 if expanded & group else 0.0
+        return 1.0 if skill_norm in expansion.satisfied_groups else 0.0
 
     matched = []
     inferred_only = []
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: near-duplicate detection (ml.dedupe) against the scoring it
+saves.
+
+Builds a batch of synthetic resumes in which a share are re-submissions of
+an earlier one with a few words edited, then times MinHash signatures plus
+grouping through an LshIndex (what score_uploads runs per resume) against
+feature extraction plus structured scoring of the same batch (NER when a
+spaCy model is installed). Grouping is checked against the known copies:
+precision is the share of flagged resumes that really are copies, recall
+the share of copies that were flagged.
+
+Usage
+-----
+  python scripts/bench_dedupe.py [--resumes 500] [--copies 0.2] [--edits 1 3 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ml.dedupe import LshIndex, minhash_signature  # noqa: E402
+from ml.matcher import calculate_component_scores_structured, extract_resume_features_batch  # noqa: E402
+
+JD = "Backend engineer: Python, FastAPI and PostgreSQL required; Docker and Redis a plus. 3+ years, Bachelor's."
+REQUIRED, PREFERRED = {"python", "fastapi", "postgresql"}, {"docker", "redis"}
+WEIGHTS = {"skills": 0.5, "experience": 0.25, "education": 0.1, "relevance": 0.15}
+SKILLS = ["python", "fastapi", "postgresql", "docker", "redis", "django", "react", "aws", "kafka", "go"]
+WORDS = ("designed built migrated scaled owned reviewed mentored automated services pipelines dashboards "
+         "billing search payments onboarding latency throughput costs reliability incidents customers").split()
+
+
+def synthetic_resume(rng: random.Random, n: int) -> str:
+    skills = rng.sample(SKILLS, rng.randint(3, 7))
+    start = rng.randint(2008, 2022)
+    bullets = "\n".join(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 18))) + f" with {rng.choice(skills)}."
+        for _ in range(12)
+    )
+    return (
+        f"Candidate {n}\ncandidate{n}@example.com\nSUMMARY\nEngineer working with {', '.join(skills)}.\n"
+        f"EXPERIENCE\nSoftware Engineer, Jan {start} - Present\n{bullets}\n"
+        f"EDUCATION\nB.Tech in Computer Science {start - 1}\nSKILLS\n{', '.join(skills)}\n"
+    )
+
+
+def edited(rng: random.Random, text: str, edits: int) -> str:
+    words = text.split(" ")
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--copies", type=float, default=0.2, help="fraction of resumes that re-submit an earlier one")
+    parser.add_argument("--edits", type=int, nargs="+", default=[1, 3, 5], help="words changed per copy")
+    args = parser.parse_args()
+
+    print(f"{'edits':>5}  {'copies':>6}  {'dedupe':>9}  {'features + scoring':>18}  {'ratio':>7}  "
+          f"{'precision':>9}  {'recall':>6}")
+    for edits in args.edits:
+        rng = random.Random(5)
+        resumes, copy_of = [], []
+        for n in range(args.resumes):
+            if resumes and rng.random() < args.copies:
+                source = rng.randrange(len(resumes))
+                resumes.append(edited(rng, resumes[source], edits))
+                copy_of.append(copy_of[source] if copy_of[source] is not None else source)
+            else:
+                resumes.append(synthetic_resume(rng, n))
+                copy_of.append(None)
+
+        start = time.perf_counter()
+        index, owner = LshIndex(), []
+        for i, text in enumerate(resumes):
+            signature = minhash_signature(text)
+            matches = index.near_duplicates(signature)
+            if matches:
+                owner.append(owner[int(matches[0][0])])
+            else:
+                owner.append(i)
+                index.add(str(i), signature)
+        t_dedupe = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        features = extract_resume_features_batch(resumes)
+        calculate_component_scores_structured(
+            job_desc_clean="", resumes_clean=[], job_desc_raw=JD, resumes_raw=resumes, weights=WEIGHTS,
+            jd_skills=REQUIRED, preferred_skills=PREFERRED, resume_features=features,
+        )
+        t_score = (time.perf_counter() - start) * 1000
+
+        flagged = {i for i, o in enumerate(owner) if o != i}
+        copies = {i for i, c in enumerate(copy_of) if c is not None}
+        precision = len(flagged & copies) / len(flagged) if flagged else 1.0
+        recall = len(flagged & copies) / len(copies) if copies else 1.0
+        print(f"{edits:>5}  {len(copies):>6}  {t_dedupe:>6.1f} ms  {t_score:>15.1f} ms  "
+              f"{t_dedupe / t_score:>6.1%}  {precision:>9.2f}  {recall:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
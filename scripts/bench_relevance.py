@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: relevance backends in ml.matcher.calculate_similarity.
+
+Scores synthetic resumes against synthetic JDs with the per-scan TF-IDF fit
+(no corpus model loaded) and with the hashing backend, and prints how far the
+two rankings agree (Kendall tau, top-5 overlap) and how long each takes at
+several batch sizes. For hashing, "precomputed" times only the JD side, as in
+a scan whose resume vectors were built during feature extraction.
+
+Usage
+-----
+  python scripts/bench_relevance.py [--sizes 10 100 1000] [--jds 20] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from scipy.stats import kendalltau
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ml.matcher import calculate_similarity  # noqa: E402
+from ml.relevance import hash_vectorize, set_tfidf_model  # noqa: E402
+
+TOPICS = {
+    "backend":  "python django fastapi postgresql redis rest apis microservices docker kubernetes",
+    "frontend": "react typescript javascript css html redux next.js accessibility webpack",
+    "data":     "spark airflow sql etl pipelines snowflake dbt kafka data warehouse",
+    "ml":       "machine learning pytorch tensorflow model training feature engineering nlp",
+    "devops":   "terraform aws ci/cd github actions monitoring prometheus linux ansible",
+    "mobile":   "kotlin swift android ios mobile apps flutter push notifications",
+}
+FILLER = (
+    "led team shipped features production improved latency reviewed code mentored "
+    "interns wrote documentation owned roadmap partnered stakeholders delivered projects"
+).split()
+
+
+def synthetic_text(rng: random.Random, words: int, topic_share: float) -> tuple[str, str]:
+    main = rng.choice(list(TOPICS))
+    other = rng.choice(list(TOPICS))
+    out = []
+    for _ in range(words):
+        r = rng.random()
+        if r < topic_share:
+            out.append(rng.choice(TOPICS[main].split()))
+        elif r < topic_share + 0.1:
+            out.append(rng.choice(TOPICS[other].split()))
+        else:
+            out.append(rng.choice(FILLER))
+    return main, " ".join(out)
+
+
+def top_overlap(a: list, b: list, k: int = 5) -> float:
+    top = lambda scores: set(sorted(range(len(scores)), key=lambda i: -scores[i])[:k])
+    return len(top(a) & top(b)) / min(k, len(a))
+
+
+def bench(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--jds", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    set_tfidf_model(None)   # compare against the per-scan fit
+    rng = random.Random(42)
+    print(f"{'resumes':>8}  {'kendall tau':>11}  {'top-5':>6}  {'tfidf':>10}  {'hashing':>10}  {'precomputed':>11}")
+    for size in args.sizes:
+        resumes = [synthetic_text(rng, 400, 0.35)[1] for _ in range(size)]
+        jds = [synthetic_text(rng, 120, 0.5)[1] for _ in range(args.jds)]
+        vectors = [hash_vectorize([r]) for r in resumes]
+
+        taus, overlaps = [], []
+        for jd in jds:
+            tfidf = calculate_similarity(jd, resumes, backend="tfidf")
+            hashed = calculate_similarity(jd, resumes, backend="hashing")
+            if calculate_similarity(jd, resumes, vectors, backend="hashing") != hashed:
+                sys.exit("precomputed resume vectors score differently")
+            taus.append(kendalltau(tfidf, hashed).statistic)
+            overlaps.append(top_overlap(tfidf, hashed))
+
+        jd = jds[0]
+        t_tfidf = bench(lambda: calculate_similarity(jd, resumes, backend="tfidf"), args.repeat)
+        t_hash = bench(lambda: calculate_similarity(jd, resumes, backend="hashing"), args.repeat)
+        t_pre = bench(lambda: calculate_similarity(jd, resumes, vectors, backend="hashing"), args.repeat)
+        print(f"{size:>8}  {sum(taus) / len(taus):>11.3f}  {sum(overlaps) / len(overlaps):>6.2f}  "
+              f"{t_tfidf:>7.1f} ms  {t_hash:>7.1f} ms  {t_pre:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
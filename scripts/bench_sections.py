@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: header lookups on long resumes.
+
+Compares the old per-header regex scans used by the experience, ATS and
+evidence extractors (kept below for comparison) with one SectionScanner pass
+plus ResumeSections.find()/has(), checks both agree, and prints timings for
+synthetic resumes of several page counts.
+
+Usage
+-----
+  python scripts/bench_sections.py [--pages 2 10 60] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ml.matcher import (  # noqa: E402
+    _SECTION_SCANNER, ATS_SECTION_HEADERS, EXPERIENCE_HEADERS, PROJECT_EVIDENCE_HEADERS,
+    SKILLS_ONLY_HEADERS, STOP_HEADERS,
+)
+from ml.sections import COLON_TAIL, LINE_TAIL, WORD_END  # noqa: E402
+
+FILLER = [
+    "built data pipelines in python and sql for reporting",
+    "led a team of four engineers shipping weekly releases",
+    "software engineer, acme corp (mar 2019 - jun 2022)",
+    "reduced api latency by 40% with caching and profiling",
+    "mentored interns and reviewed pull requests",
+]
+PAGE_HEADERS = ["projects", "experience", "education", "skills:", "certifications", "awards", "publications"]
+
+
+def legacy(text_l: str) -> tuple:
+    """The extractors' header searches before the segmenter, kept here for comparison."""
+    start = None
+    for h in EXPERIENCE_HEADERS:
+        m = re.search(rf"(?:^|\n)\s*{re.escape(h)}[\s:.\-_]*(?:\n|$)", text_l)
+        if m:
+            start = m.end()
+            break
+    end = len(text_l)
+    if start is not None:
+        for h in STOP_HEADERS:
+            m = re.search(rf"(?:^|\n)\s*{re.escape(h)}\s*(?::|$)", text_l[start:])
+            if m and start + m.start() > start:
+                end = min(end, start + m.start())
+    ats = tuple(
+        any(re.search(rf"(?:^|\n)\s*{kw}", text_l) for kw in keywords)
+        for keywords in ATS_SECTION_HEADERS.values()
+    )
+    has_project = bool(re.search(r"(?m)^\s*(projects?|portfolio|experience|work experience|employment)\b", text_l))
+    has_skills = bool(re.search(r"(?m)^\s*skills?\b", text_l))
+    return start, end, ats, has_project, has_skills
+
+
+def segmented(text_l: str) -> tuple:
+    sections = _SECTION_SCANNER.scan(text_l)
+    header = next((found for h in EXPERIENCE_HEADERS if (found := sections.find(h, LINE_TAIL))), None)
+    start = header[1] if header else None
+    end = len(text_l)
+    if start is not None:
+        for h in STOP_HEADERS:
+            found = sections.find(h, COLON_TAIL, lo=start)
+            if found and found[0] > start:
+                end = min(end, found[0])
+    ats = tuple(sections.has(keywords) for keywords in ATS_SECTION_HEADERS.values())
+    return (
+        start, end, ats,
+        sections.has(PROJECT_EVIDENCE_HEADERS, WORD_END),
+        sections.has(SKILLS_ONLY_HEADERS, WORD_END),
+    )
+
+
+def synthetic_resume(pages: int, seed: int = 7) -> str:
+    """Roughly 3k characters per page, a few section headers on each."""
+    rng = random.Random(seed)
+    lines = ["jane doe", "summary", "backend engineer"]
+    for _ in range(pages):
+        for _ in range(3):
+            lines.append(rng.choice(PAGE_HEADERS))
+            lines.extend(rng.choice(FILLER) for _ in range(15))
+    return "\n".join(lines)
+
+
+def bench(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 10, 60])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6}  {'chars':>8}  {'per-header':>11}  {'segmented':>10}  speedup")
+    for pages in args.pages:
+        text = synthetic_resume(pages)
+        if legacy(text) != segmented(text):
+            sys.exit(f"{pages} pages: segmenter disagrees with the per-header scans")
+        before = bench(legacy, text, args.repeat)
+        after = bench(segmented, text, args.repeat)
+        print(f"{pages:>6}  {len(text):>8}  {before:>8.3f} ms  {after:>7.3f} ms  {before / after:6.1f}x")
+    print("identical lookups at every size (includes the segmenting pass)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: seed-skill matching in ml.matcher.extract_skills.
+
+Compares the old approach (one regex per SKILLS_SEED entry, rebuilt on every
+call) with the compiled single-pass matcher, checks both return identical
+skill sets, and prints per-resume timings. spaCy NER is not involved.
+
+Usage
+-----
+  python scripts/bench_skill_matcher.py [--resumes 200] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ml.matcher import _normalize, _skill_matcher  # noqa: E402
+from pipeline.skills import SKILLS_SEED  # noqa: E402
+
+FILLER = (
+    "Led a team of engineers and shipped features to production. Improved latency, "
+    "wrote documentation, reviewed code and mentored interns across quarterly releases. "
+).split()
+
+
+def per_seed_regex(norm: str) -> set:
+    """extract_skills before the compiled matcher, kept here for comparison."""
+    found = set()
+    for skill in SKILLS_SEED:
+        ns = _normalize(skill)
+        if len(ns.replace(" ", "")) <= 3:
+            pat = rf"(?:^|\s){re.escape(ns)}(?:$|[\s,./])"
+        else:
+            pat = rf"\b{re.escape(ns)}\b"
+        if re.search(pat, norm):
+            found.add(skill)
+    return found
+
+
+def synthetic_resumes(count: int, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    skills = sorted(SKILLS_SEED)
+    resumes = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(300, 900))]
+        for _ in range(rng.randint(10, 40)):
+            words.insert(rng.randrange(len(words)), rng.choice(skills) + rng.choice([",", "", "."]))
+        resumes.append(" ".join(words))
+    return resumes
+
+
+def bench(fn, texts: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000 / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = [_normalize(r) for r in synthetic_resumes(args.resumes)]
+    mismatches = sum(per_seed_regex(t) != _skill_matcher.find(t) for t in texts)
+    if mismatches:
+        sys.exit(f"{mismatches} resumes matched differently")
+
+    before = bench(per_seed_regex, texts, args.repeat)
+    after = bench(_skill_matcher.find, texts, args.repeat)
+    print(f"{len(SKILLS_SEED)} seed skills, {len(texts)} resumes, identical results")
+    print(f"  per-seed regex   {before:8.3f} ms/resume")
+    print(f"  compiled matcher {after:8.3f} ms/resume   ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
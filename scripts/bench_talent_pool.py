@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: POST /pool/match shortlisting with ml.talent_pool.TalentPool.
+
+Builds synthetic pools of resumes (skills drawn from a few role topics plus
+noise), then for several JDs times the index query and the full structured
+scoring of the shortlist it returns. Up to --brute-max resumes, the whole
+pool is also scored and the script reports how many of the brute-force
+top-K the shortlist kept (recall) next to the brute-force time.
+
+Resume features are built from text with the skills given, as they are when
+rebuilt from stored features, so no NER runs in either path.
+
+Usage
+-----
+  python scripts/bench_talent_pool.py [--sizes 10000 100000] [--shortlist 200] [--top-k 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ml.matcher import ResumeFeatures, calculate_component_scores_structured  # noqa: E402
+from ml.talent_pool import TalentPool  # noqa: E402
+from pipeline.skills import SKILL_VOCAB  # noqa: E402
+
+TOPICS = {
+    "backend":  "python django fastapi postgresql redis docker kubernetes java spring boot go",
+    "frontend": "react typescript javascript css html redux next.js vue angular webpack",
+    "data":     "spark airflow sql snowflake dbt kafka pandas python hadoop tableau",
+    "ml":       "machine learning pytorch tensorflow scikit-learn nlp python pandas numpy",
+    "devops":   "terraform aws ci/cd jenkins prometheus linux ansible docker kubernetes gcp",
+    "mobile":   "kotlin swift android ios flutter react native firebase java",
+}
+WEIGHTS = {"skills": 0.5, "experience": 0.25, "education": 0.1, "relevance": 0.15}
+
+
+def topic_skills(topic: str) -> list:
+    words = TOPICS[topic].split()
+    skills, i = [], 0
+    while i < len(words):   # greedily join multi-word skills ("spring boot", "react native")
+        for size in (3, 2, 1):
+            name = " ".join(words[i:i + size])
+            if name in SKILL_VOCAB or size == 1:
+                skills.append(name)
+                i += size
+                break
+    return [s for s in skills if s in SKILL_VOCAB]
+
+
+def synthetic_resume(rng: random.Random, vocab: list) -> tuple[str, list]:
+    main = topic_skills(rng.choice(list(TOPICS)))
+    skills = set(rng.sample(main, rng.randint(2, len(main))))
+    skills.update(rng.sample(vocab, rng.randint(0, 6)))
+    skills = sorted(skills)
+    start = rng.randint(2008, 2022)
+    text = (
+        f"SKILLS\n{', '.join(skills)}\n"
+        f"EXPERIENCE\nSoftware Engineer, Jan {start} - Present\n"
+        f"Built services with {' and '.join(skills[:3])}, improved latency {rng.randint(10, 60)}%.\n"
+        "EDUCATION\nB.Tech in Computer Science\n"
+    )
+    return text, skills
+
+
+def score(jd: str, required: set, preferred: set, texts: list, skills: list) -> list:
+    features = [ResumeFeatures(text, skills=s) for text, s in zip(texts, skills)]
+    rows = calculate_component_scores_structured(
+        job_desc_clean="", resumes_clean=[], job_desc_raw=jd, resumes_raw=texts, weights=WEIGHTS,
+        jd_skills=required, preferred_skills=preferred, resume_features=features,
+    )
+    return [row["final_score"] for row in rows]
+
+
+def top(scores: list, k: int) -> list:
+    return sorted(range(len(scores)), key=lambda i: -scores[i])[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--shortlist", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--jds", type=int, default=10)
+    parser.add_argument("--brute-max", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocab = list(SKILL_VOCAB.names)
+    jds = []
+    for topic in list(TOPICS)[:args.jds] * (args.jds // len(TOPICS) + 1):
+        skills = topic_skills(topic)
+        required, preferred = set(skills[:4]), set(skills[4:6])
+        jd = f"Hiring a {topic} engineer. Required: {', '.join(sorted(required))}. Nice to have: {', '.join(sorted(preferred))}."
+        jds.append((jd, required, preferred))
+    jds = jds[:args.jds]
+
+    print(f"{'resumes':>8}  {'index build':>11}  {'shortlist':>10}  {'score shortlist':>15}  "
+          f"{'total':>9}  {'brute force':>11}  {'top-k recall':>12}")
+    for size in args.sizes:
+        resumes = [synthetic_resume(rng, vocab) for _ in range(size)]
+        start = time.perf_counter()
+        pool = TalentPool()
+        for i, (_, skills) in enumerate(resumes):
+            pool.add(str(i), skills)
+        t_build = time.perf_counter() - start
+
+        t_short = t_score = 0.0
+        recalls, t_brute = [], None
+        for jd, required, preferred in jds:
+            start = time.perf_counter()
+            shortlist = [int(key) for key in pool.shortlist(required, preferred, args.shortlist)]
+            t_short += time.perf_counter() - start
+
+            start = time.perf_counter()
+            scores = score(jd, required, preferred, [resumes[i][0] for i in shortlist], [resumes[i][1] for i in shortlist])
+            picked = {shortlist[i] for i in top(scores, args.top_k)}
+            t_score += time.perf_counter() - start
+
+            if size <= args.brute_max:
+                start = time.perf_counter()
+                full = score(jd, required, preferred, [text for text, _ in resumes], [s for _, s in resumes])
+                t_brute = (t_brute or 0.0) + time.perf_counter() - start
+                best = top(full, args.top_k)
+                cutoff = full[best[-1]]
+                # Resumes tied with the K-th score are interchangeable.
+                recalls.append(sum(1 for i in picked if full[i] >= cutoff) / args.top_k)
+
+        n = len(jds)
+        brute = f"{t_brute / n * 1000:>8.1f} ms" if t_brute is not None else f"{'-':>11}"
+        recall = f"{sum(recalls) / len(recalls):>12.2f}" if recalls else f"{'-':>12}"
+        print(f"{size:>8}  {t_build:>9.2f} s  {t_short / n * 1000:>7.2f} ms  {t_score / n * 1000:>12.1f} ms  "
+              f"{(t_short + t_score) / n * 1000:>6.1f} ms  {brute}  {recall}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: top-K cascade (calculate_component_scores_top_k) against
+scoring every resume with calculate_component_scores_structured.
+
+Both paths include feature extraction (NER when a spaCy model is installed).
+The script checks that the cascade's top K equals the full run's and prints
+how many resumes each K fully scored and how long each path took.
+
+Usage
+-----
+  python scripts/bench_top_k.py [--resumes 500] [--k 5 10 50] [--share 0.2]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ml.matcher import (  # noqa: E402
+    calculate_component_scores_structured,
+    calculate_component_scores_top_k,
+)
+
+JD = "Backend engineer: Python, FastAPI and PostgreSQL required; Docker and Redis a plus. 3+ years, Bachelor's."
+REQUIRED, PREFERRED = {"python", "fastapi", "postgresql"}, {"docker", "redis"}
+WEIGHTS = {"skills": 0.5, "experience": 0.25, "education": 0.1, "relevance": 0.15}
+ON_TOPIC = ["python", "fastapi", "postgresql", "docker", "redis", "django", "sql", "aws"]
+OFF_TOPIC = ["react", "figma", "photoshop", "swift", "kotlin", "excel", "salesforce", "tableau", "css"]
+
+
+def synthetic_resume(rng: random.Random, on_topic: bool) -> str:
+    pool = ON_TOPIC if on_topic else OFF_TOPIC
+    skills = rng.sample(pool, rng.randint(2, len(pool) - 2))
+    start = rng.randint(2008, 2023)
+    degree = rng.choice(["B.Tech in Computer Science", "Master of Science", "Diploma in Design"])
+    return (
+        f"SUMMARY\nEngineer working with {', '.join(skills)}.\n"
+        f"EXPERIENCE\nSoftware Engineer, Jan {start} - Present\n"
+        f"Shipped features with {' and '.join(skills[:2])}, reduced costs {rng.randint(5, 50)}%.\n"
+        f"PROJECTS\nBuilt an internal tool using {skills[-1]}.\n"
+        f"EDUCATION\n{degree}\nSKILLS\n{', '.join(skills)}\n"
+    )
+
+
+def top(results: list, k: int) -> list:
+    return sorted(range(len(results)), key=lambda i: results[i]["final_score"], reverse=True)[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--k", type=int, nargs="+", default=[5, 10, 50])
+    parser.add_argument("--share", type=float, default=0.2, help="fraction of on-topic resumes")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    resumes = [synthetic_resume(rng, rng.random() < args.share) for _ in range(args.resumes)]
+    kwargs = dict(jd_skills=REQUIRED, preferred_skills=PREFERRED, min_years_experience=3.0, required_degree="Bachelor")
+
+    start = time.perf_counter()
+    full = calculate_component_scores_structured(
+        job_desc_clean="", resumes_clean=[], job_desc_raw=JD, resumes_raw=resumes, weights=WEIGHTS, **kwargs,
+    )
+    t_full = (time.perf_counter() - start) * 1000
+
+    print(f"{'k':>5}  {'fully scored':>12}  {'full run':>10}  {'cascade':>10}  {'speedup':>7}")
+    for k in args.k:
+        start = time.perf_counter()
+        results, features = calculate_component_scores_top_k(JD, resumes, WEIGHTS, k, **kwargs)
+        t_cascade = (time.perf_counter() - start) * 1000
+        if top(results, k) != top(full, k) or any(
+            results[i] != full[i] for i, f in enumerate(features) if f is not None
+        ):
+            sys.exit(f"cascade disagrees with the full run at k={k}")
+        scored = sum(f is not None for f in features)
+        print(f"{k:>5}  {scored:>5} / {len(resumes):<5}  {t_full:>7.1f} ms  {t_cascade:>7.1f} ms  "
+              f"{t_full / t_cascade:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Fit the corpus TF-IDF relevance model offline.
+
+Reads historical resume text (the ``resume_texts`` cache table) and job
+descriptions (``scans``) from DATABASE_URL, plus any ``*.txt`` files under
+--texts, fits the vectorizer used by ml.matcher.calculate_similarity and
+writes it with a version stamp. The API loads it at startup from
+TFIDF_MODEL_PATH; restart the API after refitting.
+
+Usage
+-----
+  python scripts/fit_tfidf.py [--out models/tfidf.joblib] [--texts DIR] [--no-db] [--min-df 2]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s  %(message)s")
+log = logging.getLogger(__name__)
+
+
+async def database_documents() -> list[str]:
+    from sqlalchemy import select
+
+    from api.resume_cache import decompress_text
+    from db.models import ResumeText, Scan
+    from db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        resumes = (await session.execute(select(ResumeText.text_zlib))).scalars().all()
+        jds = (await session.execute(select(Scan.job_description))).scalars().all()
+    log.info("  %d resumes and %d job descriptions from the database", len(resumes), len(jds))
+    return [decompress_text(blob) for blob in resumes] + list(jds)
+
+
+def file_documents(root: str) -> list[str]:
+    paths = sorted(Path(root).rglob("*.txt"))
+    log.info("  %d text files under %s", len(paths), root)
+    return [p.read_text(encoding="utf-8", errors="ignore") for p in paths]
+
+
+def main():
+    from api.config import TFIDF_MODEL_PATH
+    from ml.relevance import fit_tfidf_model
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=TFIDF_MODEL_PATH)
+    parser.add_argument("--texts", help="directory of extra .txt resumes/JDs")
+    parser.add_argument("--no-db", action="store_true", help="skip the database")
+    parser.add_argument("--min-df", type=int, default=2)
+    args = parser.parse_args()
+
+    log.info("=== Collecting documents ===")
+    docs = [] if args.no_db else asyncio.run(database_documents())
+    if args.texts:
+        docs += file_documents(args.texts)
+    if len(docs) < args.min_df:
+        sys.exit("not enough documents to fit a model")
+
+    model = fit_tfidf_model(docs, min_df=args.min_df)
+    model.save(args.out)
+    log.info("=== %s: %d terms from %d documents -> %s ===",
+             model.version, len(model.vectorizer.vocabulary_), model.documents, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,16 @@
 """
 conftest.py — global pytest configuration.
 
-Sets DATABASE_URL to an in-memory SQLite database before any app code
-imports it, so tests never touch a real database.
+Sets DATABASE_URL to a throwaway SQLite file before any app code imports it,
+so tests never touch a real database. A file rather than ``:memory:``: the
+in-memory engine shares one connection between all sessions, which breaks as
+soon as the async scan worker and a request touch the database at once.
 """
 
 import os
+import tempfile
 
 # Must be set before db.session is imported
-os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+_TEST_DB = os.path.join(tempfile.mkdtemp(prefix="talentmatch-tests-"), "test.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_TEST_DB}")
 os.environ.setdefault("ADMIN_SECRET", "test-admin-secret")
@@ -4,16 +4,27 @@ Unit tests for ml/matcher.py — scoring engine, extractors, and ATS scorer.
 Run with:  pytest tests/test_matcher.py -v
 """
 
+import numpy as np
 import pytest
 from ml.matcher import (
+    SCREENED_OUT,
+    ResumeFeatures,
     calculate_ats_score,
+    calculate_component_scores_top_k,
+    calculate_similarity,
     extract_education,
     extract_experience,
+    extract_experience_timeline,
     extract_jd_skill_tiers,
+    extract_resume_features,
     extract_skills,
+    extract_skills_batch,
+    final_score_from_signals,
     parse_date,
     calculate_component_scores_structured,
 )
+from ml.nlp_utils import analyze_texts, clean_texts_batch
+from pipeline.skills import SKILL_VOCAB, SkillExpansion, SkillSet, match_skills, normalize_skill
 
 
 # ---------------------------------------------------------------------------
@@ -90,6 +101,91 @@ class TestExtractSkills:
         skills = extract_skills(text)
         assert skills.count("python") == 1
 
+    def test_overlapping_and_prefix_seeds_all_found(self):
+        text = "Data Structures and Algorithms, React Native, GitHub Actions, R, C++ and C#."
+        skills = extract_skills(text)
+        for skill in ("data structures", "algorithms", "react", "react native",
+                      "github", "github actions", "r", "c++", "c#"):
+            assert skill in skills, skill
+        assert "git" not in skills   # "git" is a short token: needs whitespace after it
+
+    def test_batch_extraction_matches_single_texts_in_order(self):
+        texts = [
+            "Built dashboards at Snowflake with Python and Tableau.",
+            "",
+            "Frontend work in React and TypeScript for Shopify merchants.",
+            "Experienced in Python, React, and PostgreSQL.",
+        ]
+        assert extract_skills_batch(texts, batch_size=2) == [extract_skills(t) for t in texts]
+
+
+# ---------------------------------------------------------------------------
+# Document analysis (ml.nlp_utils)
+# ---------------------------------------------------------------------------
+
+class TestDocumentAnalysis:
+    def test_lemmas_run_only_when_requested(self):
+        analysis = analyze_texts(["The engineers were running Kafka clusters at Netflix."])[0]
+        assert analysis._lemmas is None
+        lemmas = analysis.lemmas()
+        assert "the" not in lemmas.split() and "kafka" in lemmas.split()
+        assert analysis.lemmas() is lemmas          # computed once per document
+        assert clean_texts_batch(["", "Kafka!"]) == ["", "kafka"]
+
+    def test_clean_text_keeps_dotted_skills_and_drops_urls(self):
+        from ml.nlp_utils import clean_text
+        text = "Built REST APIs with Node.js and React.js; 5+ years' experience."
+        assert clean_text(text) == "built rest apis node js react js 5 years experience"
+        assert clean_texts_batch([text]) == [clean_text(text)]
+        cleaned = clean_text("Portfolio: https://github.com/jane, mail jane.doe@example.com. Vue.js")
+        assert "github" not in cleaned and "example" not in cleaned and cleaned.endswith("vue js")
+
+
+# ---------------------------------------------------------------------------
+# Skill normalization and inference (pipeline.skills)
+# ---------------------------------------------------------------------------
+
+class TestSkillMatching:
+    def test_skill_normalization_applies_alias_before_synonym(self):
+        assert normalize_skill("Node") == "node.js"          # alias wins over the javascript synonym
+        assert normalize_skill(" NodeJS ") == "node.js"
+        assert normalize_skill("containers") == "docker"     # alias → containerization → docker
+        assert normalize_skill("ml") == "machine learning"
+        assert normalize_skill("Elixir") == "elixir"
+
+    def test_inference_is_two_hop_and_keeps_best_confidence(self):
+        # mongoose → node.js → javascript (two hops)
+        result = match_skills(["mongoose"], ["javascript", "node.js", "python"])
+        assert result["inferred_skills"] == ["javascript", "node.js"]
+        assert result["missing_skills"] == ["python"]
+        # clerk implies javascript at 0.8, react at 1.0: the best edge wins
+        # regardless of which skill is expanded first.
+        for skills in (["clerk", "react"], ["react", "clerk"]):
+            assert match_skills(skills, ["javascript"])["inference_weights"]["javascript"] == 1.0
+
+    def test_shared_expansion_does_not_leak_group_credit_between_tiers(self):
+        expansion = SkillExpansion(["mongodb"])
+        required = match_skills(["mongodb"], ["nosql database"], expansion)
+        preferred = match_skills(["mongodb"], ["docker"], expansion)
+        assert required["inferred_skills"] == ["nosql database"]
+        assert "nosql database" not in preferred["inference_weights"]
+
+    def test_skill_ids_are_sorted_and_cover_groups(self):
+        assert list(SKILL_VOCAB.names) == sorted(SKILL_VOCAB.names)
+        assert SKILL_VOCAB.id("python") is not None
+        assert "nosql database" in SKILL_VOCAB
+        assert SKILL_VOCAB.id("acme widget") is None
+
+    def test_skill_set_matches_python_set_semantics(self):
+        a = {"python", "docker", "acme widget", "zeta tool"}
+        b = {"docker", "go", "acme widget", "kubernetes"}
+        bits_a, bits_b = SkillSet.of(a), SkillSet.of(b)
+        assert bits_a.overlap(bits_b) == len(a & b) == 2
+        assert (bits_a & bits_b).sorted() == sorted(a & b)
+        assert (bits_a | bits_b).sorted() == sorted(a | b)
+        assert len(bits_a) == len(a)
+        assert "acme widget" in bits_a and "go" not in bits_a
+
 
 # ---------------------------------------------------------------------------
 # extract_experience
@@ -143,6 +239,68 @@ Jun 2020 – Jun 2021
         # Should be ~2 years (merged), not ~3 years (additive)
         assert years <= 2.5, f"Overlapping ranges should be merged; got {result[0]}"
 
+    def test_ranges_after_the_next_section_are_ignored(self):
+        text = """
+EXPERIENCE
+Software Engineer — Acme Corp
+Jan 2020 – Jan 2022
+
+Projects:
+Hackathon lead developer
+Jan 2015 – Jan 2019
+"""
+        features = ResumeFeatures(text)
+        assert [s.name for s in features.sections.spans] == ["experience", "projects"]
+        assert features.experience_str == extract_experience(text)[0]
+        assert 1.8 <= features.years <= 2.2
+
+
+class TestExperienceTimeline:
+    RESUMES = [
+        "EXPERIENCE\nData Engineer, Acme\nJan 2020 – Jan 2022\nConsultant\nJun 2020 - Jun 2021\n",
+        "Work Experience:\nCo-Founder, Startup\n2016 - 2018\nbuilt things\n2019 - 2020\n",
+        "experience\n" + "x" * 140 + "engineers " + "2015 - 2017" + " " + "y" * 160 + "\nEducation\n2010 - 2014",
+        "experience\nresearch " + "z" * 200 + "\n03/2019 - present\nlead " + "w" * 150 + "ers\n",
+        "EXPERIENCE\nFreelance designer 2010 - 2020\nManager, Big Co\nmay 2021 - jun 2021",
+    ]
+
+    @staticmethod
+    def per_date_total(text: str) -> str:
+        """The work-section loop before the timeline extractor, for comparison."""
+        import re
+        from ml.matcher import DATE_RANGE_PATTERN, ROLE_KEYWORDS, _normalize_dashes, _work_section
+        work_section = _work_section(_normalize_dashes(text.lower())) or ""
+        ranges = []
+        for match in re.finditer(DATE_RANGE_PATTERN, work_section, re.IGNORECASE):
+            ctx = work_section[max(0, match.start() - 150):match.end() + 150]
+            if any(re.search(rf"\b{re.escape(role)}\b", ctx) for role in ROLE_KEYWORDS):
+                d1, d2 = parse_date(match.group(1)), parse_date(match.group(2))
+                if d1 and d2 and d2 >= d1 and (d2 - d1).days / 365.25 <= 6:
+                    ranges.append((d1, d2))
+        merged = []
+        for s, e in sorted(ranges):
+            if merged and s <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+            else:
+                merged.append((s, e))
+        years = sum((e - s).days for s, e in merged) / 365.25
+        return f"{min(years, 40):.1f} Years"
+
+    @pytest.mark.parametrize("text", RESUMES)
+    def test_totals_match_per_date_scan(self, text):
+        assert extract_experience(text) == [self.per_date_total(text)]
+
+    def test_roles_attached_by_position(self):
+        total, timeline = extract_experience_timeline(self.RESUMES[0])
+        assert total == extract_experience(self.RESUMES[0])[0]
+        assert [(r.start.year, r.end.year, r.role) for r in timeline] == [
+            (2020, 2022, "engineer"), (2020, 2021, "consultant"),
+        ]
+
+    def test_nested_role_reports_the_longer_keyword(self):
+        _, timeline = extract_experience_timeline(self.RESUMES[1])
+        assert [r.role for r in timeline] == ["co-founder", "co-founder"]
+
 
 # ---------------------------------------------------------------------------
 # extract_education
@@ -236,6 +394,113 @@ Built a recommendation engine using scikit-learn.
             assert 0 <= score <= 100
 
 
+# ---------------------------------------------------------------------------
+# ResumeFeatures
+# ---------------------------------------------------------------------------
+
+class TestResumeFeatures:
+    RESUME = (
+        "EXPERIENCE\nBackend Engineer, Jan 2019 - Mar 2022\nBuilt Python services, reduced latency 40%.\n"
+        "EDUCATION\nMaster of Science in Computer Science"
+    )
+
+    def test_each_signal_is_derived_once(self, monkeypatch):
+        import ml.matcher as matcher
+        calls = []
+        real_education = matcher.extract_education
+        monkeypatch.setattr(matcher, "extract_education", lambda text: calls.append(text) or real_education(text))
+        features = ResumeFeatures(self.RESUME)
+        assert features.degree == "Master"
+        assert features.degree == "Master"
+        assert len(calls) == 1
+
+    def test_ats_score_reuses_features(self, monkeypatch):
+        import ml.matcher as matcher
+        features = extract_resume_features(self.RESUME)
+        expected = calculate_ats_score(self.RESUME, job_keywords={"python", "docker"})
+
+        def no_extraction(*args, **kwargs):
+            raise AssertionError("features already carry the skills")
+
+        monkeypatch.setattr(matcher, "extract_skills", no_extraction)
+        assert calculate_ats_score(features, job_keywords={"python", "docker"}) == expected
+
+    def test_stored_fields_round_trip(self):
+        features = extract_resume_features(self.RESUME)
+        restored = ResumeFeatures.from_dict(features.to_dict())
+        assert restored.to_dict() == features.to_dict()
+        assert restored.years == features.years > 0
+
+
+# ---------------------------------------------------------------------------
+# calculate_similarity (ml.relevance)
+# ---------------------------------------------------------------------------
+
+class TestRelevanceModel:
+    CORPUS = [
+        "Backend engineer building Python APIs with FastAPI and PostgreSQL.",
+        "Frontend developer shipping React and TypeScript dashboards.",
+        "Data engineer running Spark and Airflow pipelines on AWS.",
+        "Python backend services, Docker, Kubernetes and PostgreSQL.",
+        "Hiring a backend engineer: Python, FastAPI, PostgreSQL, Docker.",
+    ]
+
+    def test_corpus_model_scores_do_not_depend_on_the_batch(self, monkeypatch, tmp_path):
+        import ml.relevance as relevance
+        jd, resumes = self.CORPUS[-1], self.CORPUS[:-1]
+        monkeypatch.setattr(relevance, "_model", None)
+        per_scan = calculate_similarity(jd, resumes)
+        assert calculate_similarity(jd, resumes[:1])[0] != per_scan[0]   # IDF moves with the batch
+
+        path = tmp_path / "tfidf.joblib"
+        relevance.fit_tfidf_model(self.CORPUS, min_df=1).save(str(path))
+        model = relevance.load_tfidf_model(str(path))
+        assert model.version.startswith("tfidf-") and model.documents == len(self.CORPUS)
+        alone = calculate_similarity(jd, resumes[:1])
+        assert calculate_similarity(jd, resumes)[0] == pytest.approx(alone[0])
+
+    def test_missing_model_falls_back_to_per_scan_fit(self, monkeypatch, tmp_path):
+        import ml.relevance as relevance
+        monkeypatch.setattr(relevance, "_model", None)
+        assert relevance.load_tfidf_model(str(tmp_path / "absent.joblib")) is None
+        assert calculate_similarity(self.CORPUS[-1], self.CORPUS[:1])[0] > 0
+
+    def test_hashing_backend_vectorizes_resumes_independently(self):
+        from ml.relevance import hash_vectorize
+        jd, resumes = self.CORPUS[-1], self.CORPUS[:-1]
+        together = hash_vectorize(resumes)
+        assert together.dtype == np.float32
+        for i, text in enumerate(resumes):
+            assert (hash_vectorize([text]) != together[i]).nnz == 0
+
+        scores = calculate_similarity(jd, resumes, backend="hashing")
+        precomputed = [ResumeFeatures(text).relevance_vector for text in resumes]
+        assert calculate_similarity(jd, resumes, precomputed, backend="hashing") == scores
+        assert scores[0] > scores[2] > scores[1]   # backend > data > frontend for a backend JD
+
+    def test_resume_features_vectorize_only_when_needed(self, monkeypatch):
+        import ml.relevance as relevance
+        from ml.matcher import extract_resume_features_batch
+        monkeypatch.setattr(relevance, "_backend", "tfidf")
+        assert "relevance_vector" not in vars(extract_resume_features_batch(self.CORPUS[:1])[0])
+        assert "relevance_vector" in vars(extract_resume_features_batch(self.CORPUS[:1], vectorize=True)[0])
+        monkeypatch.setattr(relevance, "_backend", "hashing")
+        assert "relevance_vector" in vars(extract_resume_features_batch(self.CORPUS[:1])[0])
+
+    def test_vector_index_ranks_by_cosine(self):
+        from ml.relevance import VectorIndex, hash_vectorize
+        rows = hash_vectorize(self.CORPUS)
+        index = VectorIndex()
+        for i in range(rows.shape[0]):
+            index.add(f"doc-{i}", rows[i])
+        jd = f"doc-{len(self.CORPUS) - 1}"
+        nearest = index.nearest(rows[len(self.CORPUS) - 1], 2, exclude=jd)
+        assert {key for key, _ in nearest} == {"doc-0", "doc-3"}   # the two backend resumes
+        assert nearest[0][1] >= nearest[1][1]
+        index.remove(nearest[0][0])
+        assert index.nearest(rows[len(self.CORPUS) - 1], 1, exclude=jd) == [nearest[1]]
+
+
 # ---------------------------------------------------------------------------
 # calculate_component_scores_structured
 # ---------------------------------------------------------------------------
@@ -571,3 +836,194 @@ Bachelor of Technology, Computer Science.
         )[0]["final_score"]
 
         assert abs(original - perturbed) <= 5.0
+
+    def test_precomputed_resume_features_match_inline_scoring(self):
+        jd = "Backend engineer. Python, FastAPI, PostgreSQL and Docker required."
+        resumes = [
+            "EXPERIENCE\nBackend Engineer, Jan 2020 - Present\nBuilt FastAPI services on PostgreSQL.\n"
+            "EDUCATION\nB.Tech in Computer Science",
+            "Data scientist. PyTorch, pandas, numpy. M.Sc Statistics.",
+        ]
+        common = {
+            "job_desc_clean": jd,
+            "resumes_clean": resumes,
+            "job_desc_raw": jd,
+            "resumes_raw": resumes,
+            "weights": self.WEIGHTS,
+            "jd_skills": {"python", "fastapi", "postgresql", "docker"},
+        }
+        inline = calculate_component_scores_structured(**common)
+        pipelined = calculate_component_scores_structured(
+            **common,
+            resume_features=[extract_resume_features(r) for r in resumes],
+        )
+        assert pipelined == inline
+
+    def test_stored_signals_reproduce_scores_under_new_weights(self):
+        jd = "Backend engineer. Python, FastAPI, PostgreSQL and Docker required."
+        resumes = [
+            "EXPERIENCE\nBackend Engineer, Jan 2015 - Present\nBuilt FastAPI services on PostgreSQL, "
+            "reduced latency 40%.\nEDUCATION\nB.Tech in Computer Science",
+            "Java developer. Spring Boot, Hibernate. Master of Science.",
+        ]
+        common = {
+            "job_desc_clean": jd,
+            "resumes_clean": resumes,
+            "job_desc_raw": jd,
+            "resumes_raw": resumes,
+            "jd_skills": {"python", "fastapi", "postgresql", "docker"},
+        }
+        reweighted = {"skills": 0.2, "experience": 1.0, "education": 0.6, "relevance": 0.0}
+        original = calculate_component_scores_structured(**common, weights=self.WEIGHTS)
+        rescored = calculate_component_scores_structured(**common, weights=reweighted)
+        for before, after in zip(original, rescored):
+            assert final_score_from_signals(before["signals"], self.WEIGHTS) == before["final_score"]
+            assert final_score_from_signals(before["signals"], reweighted) == after["final_score"]
+
+    def test_batch_scores_match_scoring_each_resume_alone(self):
+        jd = "Backend engineer. Python and PostgreSQL required, Docker preferred. 3 years minimum."
+        resumes = [
+            "EXPERIENCE\nBackend Engineer, Jan 2015 - Present\nBuilt Python services on PostgreSQL, "
+            "reduced latency 40%.\nEDUCATION\nB.Tech in Computer Science",
+            "Skills\n" + ", ".join(["python", "docker", "react", "node.js", "java", "go", "aws", "gcp",
+                                     "azure", "kafka", "redis", "mongodb", "sql", "html", "css", "vue"]),
+            "Frontend developer, no degree listed. React and TypeScript.",
+        ]
+        features = [extract_resume_features(r) for r in resumes]
+        common = {
+            "job_desc_clean": jd,
+            "job_desc_raw": jd,
+            "weights": self.WEIGHTS,
+            "jd_skills": {"python", "postgresql"},
+            "preferred_skills": {"docker"},
+            "min_years_experience": 3.0,
+            "required_degree": "Bachelor",
+        }
+        batch = calculate_component_scores_structured(
+            resumes_clean=resumes, resumes_raw=resumes, resume_features=features, **common,
+        )
+        for i, resume in enumerate(resumes):
+            alone = calculate_component_scores_structured(
+                resumes_clean=[resume], resumes_raw=[resume], resume_features=[features[i]], **common,
+            )[0]
+            for key in ("skills_score", "exp_score", "edu_score", "meets_min_experience", "meets_degree_req"):
+                assert batch[i][key] == alone[key], key
+            assert final_score_from_signals(batch[i]["signals"], self.WEIGHTS) == batch[i]["final_score"]
+
+
+# ---------------------------------------------------------------------------
+# Near-duplicate detection (ml.dedupe)
+# ---------------------------------------------------------------------------
+
+class TestDedupe:
+    RESUME = (
+        "Priya Sharma, backend engineer. Built payment APIs with Python, FastAPI and PostgreSQL "
+        "at Acme from 2019 to 2024, cut p99 latency by 40% and led a team of four. "
+        "B.Tech in Computer Science, 2018. Skills: Python, FastAPI, PostgreSQL, Docker, Redis."
+    )
+
+    def test_signature_similarity_tracks_edits(self):
+        from ml.dedupe import decode_signature, encode_signature, estimated_jaccard, minhash_signature
+        original = minhash_signature(self.RESUME)
+        edited = minhash_signature(self.RESUME.replace("four", "five"))
+        other = minhash_signature("Graphic designer. Photoshop, Illustrator and Figma for ten years of branding.")
+        assert estimated_jaccard(original, minhash_signature(self.RESUME.upper())) == 1.0   # case-insensitive
+        assert estimated_jaccard(original, edited) >= 0.8
+        assert estimated_jaccard(original, other) < 0.2
+        assert (decode_signature(encode_signature(original)) == original).all()
+
+    def test_lsh_index_finds_near_duplicates_only(self):
+        from ml.dedupe import LshIndex, minhash_signature
+        index = LshIndex()
+        index.add("original", minhash_signature(self.RESUME))
+        index.add("other", minhash_signature("Graphic designer. Photoshop, Illustrator and Figma."))
+        index.add("blank", minhash_signature("  \n"))                  # empty signatures are not indexed
+        assert len(index) == 2 and "blank" not in index
+        found = index.near_duplicates(minhash_signature(self.RESUME.replace("four", "five")))
+        assert [key for key, _ in found] == ["original"]
+        index.remove("original")
+        assert index.near_duplicates(minhash_signature(self.RESUME)) == []
+
+
+# ---------------------------------------------------------------------------
+# TalentPool (ml.talent_pool)
+# ---------------------------------------------------------------------------
+
+class TestTalentPool:
+    def test_shortlist_ranks_by_tier_weighted_coverage(self):
+        from ml.talent_pool import TalentPool
+        pool = TalentPool()
+        pool.add("python-only", ["python"])
+        pool.add("nosql", ["python", "mongodb"])        # satisfies the "nosql database" group
+        pool.add("frontend", ["react", "css"])
+        pool.add("python-docker", ["python", "docker"])
+        shortlist = pool.shortlist(["python", "nosql database"], ["docker"], 10)
+        assert shortlist == ["nosql", "python-docker", "python-only"]
+        assert pool.shortlist(["python"], [], 2) == ["python-only", "nosql"]   # ties keep insertion order
+
+    def test_readding_and_removing_keys(self):
+        from ml.talent_pool import TalentPool
+        pool = TalentPool()
+        pool.add("a", ["react"])
+        pool.add("b", ["python"])
+        pool.add("a", ["python", "docker"])
+        assert len(pool) == 2 and set(pool) == {"a", "b"}
+        assert pool.shortlist(["python"], ["docker"], 5) == ["a", "b"]
+        assert pool.shortlist(["react"], [], 5) == []
+        pool.remove("a")
+        assert "a" not in pool
+        assert pool.shortlist(["python"], ["docker"], 5) == ["b"]
+
+
+# ---------------------------------------------------------------------------
+# calculate_component_scores_top_k (cascade)
+# ---------------------------------------------------------------------------
+
+class TestTopKCascade:
+    WEIGHTS = {"skills": 0.5, "experience": 0.25, "education": 0.1, "relevance": 0.15}
+    JD = "Backend engineer: Python, FastAPI and PostgreSQL required, Docker a plus. 3+ years, Bachelor's."
+
+    def resumes(self):
+        strong = (
+            "EXPERIENCE\nBackend Engineer, Jan {start} - Present\nBuilt Python FastAPI services on PostgreSQL "
+            "and Docker, cut latency 40%.\nEDUCATION\nB.Tech in Computer Science"
+        )
+        weak = "Graphic designer. Photoshop, Illustrator, Figma. {n} years of branding work."
+        return [strong.format(start=2010 + i) for i in range(4)] + [weak.format(n=n) for n in range(20)]
+
+    def test_fully_scored_results_match_a_full_run(self):
+        resumes = self.resumes()
+        kwargs = dict(jd_skills={"python", "fastapi", "postgresql"}, preferred_skills={"docker"},
+                      min_years_experience=3.0, required_degree="Bachelor")
+        full = calculate_component_scores_structured(
+            job_desc_clean="", resumes_clean=[], job_desc_raw=self.JD, resumes_raw=resumes,
+            weights=self.WEIGHTS, **kwargs,
+        )
+        extracted = []
+
+        def extract(indices):
+            extracted.extend(indices)
+            return [extract_resume_features(resumes[i]) for i in indices]
+
+        results, features = calculate_component_scores_top_k(
+            self.JD, resumes, self.WEIGHTS, 3, extract_features=extract, **kwargs,
+        )
+        assert sorted(extracted) == [i for i, f in enumerate(features) if f is not None]
+        assert len(extracted) < len(resumes)
+        for exact, result in zip(full, results):
+            if result.get("screened_out"):
+                assert result["hiring_recommendation"] == SCREENED_OUT
+                assert result["final_score"] == 0.0
+                assert exact["final_score"] <= result["score_upper_bound"]   # the bound holds
+            else:
+                assert result == exact
+        top = lambda rows: sorted(range(len(rows)), key=lambda i: rows[i]["final_score"], reverse=True)[:3]
+        assert top(results) == top(full)
+
+    def test_names_ner_could_add_keep_a_skill_possible(self):
+        # Seeds miss these, but an NER entity with any of these names would credit the skill.
+        from pipeline.skills import crediting_names
+        assert {"go", "golang"} <= crediting_names("go")
+        assert {"django", "pandas"} <= crediting_names("python")         # implies python
+        assert {"mongodb", "mongoose"} <= crediting_names("nosql database")   # group member, and via mongodb
+        assert "react" not in crediting_names("python")
@@ -7,24 +7,35 @@ external services are needed.
 Run with:  pytest tests/test_routes.py -v
 """
 
+import asyncio
+import hashlib
 import io
 import json
+import os
 import uuid
+import zipfile
 from datetime import datetime, timedelta, timezone
 
 import jwt
 import pytest
 import pytest_asyncio
 from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException, UploadFile
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
 
 from api.main import app
 from api.main import get_cors_origins
 from api import config
 import api.routes as api_routes
+import api.scan_pipeline as scan_pipeline
 from db.session import AsyncSessionLocal, engine, init_db
-from db.models import Base, User, ApiKey, Candidate, Scan
+from db.models import Base, User, ApiKey, Candidate, ResumeSignature, ResumeText, ResumeVector, Scan
 from api.auth.dependencies import generate_api_key, hash_key
+from api.resume_cache import ResumeTextCache, get_resume_text_cache
+from api.resume_parser import PdfExtractorPool, PdfExtractionTimeout
+from api.scan_pipeline import ScanObserver, ScanParams
+from api.uploads import SpooledUpload, spool_upload
 
 
 # ---------------------------------------------------------------------------
@@ -79,6 +90,7 @@ async def test_user(db_session):
 
 @pytest_asyncio.fixture
 async def client():
+    config.limiter.reset()   # per-IP limits would otherwise accumulate across the whole module
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
     ) as c:
@@ -126,6 +138,163 @@ def _minimal_text_pdf(content: str = "John Doe\njohn@example.com\n+91 9876543210
     return pdf
 
 
+# ---------------------------------------------------------------------------
+# PDF extractor pool
+# ---------------------------------------------------------------------------
+
+class TestPdfExtractorPool:
+    @pytest.mark.asyncio
+    async def test_pool_extracts_text_in_worker_process(self):
+        pool = PdfExtractorPool(size=1, timeout_seconds=30)
+        try:
+            text, extractor = await pool.extract(_minimal_text_pdf())
+        finally:
+            pool.shutdown()
+        assert "Python developer" in text
+        assert extractor == "pypdf"
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_worker_and_fails_only_that_file(self):
+        pool = PdfExtractorPool(size=1, timeout_seconds=0.001)
+        try:
+            with pytest.raises(PdfExtractionTimeout):
+                await pool.extract(_minimal_text_pdf())
+            # The slot is respawned, so the next file gets a fresh worker.
+            pool.timeout_seconds = 30
+            text, _ = await pool.extract(_minimal_text_pdf("Second resume"))
+        finally:
+            pool.shutdown()
+        assert "Second resume" in text
+
+    @pytest.mark.asyncio
+    async def test_zero_workers_extracts_in_thread(self):
+        pool = PdfExtractorPool(size=0, timeout_seconds=30)
+        text, _ = await pool.extract(_minimal_text_pdf())
+        assert "Python developer" in text
+
+    @pytest.mark.asyncio
+    async def test_extracts_spooled_file_by_path(self, tmp_path):
+        path = tmp_path / "cv.pdf"
+        path.write_bytes(_minimal_text_pdf())
+        pool = PdfExtractorPool(size=1, timeout_seconds=30)
+        try:
+            text, extractor = await pool.extract_path(str(path))
+        finally:
+            pool.shutdown()
+        assert "Python developer" in text
+        assert extractor == "pypdf"
+
+
+class TestSpooledUploads:
+    @pytest.mark.asyncio
+    async def test_spool_hashes_and_removes_file_on_discard(self):
+        pdf = _minimal_text_pdf()
+        spooled = await spool_upload(UploadFile(io.BytesIO(pdf), filename="cv.pdf"), len(pdf))
+        assert spooled.size == len(pdf)
+        assert spooled.sha256 == hashlib.sha256(pdf).hexdigest()
+        with open(spooled.path, "rb") as fh:
+            assert fh.read() == pdf
+        spooled.discard()
+        assert not os.path.exists(spooled.path)
+
+    @pytest.mark.asyncio
+    async def test_oversized_upload_rejected_while_streaming(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "UPLOAD_SPOOL_DIR", str(tmp_path))
+        with pytest.raises(HTTPException) as exc_info:
+            await spool_upload(UploadFile(io.BytesIO(b"%PDF" + b"0" * 2048), filename="big.pdf"), 1024)
+        assert exc_info.value.status_code == 413
+        assert list(tmp_path.iterdir()) == []   # partial spool file cleaned up
+
+
+class TestResumeTextCache:
+    @pytest.mark.asyncio
+    async def test_store_then_lookup_survives_lru_eviction(self):
+        cache = ResumeTextCache(max_entries=1)
+        digest = uuid.uuid4().hex * 2
+        await cache.store_many({digest: ("Resume text body", "pypdf")})
+        cache.clear_local()
+
+        found = await cache.lookup_many([digest, "0" * 64])
+
+        assert found == {digest: ("Resume text body", "pypdf")}
+        assert cache.get_local(digest) == ("Resume text body", "pypdf")
+
+    @pytest.mark.asyncio
+    async def test_repeat_upload_skips_pdf_extraction(self, client, test_user, monkeypatch):
+        _, raw_key = test_user
+        pdf = _minimal_text_pdf(f"Cache probe {uuid.uuid4()}\nPython developer\nSKILLS\nPython, FastAPI")
+        form = {
+            "job_description": "Python backend engineer with FastAPI experience.",
+            "required_skills": "[]", "preferred_skills": "[]",
+            "min_years_experience": "null", "required_degree": "null",
+        }
+        first = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=form,
+            files={"files": ("cv.pdf", io.BytesIO(pdf), "application/pdf")},
+        )
+        assert first.status_code == 200, first.text
+
+        class FailingExtractor:
+            async def extract_path(self, path):
+                raise AssertionError("cache miss: PDF was re-extracted")
+
+        monkeypatch.setattr(scan_pipeline, "get_pdf_extractor", lambda: FailingExtractor())
+        get_resume_text_cache().clear_local()   # force the persistent layer
+        second = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=form,
+            files={"files": ("renamed.pdf", io.BytesIO(pdf), "application/pdf")},
+        )
+        assert second.status_code == 200, second.text
+        assert second.json()["results"][0]["final_score"] == first.json()["results"][0]["final_score"]
+
+    @pytest.mark.asyncio
+    async def test_deleting_last_scan_of_a_resume_purges_its_stored_data(self, client, test_user):
+        _, raw_key = test_user
+        shared = _minimal_text_pdf(f"Shared CV {uuid.uuid4()}\nSKILLS\nPython, FastAPI")
+        single = _minimal_text_pdf(f"Single CV {uuid.uuid4()}\nSKILLS\nPython, Django")
+        shared_hash, single_hash = hashlib.sha256(shared).hexdigest(), hashlib.sha256(single).hexdigest()
+        form = {
+            "job_description": "Python backend engineer with FastAPI experience.",
+            "required_skills": "[]", "preferred_skills": "[]",
+            "min_years_experience": "null", "required_degree": "null",
+        }
+        scan_ids = []
+        for files in (
+            [("files", ("shared.pdf", io.BytesIO(shared), "application/pdf"))],
+            [("files", ("shared.pdf", io.BytesIO(shared), "application/pdf")),
+             ("files", ("single.pdf", io.BytesIO(single), "application/pdf"))],
+        ):
+            r = await client.post("/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=form, files=files)
+            assert r.status_code == 200, r.text
+            scan_ids.append(r.json()["scan_id"])
+
+        async def stored_hashes():
+            async with AsyncSessionLocal() as session:
+                return {
+                    model.__tablename__: set((await session.execute(
+                        select(model.content_hash).where(model.content_hash.in_([shared_hash, single_hash]))
+                    )).scalars().all())
+                    for model in (ResumeText, ResumeVector, ResumeSignature)
+                }
+
+        assert await stored_hashes() == {
+            "resume_texts": {shared_hash, single_hash},
+            "resume_vectors": {shared_hash, single_hash},
+            "resume_signatures": {shared_hash, single_hash},
+        }
+
+        r = await client.delete(f"/api/v1/scans/{scan_ids[1]}", headers={"X-API-Key": raw_key})
+        assert r.status_code == 204
+        assert all(hashes == {shared_hash} for hashes in (await stored_hashes()).values())
+        assert get_resume_text_cache().get_local(single_hash) is None
+        assert get_resume_text_cache().get_local(shared_hash) is not None
+
+        r = await client.delete(f"/api/v1/scans/{scan_ids[0]}", headers={"X-API-Key": raw_key})
+        assert r.status_code == 204
+        assert all(hashes == set() for hashes in (await stored_hashes()).values())
+        assert get_resume_text_cache().get_local(shared_hash) is None
+
+
 # ---------------------------------------------------------------------------
 # Health check
 # ---------------------------------------------------------------------------
@@ -138,6 +307,11 @@ class TestHealth:
         data = r.json()
         assert data["status"] == "ok"
         assert "models" in data
+        components = data["models"]["spacy_components"]
+        if components is not None:
+            assert set(components["analysis_pass"]) <= set(components["loaded"])
+            assert "parser" not in components["analysis_pass"]
+        assert "tfidf_model" in data["models"]
 
     def test_cors_adds_localhost_loopback_pair(self, monkeypatch):
         monkeypatch.setenv("CORS_ORIGINS", "http://localhost:5173")
@@ -554,6 +728,663 @@ class TestScanPdf:
         )
         assert r.status_code == 400
 
+    @pytest.mark.asyncio
+    async def test_unreadable_upload_is_skipped_and_rest_scored(self, client, test_user, monkeypatch):
+        _, raw_key = test_user
+        good = _minimal_text_pdf(f"Jane Roe {uuid.uuid4()}\nSKILLS\nPython, FastAPI")
+        slow = _minimal_text_pdf(f"Slow PDF {uuid.uuid4()}\nSKILLS\nPython")
+        slow_digest = hashlib.sha256(slow).hexdigest()
+        extractor = scan_pipeline.get_pdf_extractor()
+
+        class TimingOutExtractor:
+            async def extract_path(self, path):
+                with open(path, "rb") as fh:
+                    if hashlib.sha256(fh.read()).hexdigest() == slow_digest:
+                        raise PdfExtractionTimeout("timed out")
+                return await extractor.extract_path(path)
+
+        monkeypatch.setattr(scan_pipeline, "get_pdf_extractor", lambda: TimingOutExtractor())
+        r = await client.post(
+            "/api/v1/scan/pdf",
+            headers={"X-API-Key": raw_key},
+            data={"job_description": "Python engineer with FastAPI experience required.",
+                  "required_skills": "[]", "preferred_skills": "[]",
+                  "min_years_experience": "null", "required_degree": "null"},
+            files=[
+                ("files", ("good.pdf", io.BytesIO(good), "application/pdf")),
+                ("files", ("slow.pdf", io.BytesIO(slow), "application/pdf")),
+                ("files", ("blank.pdf", io.BytesIO(_minimal_text_pdf("")), "application/pdf")),
+            ],
+        )
+        assert r.status_code == 200, r.text
+        data = r.json()
+        assert [result["filename"] for result in data["results"]] == ["good.pdf"]
+        skipped = {entry["filename"]: entry["error"] for entry in data["skipped_files"]}
+        assert set(skipped) == {"slow.pdf", "blank.pdf"}
+        assert "timed out" in skipped["slow.pdf"]
+
+        detail = await client.get(f"/api/v1/scans/{data['scan_id']}", headers={"X-API-Key": raw_key})
+        assert detail.json()["skipped_files"] == data["skipped_files"]
+
+
+async def _wait_for_scan(client, raw_key: str, scan_id: str, timeout: float = 30.0) -> dict:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        r = await client.get(f"/api/v1/scans/{scan_id}", headers={"X-API-Key": raw_key})
+        assert r.status_code == 200, r.text
+        detail = r.json()
+        if detail["status"] in ("completed", "failed"):
+            return detail
+        assert asyncio.get_running_loop().time() < deadline, f"scan stuck in {detail['status']}"
+        await asyncio.sleep(0.05)
+
+
+class TestAsyncScanJobs:
+    FORM = {
+        "job_description": "We are looking for a Python backend engineer with FastAPI and PostgreSQL.",
+        "required_skills": json.dumps(["python", "fastapi"]),
+        "preferred_skills": "[]",
+        "min_years_experience": "null",
+        "required_degree": "null",
+        "mode": "async",
+    }
+
+    @pytest.mark.asyncio
+    async def test_async_scan_is_queued_then_completes(self, client, test_user, db_session):
+        user, raw_key = test_user
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files={"files": ("cv.pdf", io.BytesIO(_minimal_text_pdf()), "application/pdf")},
+        )
+        assert r.status_code == 202, r.text
+        body = r.json()
+        assert body["status"] == "queued"
+
+        detail = await _wait_for_scan(client, raw_key, body["scan_id"])
+        assert detail["status"] == "completed", detail
+        assert detail["total_candidates"] == 1
+        assert len(detail["results"]) == 1
+        assert detail["progress_done"] == detail["progress_total"] == 1
+        await db_session.refresh(user)
+        assert user.free_scans_used == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_async_scan_reports_error_and_refunds_quota(self, client, test_user, db_session):
+        user, raw_key = test_user
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files={"files": ("blank.pdf", io.BytesIO(_minimal_text_pdf("")), "application/pdf")},
+        )
+        assert r.status_code == 202, r.text
+
+        detail = await _wait_for_scan(client, raw_key, r.json()["scan_id"])
+        assert detail["status"] == "failed"
+        assert "blank.pdf" in detail["error"]
+        assert detail["results"] == []
+        await db_session.refresh(user)
+        assert user.free_scans_used == 0
+
+    @pytest.mark.asyncio
+    async def test_scan_that_fails_to_save_is_failed_and_refunded(self, client, test_user, db_session, monkeypatch):
+        import api.scan_jobs as scan_jobs
+        user, raw_key = test_user
+
+        async def broken_persist(*args):
+            raise RuntimeError("database went away")
+
+        monkeypatch.setattr(scan_jobs, "persist_scan", broken_persist)
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files={"files": ("cv.pdf", io.BytesIO(_minimal_text_pdf()), "application/pdf")},
+        )
+        assert r.status_code == 202, r.text
+
+        detail = await _wait_for_scan(client, raw_key, r.json()["scan_id"])
+        assert detail["status"] == "failed"
+        assert detail["error"] == "Internal error while saving the scan."
+        assert detail["results"] == []
+        await db_session.refresh(user)
+        assert user.free_scans_used == 0
+
+    @pytest.mark.asyncio
+    async def test_event_stream_ends_with_final_ranking(self, client, test_user):
+        _, raw_key = test_user
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files=[
+                ("files", ("a.pdf", io.BytesIO(_minimal_text_pdf()), "application/pdf")),
+                ("files", ("b.pdf", io.BytesIO(_minimal_text_pdf("Go developer\nSKILLS\nGo, gRPC")), "application/pdf")),
+            ],
+        )
+        scan_id = r.json()["scan_id"]
+
+        events = await client.get(f"/api/v1/scans/{scan_id}/events", headers={"X-API-Key": raw_key})
+        assert events.status_code == 200
+        assert events.headers["content-type"].startswith("text/event-stream")
+        names = [line[len("event: "):] for line in events.text.splitlines() if line.startswith("event: ")]
+        assert names[-1] == "completed", names
+        assert "ranked" in names
+
+        # Once the job is gone the stream is answered from the database.
+        again = await client.get(f"/api/v1/scans/{scan_id}/events", headers={"X-API-Key": raw_key})
+        assert "event: ranked" in again.text and "event: completed" in again.text
+
+    @pytest.mark.asyncio
+    async def test_pipeline_streams_provisional_ranking_per_resume(self, tmp_path):
+        class Recorder(ScanObserver):
+            def __init__(self):
+                self.events = []
+
+            def wants_provisional(self):
+                return True
+
+            async def on_extracted(self, filename, done, total):
+                self.events.append(("extracted", filename))
+
+            async def on_provisional(self, scored, ranking):
+                self.events.append(("provisional", [r.filename for r in ranking]))
+
+            async def on_ranked(self, results):
+                self.events.append(("ranked", [r.filename for r in results]))
+
+        uploads = []
+        for name, text in [
+            ("backend.pdf", f"{uuid.uuid4()}\nPython FastAPI PostgreSQL backend engineer"),
+            ("designer.pdf", f"{uuid.uuid4()}\nGraphic designer, Photoshop"),
+        ]:
+            pdf = _minimal_text_pdf(text)
+            path = tmp_path / name
+            path.write_bytes(pdf)
+            uploads.append(SpooledUpload(name, str(path), len(pdf), hashlib.sha256(pdf).hexdigest()))
+        params = ScanParams(
+            role_title="Backend", job_description=self.FORM["job_description"],
+            required_skills=["python", "fastapi"], preferred_skills=[],
+            min_years_experience=None, required_degree=None, experience_cap_years=15.0,
+            priorities={"skills": "High", "experience": "Medium", "education": "Low", "relevance": "Low"},
+        )
+
+        recorder = Recorder()
+        outcome = await scan_pipeline.score_uploads(params, uploads, recorder)
+
+        kinds = [kind for kind, _ in recorder.events]
+        assert kinds.count("extracted") == 2
+        assert kinds.count("provisional") == 2
+        assert kinds[-1] == "ranked"
+        provisional = [names for kind, names in recorder.events if kind == "provisional"]
+        assert len(provisional[0]) == 1 and len(provisional[1]) == 2
+        assert recorder.events[-1][1] == [r.filename for r in outcome.results]
+
+    @pytest.mark.asyncio
+    async def test_feature_batcher_recovers_after_its_drain_loop_dies(self, monkeypatch):
+        from concurrent.futures import ThreadPoolExecutor
+
+        class Crash(BaseException):   # escapes the per-batch ``except Exception``
+            pass
+
+        calls = []
+
+        def flaky_batch(texts, *args, **kwargs):
+            calls.append(texts)
+            if len(calls) == 1:
+                raise Crash()
+            return [scan_pipeline.ResumeFeatures(text) for text in texts]
+
+        monkeypatch.setattr(scan_pipeline, "extract_resume_features_batch", flaky_batch)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            batcher = scan_pipeline._FeatureBatcher(executor, 8, 1)
+            with pytest.raises(Crash):
+                await asyncio.wait_for(batcher.submit("Python developer"), 5)
+            features = await asyncio.wait_for(batcher.submit("Go developer"), 5)   # a new drain starts
+        assert features.raw == "Go developer"
+
+    @pytest.mark.asyncio
+    async def test_unknown_mode_rejected(self, client, test_user):
+        _, raw_key = test_user
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data={**self.FORM, "mode": "later"},
+            files={"files": ("cv.pdf", io.BytesIO(_minimal_text_pdf()), "application/pdf")},
+        )
+        assert r.status_code == 400
+
+
+def _zip_bytes(entries: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in entries.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+class TestArchiveScans:
+    FORM = {**TestAsyncScanJobs.FORM, "mode": "sync"}
+
+    @pytest.mark.asyncio
+    async def test_archive_scan_ranks_pdf_entries_only(self, client, test_user, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "UPLOAD_SPOOL_DIR", str(tmp_path))
+        _, raw_key = test_user
+        archive = _zip_bytes({
+            "batch/alice.pdf": _minimal_text_pdf(f"{uuid.uuid4()}\nPython FastAPI developer"),
+            "batch/bob.PDF": _minimal_text_pdf(f"{uuid.uuid4()}\nGo developer"),
+            "batch/notes.txt": b"not a resume",
+            "__MACOSX/batch/._alice.pdf": b"\x00\x05\x16\x07",
+        })
+        r = await client.post(
+            "/api/v1/scan/archive", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files={"archive": ("resumes.zip", io.BytesIO(archive), "application/zip")},
+        )
+        assert r.status_code == 200, r.text
+        body = r.json()
+        assert body["total_candidates"] == 2
+        assert sorted(res["filename"] for res in body["results"]) == ["alice.pdf", "bob.PDF"]
+        assert list(tmp_path.iterdir()) == []   # archive and every entry spool removed
+
+    @pytest.mark.asyncio
+    async def test_archive_entry_with_bad_magic_rejected(self, client, test_user, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "UPLOAD_SPOOL_DIR", str(tmp_path))
+        _, raw_key = test_user
+        archive = _zip_bytes({
+            "good.pdf": _minimal_text_pdf(),
+            "fake.pdf": b"MZ\x90\x00 definitely not a pdf",
+        })
+        r = await client.post(
+            "/api/v1/scan/archive", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files={"archive": ("resumes.zip", io.BytesIO(archive), "application/zip")},
+        )
+        assert r.status_code == 400
+        assert "fake.pdf" in r.json()["detail"]
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_archive_over_file_limit_rejected_before_unpacking(self, client, test_user, monkeypatch):
+        monkeypatch.setattr(api_routes, "MAX_ARCHIVE_FILES", 1)
+        _, raw_key = test_user
+        archive = _zip_bytes({"a.pdf": _minimal_text_pdf(), "b.pdf": _minimal_text_pdf()})
+        r = await client.post(
+            "/api/v1/scan/archive", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files={"archive": ("resumes.zip", io.BytesIO(archive), "application/zip")},
+        )
+        assert r.status_code == 400
+        assert "Maximum 1" in r.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_async_archive_scan_completes(self, client, test_user):
+        _, raw_key = test_user
+        archive = _zip_bytes({
+            "a.pdf": _minimal_text_pdf(f"{uuid.uuid4()}\nPython developer"),
+            "b.pdf": _minimal_text_pdf(f"{uuid.uuid4()}\nFastAPI developer"),
+        })
+        r = await client.post(
+            "/api/v1/scan/archive", headers={"X-API-Key": raw_key},
+            data={**self.FORM, "mode": "async"},
+            files={"archive": ("resumes.zip", io.BytesIO(archive), "application/zip")},
+        )
+        assert r.status_code == 202, r.text
+        detail = await _wait_for_scan(client, raw_key, r.json()["scan_id"])
+        assert detail["status"] == "completed", detail
+        assert detail["progress_total"] == 2 and len(detail["results"]) == 2
+
+
+class TestAppendResumes:
+    FORM = {**TestAsyncScanJobs.FORM, "mode": "sync"}
+
+    @pytest.mark.asyncio
+    async def test_append_scores_only_new_resumes_and_reranks(self, client, test_user, monkeypatch):
+        _, raw_key = test_user
+        first = _minimal_text_pdf(f"{uuid.uuid4()}\nGraphic designer, Photoshop")
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files={"files": ("designer.pdf", io.BytesIO(first), "application/pdf")},
+        )
+        assert r.status_code == 200, r.text
+        scan_id = r.json()["scan_id"]
+
+        featurized = []
+        real_features = scan_pipeline.extract_resume_features_batch
+
+        def counting_features(raws, *args, **kwargs):
+            featurized.extend(raws)
+            return real_features(raws, *args, **kwargs)
+
+        async def no_jd_parse(*args, **kwargs):
+            raise AssertionError("stored JD tiers should be reused")
+
+        monkeypatch.setattr(scan_pipeline, "extract_resume_features_batch", counting_features)
+        monkeypatch.setattr(scan_pipeline, "parse_jd_skill_tiers_with_groq", no_jd_parse)
+        second = _minimal_text_pdf(f"{uuid.uuid4()}\nPython FastAPI PostgreSQL backend engineer")
+        r = await client.post(
+            f"/api/v1/scans/{scan_id}/resumes", headers={"X-API-Key": raw_key},
+            files=[
+                ("files", ("backend.pdf", io.BytesIO(second), "application/pdf")),
+                ("files", ("designer-again.pdf", io.BytesIO(first), "application/pdf")),
+            ],
+        )
+        assert r.status_code == 200, r.text
+        body = r.json()
+        assert len(featurized) == 1                     # the repeat upload was skipped
+        assert body["total_candidates"] == 2
+        scores = [res["final_score"] for res in body["results"]]
+        assert scores == sorted(scores, reverse=True)
+        assert {res["filename"] for res in body["results"]} == {"designer.pdf", "backend.pdf"}
+
+        detail = (await client.get(f"/api/v1/scans/{scan_id}", headers={"X-API-Key": raw_key})).json()
+        assert [res["filename"] for res in detail["results"]] == [res["filename"] for res in body["results"]]
+
+        history = (await client.get("/api/v1/scans", headers={"X-API-Key": raw_key})).json()
+        item = next(h for h in history if h["scan_id"] == scan_id)
+        assert item["total_candidates"] == 2
+        assert item["top_score"] == round(scores[0], 1)
+
+    @pytest.mark.asyncio
+    async def test_append_to_unknown_scan_returns_404(self, client, test_user):
+        _, raw_key = test_user
+        r = await client.post(
+            f"/api/v1/scans/{uuid.uuid4()}/resumes", headers={"X-API-Key": raw_key},
+            files={"files": ("cv.pdf", io.BytesIO(_minimal_text_pdf()), "application/pdf")},
+        )
+        assert r.status_code == 404
+
+
+class TestRescore:
+    FORM = {**TestAsyncScanJobs.FORM, "mode": "sync"}
+
+    @pytest.mark.asyncio
+    async def test_rescore_reranks_from_stored_signals(self, client, test_user, monkeypatch):
+        _, raw_key = test_user
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files=[
+                ("files", ("backend.pdf", io.BytesIO(_minimal_text_pdf(
+                    f"{uuid.uuid4()}\nPython FastAPI PostgreSQL backend engineer")), "application/pdf")),
+                ("files", ("phd.pdf", io.BytesIO(_minimal_text_pdf(
+                    f"{uuid.uuid4()}\nResearcher\nEDUCATION\nPhD in Physics")), "application/pdf")),
+            ],
+        )
+        assert r.status_code == 200, r.text
+        scan_id = r.json()["scan_id"]
+
+        def no_scoring(*args, **kwargs):
+            raise AssertionError("rescore must not re-run the scoring pipeline")
+
+        monkeypatch.setattr(scan_pipeline, "_run_ml_sync", no_scoring)
+        monkeypatch.setattr(scan_pipeline, "extract_resume_features_batch", no_scoring)
+        priorities = {"skills": "Ignore", "experience": "Ignore", "education": "Critical", "relevance": "Ignore"}
+        r = await client.post(
+            f"/api/v1/scans/{scan_id}/rescore", headers={"X-API-Key": raw_key}, json=priorities,
+        )
+        assert r.status_code == 200, r.text
+        body = r.json()
+        assert body["results"][0]["filename"] == "phd.pdf"
+        scores = [res["final_score"] for res in body["results"]]
+        assert scores == sorted(scores, reverse=True)
+
+        detail = (await client.get(f"/api/v1/scans/{scan_id}", headers={"X-API-Key": raw_key})).json()
+        assert detail["education_priority"] == "Critical"
+        assert [res["final_score"] for res in detail["results"]] == scores
+
+    @pytest.mark.asyncio
+    async def test_rescore_rejects_all_ignore(self, client, test_user):
+        _, raw_key = test_user
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files={"files": ("cv.pdf", io.BytesIO(_minimal_text_pdf()), "application/pdf")},
+        )
+        r = await client.post(
+            f"/api/v1/scans/{r.json()['scan_id']}/rescore", headers={"X-API-Key": raw_key},
+            json={"skills": "Ignore", "experience": "Ignore", "education": "Ignore", "relevance": "Ignore"},
+        )
+        assert r.status_code == 400
+
+
+class TestTopKScans:
+    FORM = {**TestAsyncScanJobs.FORM, "mode": "sync"}
+
+    @pytest.mark.asyncio
+    async def test_top_k_scan_screens_out_the_rest(self, client, test_user):
+        _, raw_key = test_user
+        tag = uuid.uuid4()
+        files = [
+            ("files", ("backend.pdf", io.BytesIO(_minimal_text_pdf()), "application/pdf")),
+            *[
+                ("files", (f"designer-{n}.pdf", io.BytesIO(_minimal_text_pdf(
+                    f"{tag}\nGraphic designer {n}, Photoshop, Illustrator branding")), "application/pdf"))
+                for n in range(3)
+            ],
+        ]
+        full = await client.post("/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM, files=files)
+        assert full.status_code == 200, full.text
+        for _, (_, body, _) in files:
+            body.seek(0)
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data={**self.FORM, "top_k": "1"}, files=files,
+        )
+        assert r.status_code == 200, r.text
+        results = r.json()["results"]
+        assert results[0] == {
+            **full.json()["results"][0],
+            "candidate_id": results[0]["candidate_id"],
+            "earlier_duplicates": results[0]["earlier_duplicates"],   # the first scan is now an earlier one
+        }
+        screened = [res for res in results if res["hiring_recommendation"] == "Screened out (fast path)"]
+        assert screened and screened == results[len(results) - len(screened):]
+        assert all(res["final_score"] == 0.0 for res in screened)
+        assert all(0.0 < res["score_upper_bound"] < results[0]["final_score"] for res in screened)
+        assert results[0]["score_upper_bound"] is None
+
+        scan_id = r.json()["scan_id"]
+        history = await client.get("/api/v1/scans", headers={"X-API-Key": raw_key})
+        item = next(item for item in history.json() if item["scan_id"] == scan_id)
+        # Aggregates cover only fully scored resumes, never bounds or placeholder zeros.
+        scored = [res["final_score"] for res in results if res not in screened]
+        assert (item["total_candidates"], item["top_score"]) == (len(results), round(max(scored), 1))
+        assert item["avg_score"] == round(sum(scored) / len(scored), 1)
+
+    @pytest.mark.asyncio
+    async def test_rescoring_a_top_k_scan_keeps_screened_resumes_last(self, client, test_user):
+        _, raw_key = test_user
+        tag = uuid.uuid4()
+        files = [
+            ("files", ("backend.pdf", io.BytesIO(_minimal_text_pdf()), "application/pdf")),
+            ("files", ("data.pdf", io.BytesIO(_minimal_text_pdf(
+                f"{tag}\nData engineer, Python, Spark, Airflow pipelines, 2019 - Present")), "application/pdf")),
+            ("files", ("designer.pdf", io.BytesIO(_minimal_text_pdf(
+                f"{tag}\nGraphic designer, Photoshop, Illustrator branding")), "application/pdf")),
+        ]
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data={**self.FORM, "top_k": "1"}, files=files,
+        )
+        assert r.status_code == 200, r.text
+        scan_id = r.json()["scan_id"]
+        screened = [res["filename"] for res in r.json()["results"]
+                    if res["hiring_recommendation"] == "Screened out (fast path)"]
+        assert screened
+
+        r = await client.post(
+            f"/api/v1/scans/{scan_id}/rescore", headers={"X-API-Key": raw_key},
+            json={"skills": "High", "experience": "Low", "education": "Low", "relevance": "Low"},
+        )
+        assert r.status_code == 200, r.text
+        results = (await client.get(f"/api/v1/scans/{scan_id}", headers={"X-API-Key": raw_key})).json()["results"]
+        assert [res["filename"] for res in results[len(results) - len(screened):]] == screened
+        for res in results[len(results) - len(screened):]:
+            assert res["final_score"] == 0.0 and res["score_upper_bound"] is None
+        assert all(res["final_score"] > 0.0 for res in results[:len(results) - len(screened)])
+
+    @pytest.mark.asyncio
+    async def test_top_k_must_be_positive(self, client, test_user):
+        _, raw_key = test_user
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data={**self.FORM, "top_k": "0"},
+            files={"files": ("cv.pdf", io.BytesIO(_minimal_text_pdf()), "application/pdf")},
+        )
+        assert r.status_code == 400
+
+
+class TestSimilarCandidates:
+    FORM = {**TestAsyncScanJobs.FORM, "mode": "sync"}
+
+    @pytest.mark.asyncio
+    async def test_similar_candidates_use_stored_vectors(self, client, test_user, monkeypatch):
+        import ml.matcher as matcher
+        _, raw_key = test_user
+        tag = uuid.uuid4()
+        pdfs = {
+            "backend.pdf": _minimal_text_pdf(f"{tag}\nPython FastAPI PostgreSQL backend engineer, Docker"),
+            "backend-2.pdf": _minimal_text_pdf(f"{tag}\nBackend engineer: Python, FastAPI, PostgreSQL APIs"),
+            "designer.pdf": _minimal_text_pdf(f"{tag}\nGraphic designer, Photoshop, Illustrator branding"),
+        }
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files=[("files", (name, io.BytesIO(pdf), "application/pdf")) for name, pdf in pdfs.items()],
+        )
+        assert r.status_code == 200, r.text
+        detail = (await client.get(f"/api/v1/scans/{r.json()['scan_id']}", headers={"X-API-Key": raw_key})).json()
+        backend_id = next(res["candidate_id"] for res in detail["results"] if res["filename"] == "backend.pdf")
+
+        r = await client.get(f"/api/v1/candidates/{backend_id}/similar", headers={"X-API-Key": raw_key})
+        assert r.status_code == 200, r.text
+        similar = r.json()
+        assert [s["filename"] for s in similar[:2]] == ["backend-2.pdf", "designer.pdf"]
+        assert similar[0]["similarity"] > similar[1]["similarity"]
+
+        vectorized = []
+        real_vectorize = matcher.hash_vectorize
+        monkeypatch.setattr(matcher, "hash_vectorize", lambda texts: vectorized.extend(texts) or real_vectorize(texts))
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files={"files": ("backend.pdf", io.BytesIO(pdfs["backend.pdf"]), "application/pdf")},
+        )
+        assert r.status_code == 200, r.text
+        assert vectorized == []   # the stored vector was reused
+
+    @pytest.mark.asyncio
+    async def test_similar_for_unknown_candidate_returns_404(self, client, test_user):
+        _, raw_key = test_user
+        r = await client.get(f"/api/v1/candidates/{uuid.uuid4()}/similar", headers={"X-API-Key": raw_key})
+        assert r.status_code == 404
+
+
+class TestDuplicateResumes:
+    FORM = {**TestAsyncScanJobs.FORM, "mode": "sync"}
+    RESUME = (
+        "{tag}\nPriya Sharma, backend engineer. Built payment APIs with Python, FastAPI and PostgreSQL\n"
+        "at Acme from 2019 to 2024, cut p99 latency by 40% and led a team of {team}.\n"
+        "B.Tech in Computer Science, 2018. Skills: Python, FastAPI, PostgreSQL, Docker, Redis."
+    )
+
+    @pytest.mark.asyncio
+    async def test_duplicates_share_scores_and_earlier_ones_are_flagged(self, client, test_user, monkeypatch):
+        import api.scan_pipeline as pipeline
+        _, raw_key = test_user
+        tag = uuid.uuid4()
+        original = _minimal_text_pdf(self.RESUME.format(tag=tag, team="four"))
+        files = [
+            ("files", ("priya.pdf", io.BytesIO(original), "application/pdf")),
+            ("files", ("designer.pdf", io.BytesIO(_minimal_text_pdf(
+                f"{tag}\nGraphic designer, Photoshop, Illustrator branding")), "application/pdf")),
+            ("files", ("priya-copy.pdf", io.BytesIO(original), "application/pdf")),
+            ("files", ("priya-v2.pdf", io.BytesIO(_minimal_text_pdf(
+                self.RESUME.format(tag=tag, team="five"))), "application/pdf")),
+        ]
+        scored = []
+        real_run_ml_sync = pipeline._run_ml_sync
+        with monkeypatch.context() as patched:
+            patched.setattr(pipeline, "_run_ml_sync", lambda desc, raws, *args: (
+                scored.append(len(raws)), real_run_ml_sync(desc, raws, *args))[1])
+            r = await client.post("/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM, files=files)
+        assert r.status_code == 200, r.text
+        assert scored == [2]   # priya.pdf and designer.pdf
+        by_name = {res["filename"]: res for res in r.json()["results"]}
+        assert by_name["priya.pdf"]["duplicate_of"] is None
+        for name in ("priya-copy.pdf", "priya-v2.pdf"):
+            assert by_name[name]["duplicate_of"] == "priya.pdf"
+            assert by_name[name]["final_score"] == by_name["priya.pdf"]["final_score"]
+        assert all(not res["earlier_duplicates"] for res in by_name.values())
+
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files={"files": ("priya-2026.pdf", io.BytesIO(_minimal_text_pdf(
+                self.RESUME.format(tag=tag, team="six"))), "application/pdf")},
+        )
+        assert r.status_code == 200, r.text
+        flagged = r.json()["results"][0]["earlier_duplicates"]
+        assert {d["filename"] for d in flagged} == {"priya.pdf", "priya-v2.pdf"}
+        assert all(d["similarity"] >= 0.8 and d["candidate_id"] for d in flagged)
+
+        scan = await client.get(f"/api/v1/scans/{r.json()['scan_id']}", headers={"X-API-Key": raw_key})
+        assert scan.json()["results"][0]["earlier_duplicates"] == flagged
+
+    @pytest.mark.asyncio
+    async def test_resume_first_seen_as_near_duplicate_joins_the_talent_pool(self, client, test_user):
+        _, raw_key = test_user
+        tag = uuid.uuid4()
+        original = _minimal_text_pdf(self.RESUME.format(tag=tag, team="four"))
+        variant = _minimal_text_pdf(self.RESUME.format(tag=tag, team="five"))
+        scans = [
+            [("priya.pdf", original), ("priya-v2.pdf", variant)],   # priya-v2.pdf stores no features
+            [("priya-v2-again.pdf", variant)],                      # scored on its own this time
+        ]
+        for pdfs in scans:
+            r = await client.post(
+                "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+                files=[("files", (name, io.BytesIO(pdf), "application/pdf")) for name, pdf in pdfs],
+            )
+            assert r.status_code == 200, r.text
+
+        form = {k: v for k, v in self.FORM.items() if k != "mode"}
+        r = await client.post("/api/v1/pool/match", headers={"X-API-Key": raw_key}, data={**form, "top_k": "5"})
+        assert r.status_code == 200, r.text
+        assert r.json()["pool_size"] == 2
+        assert {res["filename"] for res in r.json()["results"]} == {"priya.pdf", "priya-v2-again.pdf"}
+
+
+class TestTalentPool:
+    FORM = {**TestAsyncScanJobs.FORM, "mode": "sync"}
+
+    @pytest.mark.asyncio
+    async def test_pool_match_scores_only_the_skill_shortlist(self, client, test_user, db_session, monkeypatch):
+        import api.scan_pipeline as pipeline
+        user, raw_key = test_user
+        tag = uuid.uuid4()
+        scans = [
+            {
+                "backend.pdf": _minimal_text_pdf(f"{tag}\nPython FastAPI PostgreSQL backend engineer, Docker"),
+                "designer.pdf": _minimal_text_pdf(f"{tag}\nGraphic designer, Photoshop, Illustrator branding"),
+            },
+            {"backend-2.pdf": _minimal_text_pdf(f"{tag}\nBackend engineer: Python APIs")},
+        ]
+        for pdfs in scans:
+            r = await client.post(
+                "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+                files=[("files", (name, io.BytesIO(pdf), "application/pdf")) for name, pdf in pdfs.items()],
+            )
+            assert r.status_code == 200, r.text
+        await db_session.refresh(user)
+        scans_used = user.free_scans_used
+
+        form = {k: v for k, v in self.FORM.items() if k != "mode"}
+        with monkeypatch.context() as patched:
+            patched.setattr(pipeline, "extract_resume_features_batch", None)   # stored features only
+            r = await client.post(
+                "/api/v1/pool/match", headers={"X-API-Key": raw_key}, data={**form, "top_k": "5"},
+            )
+        assert r.status_code == 200, r.text
+        body = r.json()
+        assert (body["pool_size"], body["shortlisted"], body["scored"]) == (3, 2, 2)
+        assert [res["filename"] for res in body["results"]] == ["backend.pdf", "backend-2.pdf"]
+        assert all(res["candidate_id"] for res in body["results"])
+        await db_session.refresh(user)
+        assert user.free_scans_used == scans_used
+
+        r = await client.post(
+            "/api/v1/scan/pdf", headers={"X-API-Key": raw_key}, data=self.FORM,
+            files={"files": ("backend-3.pdf", io.BytesIO(_minimal_text_pdf(f"{tag}\nFastAPI developer")), "application/pdf")},
+        )
+        assert r.status_code == 200, r.text
+        r = await client.post("/api/v1/pool/match", headers={"X-API-Key": raw_key}, data={**form, "top_k": "1"})
+        assert r.status_code == 200, r.text
+        assert (r.json()["pool_size"], r.json()["shortlisted"]) == (4, 3)
+        assert [res["filename"] for res in r.json()["results"]] == ["backend.pdf"]
+
 
 # ---------------------------------------------------------------------------
 # Admin routes